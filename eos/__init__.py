@@ -27,6 +27,7 @@ from .data.cache_handler.exception import TypeFetchError
 from .data.source import SourceManager
 from .fit import Fit
 from .fit.restrictions.exception import ValidationError
+from .fit.skill_profile import SkillProfile
 from .fit.tuples import DamageTypes
 from .data.cache_handler import *
 from .data.data_handler import *
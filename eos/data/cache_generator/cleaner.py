@@ -30,6 +30,55 @@ from eos.util.cached_property import CachedProperty
 logger = getLogger(__name__)
 
 
+# Format:
+# {source table: {source column: (target table, target column)}}
+FOREIGN_KEYS = {
+    'dgmattribs': {
+        'maxAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmeffects': {
+        'preExpression': ('dgmexpressions', 'expressionID'),
+        'postExpression': ('dgmexpressions', 'expressionID'),
+        'durationAttributeID': ('dgmattribs', 'attributeID'),
+        'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
+        'dischargeAttributeID': ('dgmattribs', 'attributeID'),
+        'rangeAttributeID': ('dgmattribs', 'attributeID'),
+        'falloffAttributeID': ('dgmattribs', 'attributeID'),
+        'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmexpressions': {
+        'arg1': ('dgmexpressions', 'expressionID'),
+        'arg2': ('dgmexpressions', 'expressionID'),
+        'expressionTypeID': ('evetypes', 'typeID'),
+        'expressionGroupID': ('evegroups', 'groupID'),
+        'expressionAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmtypeattribs': {
+        'typeID': ('evetypes', 'typeID'),
+        'attributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmtypeeffects': {
+        'typeID': ('evetypes', 'typeID'),
+        'effectID': ('dgmeffects', 'effectID')
+    },
+    'evetypes': {
+        'groupID': ('evegroups', 'groupID')
+    }
+}
+
+# Tables which complement evetypes or serve as m:n mapping
+# between evetypes and other tables
+AUX_TABLES = ('dgmtypeattribs', 'dgmtypeeffects')
+
+# Targets of references from modifier info YAML, in the same
+# order as they are stored in modifier info relations map
+YAML_TARGETS = (
+    ('evetypes', 'typeID'),
+    ('evegroups', 'groupID'),
+    ('dgmattribs', 'attributeID')
+)
+
+
 class Cleaner:
     """
     Class responsible for cleaning up unnecessary data
@@ -83,14 +132,30 @@ class Cleaner:
         Define auto-cleanup workflow.
         """
         self._kill_weak()
-        self._changed = True
-        # Cycle as long as we have changes during previous iteration.
-        # We need this because contents of even evetypes may change, which,
-        # by turn, will need to pull additional data into other tables
-        while self._changed is True:
-            self._changed = False
-            self._reanimate_auxiliary_friends()
-            self._reestablish_broken_relationships()
+        # Index trashed rows by values they can be referenced with
+        trash_index = self._build_trash_index()
+        # Traverse data graph starting from rows which are left in data
+        # (strong ones). Each time row gets restored, we check rows it
+        # references, thus each row is processed only once
+        # Format: [(table name, row)]
+        worklist = [(table_name, row) for table_name, table in self.data.items() for row in table]
+        while worklist:
+            table_name, row = worklist.pop()
+            for tgt_table_name, tgt_column_name, value in self._get_row_references(table_name, row):
+                column_index = trash_index.get((tgt_table_name, tgt_column_name))
+                if column_index is None:
+                    continue
+                # Rows matching this value are restored at once, so we do
+                # not need to process this value anymore
+                tgt_rows = column_index.pop(value, None)
+                if not tgt_rows:
+                    continue
+                # Row may be already restored via another reference
+                to_restore = tgt_rows.intersection(self.trashed_data[tgt_table_name])
+                if not to_restore:
+                    continue
+                self._restore_data(tgt_table_name, to_restore)
+                worklist.extend((tgt_table_name, tgt_row) for tgt_row in to_restore)
 
     def _kill_weak(self):
         """
@@ -102,131 +167,78 @@ class Cleaner:
             to_trash.update(table.difference(strong_rows))
             self._trash_data(table_name, to_trash)
 
-    def _reanimate_auxiliary_friends(self):
+    def _build_trash_index(self):
         """
-        Restore rows in tables, which complement evetypes
-        or serve as m:n mapping between evetypes and other tables.
-        """
-        # As we filter whole database using evetypes table,
-        # gather evetype IDs we currently have in there
-        type_ids = set(row['typeID'] for row in self.data['evetypes'])
-        # Auxiliary tables are those which do not define
-        # any entities, they just map one entities to others
-        # or complement entities with additional data
-        aux_tables = ('dgmtypeattribs', 'dgmtypeeffects')
-        for table_name in aux_tables:
-            to_restore = set()
-            # Restore rows which map other entities to types
-            for row in self.trashed_data[table_name]:
-                if row['typeID'] in type_ids:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(table_name, to_restore)
+        Build index of trashed rows for all columns which can
+        be targeted by references.
 
-    def _reestablish_broken_relationships(self):
-        """
-        Restore all rows targeted by references of rows, which
-        exist in actual data.
+        Return value:
+        Dictionary in {(table name, column name): {column value: {rows}}}
+        format
         """
-        # Container for 'target data', matches with which are
-        # going to be restored
-        # Format: {(target table name, target column name): {values to have}}}
-        tgt_data = {}
-        self._get_targets_relational(tgt_data)
-        self._get_targets_yaml(tgt_data)
-        # Now, when we have all the target data values, we may look for
-        # rows, which have matching values, and restore them
-        for tgt_spec, tgt_values in tgt_data.items():
-            tgt_table_name, tgt_column_name = tgt_spec
-            to_restore = set()
-            for row in self.trashed_data[tgt_table_name]:
-                if row.get(tgt_column_name) in tgt_values:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(tgt_table_name, to_restore)
+        tgt_specs = set()
+        for table_fks in FOREIGN_KEYS.values():
+            tgt_specs.update(table_fks.values())
+        for aux_table_name in AUX_TABLES:
+            tgt_specs.add((aux_table_name, 'typeID'))
+        tgt_specs.update(YAML_TARGETS)
+        trash_index = {}
+        for tgt_table_name, tgt_column_name in tgt_specs:
+            column_index = {}
+            for row in self.trashed_data.get(tgt_table_name, ()):
+                column_index.setdefault(row.get(tgt_column_name), set()).add(row)
+            trash_index[(tgt_table_name, tgt_column_name)] = column_index
+        return trash_index
 
-    def _get_targets_relational(self, tgt_data):
-        """
-        Fill dictionary with target references taken from data
-        stored in relational format
+    def _get_row_references(self, table_name, row):
         """
-        # Format:
-        # {source table: {source column: (target table, target column)}}
-        foreign_keys = {
-            'dgmattribs': {
-                'maxAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmeffects': {
-                'preExpression': ('dgmexpressions', 'expressionID'),
-                'postExpression': ('dgmexpressions', 'expressionID'),
-                'durationAttributeID': ('dgmattribs', 'attributeID'),
-                'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
-                'dischargeAttributeID': ('dgmattribs', 'attributeID'),
-                'rangeAttributeID': ('dgmattribs', 'attributeID'),
-                'falloffAttributeID': ('dgmattribs', 'attributeID'),
-                'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmexpressions': {
-                'arg1': ('dgmexpressions', 'expressionID'),
-                'arg2': ('dgmexpressions', 'expressionID'),
-                'expressionTypeID': ('evetypes', 'typeID'),
-                'expressionGroupID': ('evegroups', 'groupID'),
-                'expressionAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmtypeattribs': {
-                'typeID': ('evetypes', 'typeID'),
-                'attributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmtypeeffects': {
-                'typeID': ('evetypes', 'typeID'),
-                'effectID': ('dgmeffects', 'effectID')
-            },
-            'evetypes': {
-                'groupID': ('evegroups', 'groupID')
-            }
-        }
-        for src_table_name, table_fks in foreign_keys.items():
-            for src_column_name, fk_target in table_fks.items():
-                tgt_table_name, tgt_column_name = fk_target
-                for row in self.data[src_table_name]:
-                    fk_value = row.get(src_column_name)
-                    # If there's no such field in a row or it is None,
-                    # this is not a valid FK reference
-                    if fk_value is None:
-                        continue
-                    tgt_values = tgt_data.setdefault((tgt_table_name, tgt_column_name), set())
-                    tgt_values.add(fk_value)
+        Get values referenced by the row.
 
-    def _get_targets_yaml(self, tgt_data):
-        """
-        Fill dictionary with target references taken from data
-        stored in YAML format
+        Required arguments:
+        table_name -- name of table row belongs to
+        row -- row, for which references are generated
+
+        Return value:
+        Iterable with (target table name, target column name, value)
+        tuples
         """
-        for effect_row in self.data['dgmeffects']:
-            effect_id = effect_row['effectID']
+        references = []
+        # References stored in relational format
+        for src_column_name, fk_target in FOREIGN_KEYS.get(table_name, {}).items():
+            fk_value = row.get(src_column_name)
+            # If there's no such field in a row or it is None,
+            # this is not a valid FK reference
+            if fk_value is None:
+                continue
+            tgt_table_name, tgt_column_name = fk_target
+            references.append((tgt_table_name, tgt_column_name, fk_value))
+        # Auxiliary tables do not define any entities, they just map
+        # types to other entities or complement types with additional
+        # data; they are pulled in by types they refer
+        if table_name == 'evetypes':
+            type_id = row['typeID']
+            for aux_table_name in AUX_TABLES:
+                references.append((aux_table_name, 'typeID', type_id))
+        # References stored in YAML format
+        elif table_name == 'dgmeffects':
             try:
-                types, groups, attrs = self._yaml_modinfo_relations[effect_id]
+                yaml_references = self._yaml_modinfo_relations[row['effectID']]
             except KeyError:
-                continue
-            for references, tgt_table_name, tgt_column_name in (
-                (types, 'evetypes', 'typeID'),
-                (groups, 'evegroups', 'groupID'),
-                (attrs, 'dgmattribs', 'attributeID')
-            ):
-                # If there're any references for given entity, add them to
-                # dictionary
-                if len(references) > 0:
-                    tgt_values = tgt_data.setdefault((tgt_table_name, tgt_column_name), set())
-                    tgt_values.update(references)
+                pass
+            else:
+                for values, tgt_spec in zip(yaml_references, YAML_TARGETS):
+                    tgt_table_name, tgt_column_name = tgt_spec
+                    for value in values:
+                        references.append((tgt_table_name, tgt_column_name, value))
+        return references
 
     @CachedProperty
     def _yaml_modinfo_relations(self):
         """
         Generate auxiliary map to avoid re-parsing YAML
-        on each cleanup cycle. It is used when collecting
-        data about references from modifier info YAMLs.
+        of the same effect multiple times. It is used when
+        collecting data about references from modifier info
+        YAMLs.
         """
 
         # Helper function to fetch actual attribute values
@@ -20,8 +20,11 @@
 
 
 import re
-from logging import getLogger
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
+from logging import getLogger, Handler
 
+from eos import __version__ as eos_version
 from eos.const.eve import Attribute, Operand
 from eos.util.frozen_dict import FrozenDict
 from .modifier_builder import ModifierBuilder
@@ -30,6 +33,22 @@ from .modifier_builder import ModifierBuilder
 logger = getLogger(__name__)
 
 
+# Modifier fields which are written into modifier rows
+MODIFIER_FIELDS = (
+    'state',
+    'scope',
+    'src_attr',
+    'operator',
+    'tgt_attr',
+    'domain',
+    'filter_type',
+    'filter_value'
+)
+# Amount of effect row shards per worker process, more than one
+# to balance load between workers
+SHARDS_PER_WORKER = 4
+
+
 class Converter:
     """
     Class responsible for transforming data structure,
@@ -172,13 +191,22 @@ class Converter:
             successes, failures)
         logger.info(msg)
 
-    def convert(self, data):
+    def convert(self, data, workers=1, previous_state=None):
         """
         Convert database-like data structure to eos-
-        specific one.
+        specific one. After conversion, generation state,
+        which can be used to speed up next conversion, is
+        available as generation_state attribute.
+
+        Optional arguments:
+        workers -- amount of processes used to build modifiers;
+        when 1, modifiers are built in current process (default 1)
+        previous_state -- generation state of previous conversion;
+        modifiers of effects, whose data did not change since then,
+        are taken from it instead of being built (default None)
         """
         data = self._assemble(data)
-        self._build_modifiers(data)
+        self._build_modifiers(data, workers, previous_state)
         return data
 
     def _assemble(self, data):
@@ -267,12 +295,52 @@ class Converter:
 
         return assembly
 
-    def _build_modifiers(self, data):
+    def _build_modifiers(self, data, workers=1, previous_state=None):
         """
         Replace expressions with generated out of
         them modifiers.
         """
-        builder = ModifierBuilder(data['expressions'])
+        # Sort rows by ID so we numerate modifiers in deterministic way
+        effect_rows = sorted(data['effects'], key=lambda row: row['effect_id'])
+        # Format: [([modifier rows], build status)], in the same order
+        # as effect rows
+        build_results = [None] * len(effect_rows)
+        # Hash all data which is used to build modifiers of each effect;
+        # if it's the same as during previous generation, reuse results
+        # Format: {effect ID: (hash, build status, [modifier rows])}
+        previous_effects = self._get_previous_effects(previous_state)
+        hasher = _EffectHasher(data['expressions'])
+        effect_hashes = []
+        to_build = []
+        for position, effect_row in enumerate(effect_rows):
+            effect_hash = hasher.get_hash(effect_row)
+            effect_hashes.append(effect_hash)
+            previous_effect = previous_effects.get(str(effect_row['effect_id']))
+            if previous_effect is not None and previous_effect[0] == effect_hash:
+                build_results[position] = (previous_effect[2], previous_effect[1])
+            else:
+                to_build.append(position)
+        if previous_state is not None:
+            msg = 'modifier building: {} effects reused, {} effects built'.format(
+                len(effect_rows) - len(to_build), len(to_build))
+            logger.info(msg)
+        rows_to_build = [effect_rows[position] for position in to_build]
+        if workers > 1 and len(rows_to_build) > 1:
+            built_results = self._build_parallel(rows_to_build, data['expressions'], workers)
+        else:
+            builder = ModifierBuilder(data['expressions'])
+            built_results = _build_effects(builder, rows_to_build)
+        for position, build_result in zip(to_build, built_results):
+            build_results[position] = build_result
+        # Keys are strings to keep the same form of state after
+        # it's stored in formats like JSON
+        self.generation_state = {
+            'eos_version': eos_version,
+            'effects': {
+                str(effect_row['effect_id']): [effect_hash, build_result[1], build_result[0]]
+                for effect_row, effect_hash, build_result in zip(effect_rows, effect_hashes, build_results)
+            }
+        }
         # Lists effects, which are using given modifier
         # Format: {modifier row: [effect IDs]}
         modifier_effect_map = {}
@@ -280,19 +348,18 @@ class Converter:
         # Format: {modifier row: modifier ID}
         modifier_id_map = {}
         modifier_id = 1
-        # Sort rows by ID so we numerate modifiers in deterministic way
-        for effect_row in sorted(data['effects'], key=lambda row: row['effect_id']):
-            modifiers, build_status = builder.build(effect_row)
+        for effect_row, build_result in zip(effect_rows, build_results):
+            modifier_rows, build_status = build_result
             # Update effects: add modifier build status and remove
             # fields which we needed only for this process
             effect_row['build_status'] = build_status
             del effect_row['pre_expression']
             del effect_row['post_expression']
             del effect_row['modifier_info']
-            for modifier in modifiers:
+            for modifier_row in modifier_rows:
                 # Convert modifiers into frozen datarows to use
                 # them in conversion process
-                frozen_modifier = self._freeze_modifier(modifier)
+                frozen_modifier = FrozenDict(modifier_row)
                 # Gather data about which effects use which modifier
                 used_by_effects = modifier_effect_map.setdefault(frozen_modifier, [])
                 used_by_effects.append(effect_row['effect_id'])
@@ -326,24 +393,186 @@ class Converter:
             modifiers.append(modifier)
         data['modifiers'] = modifiers
 
-    def _freeze_modifier(self, modifier):
+    def _get_previous_effects(self, previous_state):
         """
-        Converts modifier into frozendict with its keys and
-        values assigned according to modifier's ones.
+        Get effect data from generation state, if it is usable.
+
+        Return value:
+        Dictionary in {effect ID string: (hash, build status,
+        [modifier rows])} format
         """
-        # Fields which we need to write into row
-        fields = (
-            'state',
-            'scope',
-            'src_attr',
-            'operator',
-            'tgt_attr',
-            'domain',
-            'filter_type',
-            'filter_value'
-        )
-        modifier_row = {}
-        for field in fields:
-            modifier_row[field] = getattr(modifier, field)
-        frozen_row = FrozenDict(modifier_row)
-        return frozen_row
+        if not isinstance(previous_state, dict):
+            return {}
+        # Modifier building logic may change between Eos versions
+        if previous_state.get('eos_version') != eos_version:
+            return {}
+        previous_effects = previous_state.get('effects')
+        if not isinstance(previous_effects, dict):
+            return {}
+        return previous_effects
+
+    def _build_parallel(self, effect_rows, expressions, workers):
+        """
+        Build modifiers for effect rows using pool of processes.
+        Effect rows are split into contiguous shards, and results
+        are merged in original order, thus they do not depend on
+        amount of workers. Log records emitted by workers are
+        passed back and handled in current process.
+
+        Required arguments:
+        effect_rows -- sequence with effect rows
+        expressions -- iterable with expression rows, each worker
+        receives them once on startup
+        workers -- amount of worker processes
+
+        Return value:
+        List with (modifier rows, build status) tuples
+        """
+        # Frozen rows cannot be unpickled, thus pass plain dictionaries
+        expressions = [dict(row) for row in expressions]
+        shard_amount = min(len(effect_rows), workers * SHARDS_PER_WORKER)
+        shard_size = -(-len(effect_rows) // shard_amount)
+        shards = [effect_rows[i:i + shard_size] for i in range(0, len(effect_rows), shard_size)]
+        build_results = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(expressions,)) as executor:
+            for shard_results, log_records in executor.map(_build_shard, shards):
+                build_results.extend(shard_results)
+                for record in log_records:
+                    getLogger(record.name).handle(record)
+        return build_results
+
+
+class _EffectHasher:
+    """
+    Calculate hashes of all data which is used to build modifiers
+    of effects: effect row and rows of expression trees it refers.
+    Hashes of expression subtrees are calculated only once.
+
+    Required arguments:
+    expressions -- iterable with expression rows
+    """
+
+    def __init__(self, expressions):
+        # Format: {expression ID: expression row}
+        self.__expressions = {}
+        for exp_row in expressions:
+            self.__expressions[exp_row['expressionID']] = exp_row
+        # Format: {expression ID: hash}
+        self.__expression_hashes = {}
+
+    def get_hash(self, effect_row):
+        """
+        Get hash of effect row and expression trees it refers
+        to, in the form of string.
+        """
+        hasher = sha1(_row_repr(effect_row).encode('utf-8'))
+        for expression_id in (effect_row.get('pre_expression'), effect_row.get('post_expression')):
+            hasher.update(self.__get_expression_hash(expression_id, set()).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def __get_expression_hash(self, expression_id, visiting):
+        """
+        Get hash of expression subtree.
+
+        Required arguments:
+        expression_id -- ID of root expression of subtree
+        visiting -- set with IDs of expressions which are being
+        hashed, used to stop on reference cycles
+        """
+        try:
+            return self.__expression_hashes[expression_id]
+        except KeyError:
+            pass
+        if expression_id in visiting:
+            return 'cycle'
+        exp_row = self.__expressions.get(expression_id)
+        if exp_row is None:
+            return 'missing'
+        visiting.add(expression_id)
+        hasher = sha1(_row_repr(exp_row).encode('utf-8'))
+        for arg_id in (exp_row.get('arg1'), exp_row.get('arg2')):
+            if arg_id is not None:
+                hasher.update(self.__get_expression_hash(arg_id, visiting).encode('utf-8'))
+        visiting.discard(expression_id)
+        expression_hash = hasher.hexdigest()
+        self.__expression_hashes[expression_id] = expression_hash
+        return expression_hash
+
+
+def _row_repr(row):
+    """
+    Return string representation of data row which doesn't
+    depend on field order or on row position in its table.
+    """
+    return repr(sorted((k, v) for k, v in row.items() if k != 'table_pos'))
+
+
+class _RecordCollector(Handler):
+    """
+    Logging handler which stores records, to pass them from
+    worker process to main process.
+    """
+
+    def __init__(self):
+        Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        # Make sure record can be pickled
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+# Modifier builder and log collector of worker process
+_worker_builder = None
+_worker_log_collector = None
+
+
+def _init_worker(expressions):
+    """
+    Initialize worker process state: modifier builder with
+    expressions and collector of modifier builder log records.
+    """
+    global _worker_builder, _worker_log_collector
+    _worker_builder = ModifierBuilder(expressions)
+    _worker_log_collector = _RecordCollector()
+    builder_logger = getLogger(ModifierBuilder.__module__.rsplit('.', 1)[0])
+    builder_logger.addHandler(_worker_log_collector)
+    builder_logger.propagate = False
+
+
+def _build_shard(effect_rows):
+    """
+    Build modifiers for shard of effect rows in worker process.
+
+    Return value:
+    (list with (modifier rows, build status) tuples, list with
+    log records) tuple
+    """
+    build_results = _build_effects(_worker_builder, effect_rows)
+    log_records = _worker_log_collector.records
+    _worker_log_collector.records = []
+    return build_results, log_records
+
+
+def _build_effects(builder, effect_rows):
+    """
+    Build modifiers for effect rows.
+
+    Required arguments:
+    builder -- modifier builder to use
+    effect_rows -- iterable with effect rows
+
+    Return value:
+    List with (modifier rows, build status) tuples
+    """
+    build_results = []
+    for effect_row in effect_rows:
+        modifiers, build_status = builder.build(effect_row)
+        modifier_rows = []
+        for modifier in modifiers:
+            modifier_rows.append({field: getattr(modifier, field) for field in MODIFIER_FIELDS})
+        build_results.append((modifier_rows, build_status))
+    return build_results
@@ -35,14 +35,24 @@ class CacheGenerator:
         self._checker = Checker()
         self._cleaner = Cleaner()
         self._converter = Converter()
+        self.generation_state = None
 
-    def run(self, data_handler):
+    def run(self, data_handler, workers=1, previous_state=None):
         """
-        Generate cache out of passed data.
+        Generate cache out of passed data. After generation,
+        its state is available as generation_state attribute;
+        it can be stored with the cache and passed to the next
+        run to avoid rebuilding data which didn't change.
 
         Required arguments:
         data_handler - data handler to use for getting data
 
+        Optional arguments:
+        workers -- amount of processes used to build modifiers
+        out of effects; results do not depend on it (default 1)
+        previous_state -- generation state of previous run; results
+        do not depend on it (default None)
+
         Return value:
         Dictionary in {entity type: [{field name: field value}]
         format
@@ -97,6 +107,7 @@ class CacheGenerator:
         # Convert data into Eos-specific format. Here tables are
         # no longer represented by sets of frozendicts, but by
         # list of dicts
-        data = self._converter.convert(data)
+        data = self._converter.convert(data, workers=workers, previous_state=previous_state)
+        self.generation_state = self._converter.generation_state
 
         return data
@@ -20,8 +20,10 @@
 
 
 __all__ = [
+    'BinaryCacheHandler',
     'JsonCacheHandler'
 ]
 
 
+from .binary_cache_handler import BinaryCacheHandler
 from .json_cache_handler import JsonCacheHandler
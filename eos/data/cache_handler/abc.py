@@ -21,6 +21,8 @@
 
 from abc import ABCMeta, abstractmethod
 
+from .attribute_table import AttributeTable
+
 
 class BaseCacheHandler(metaclass=ABCMeta):
     """
@@ -56,7 +58,31 @@ class BaseCacheHandler(metaclass=ABCMeta):
         Update cache with passed data.
 
         Required arguments:
-        data -- format: {entity type: [{field name: field value}]
+        data -- format: {entity type: [{field name: field value}];
+        besides entities, it may contain generation_state entry,
+        which should be stored with the cache by handlers which
+        support incremental cache regeneration
         fingerprint -- unique ID of data in the form of string
         """
         ...
+
+    def get_generation_state(self):
+        """
+        Get state of cache generator stored with the cache, which
+        allows to regenerate cache incrementally. Handlers which
+        do not store it return None.
+        """
+        return None
+
+    def get_attribute_table(self):
+        """
+        Get dense table with attribute metadata, which is used
+        in calculation process. Table is filled on demand using
+        get_attribute() method, handlers should clear it when
+        their data changes.
+        """
+        try:
+            return self.__attribute_table
+        except AttributeError:
+            table = self.__attribute_table = AttributeTable(self.get_attribute)
+            return table
@@ -0,0 +1,161 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from array import array
+
+from eos.const.eve import Attribute
+from .exception import AttributeFetchError
+
+
+# Following attributes have limited precision - only
+# to second number after point
+LIMITED_PRECISION = (
+    Attribute.cpu,
+    Attribute.power,
+    Attribute.cpu_output,
+    Attribute.power_output
+)
+
+# Flags describing attribute; entry without FLAG_LOADED
+# means that attribute data hasn't been loaded yet
+FLAG_LOADED = 1
+# Attribute is capped by other attribute
+FLAG_CAPPED = 2
+# It's good when attribute is high (high_is_good is True)
+FLAG_HIGH_IS_GOOD = 4
+# Attribute can be stacking penalized (stackable is False)
+FLAG_PENALIZABLE = 8
+# Attribute value is rounded to second number after point
+FLAG_LIMITED_PRECISION = 16
+
+# Attributes with IDs up to this one are stored in dense
+# arrays, data of attributes with higher IDs is kept in map
+MAX_DENSE_ID = 0xffff
+
+
+class AttributeTable:
+    """
+    Dense table with attribute metadata used in calculation process,
+    indexed by attribute ID. Data is loaded once per attribute, after
+    that reads do not allocate any objects.
+
+    Required arguments:
+    attr_getter -- callable which returns attribute metadata object
+    by attribute ID, and raises AttributeFetchError on failure
+    """
+
+    def __init__(self, attr_getter):
+        self.__attr_getter = attr_getter
+        self.__flags = array('B')
+        self.__max_attributes = []
+        self.__default_values = []
+        # Format: {attribute ID: (flags, max attribute, default value)}
+        self.__sparse = {}
+
+    def get_flags(self, attr_id):
+        """
+        Get flags describing attribute.
+
+        Required arguments:
+        attr_id -- ID of attribute
+
+        Return value:
+        Integer with FLAG_* bits set
+
+        Possible exceptions:
+        AttributeFetchError -- raised when attribute
+        metadata cannot be fetched
+        """
+        flags = 0
+        try:
+            if 0 <= attr_id <= MAX_DENSE_ID:
+                flags = self.__flags[attr_id]
+            else:
+                flags = self.__sparse[attr_id][0]
+        # Data of attribute hasn't been loaded yet,
+        # or invalid attribute ID is passed
+        except (IndexError, KeyError, TypeError):
+            pass
+        if flags:
+            return flags
+        return self.__load(attr_id)
+
+    def get_max_attribute(self, attr_id):
+        """
+        Get ID of attribute which caps passed attribute, or None.
+        Should be used only after get_flags() call for the attribute.
+        """
+        if self.__is_dense(attr_id):
+            return self.__max_attributes[attr_id]
+        return self.__sparse[attr_id][1]
+
+    def get_default_value(self, attr_id):
+        """
+        Get default value of attribute, or None. Should be used
+        only after get_flags() call for the attribute.
+        """
+        if self.__is_dense(attr_id):
+            return self.__default_values[attr_id]
+        return self.__sparse[attr_id][2]
+
+    def clear(self):
+        """Forget all loaded attribute data."""
+        self.__flags = array('B')
+        self.__max_attributes = []
+        self.__default_values = []
+        self.__sparse = {}
+
+    def __load(self, attr_id):
+        """
+        Fetch attribute metadata and put it into table.
+
+        Return value:
+        Flags of the attribute
+        """
+        # Only integer IDs can be used as indices
+        if not isinstance(attr_id, int):
+            raise AttributeFetchError(attr_id)
+        attribute = self.__attr_getter(attr_id)
+        flags = FLAG_LOADED
+        if attribute.max_attribute is not None:
+            flags |= FLAG_CAPPED
+        if attribute.high_is_good is True:
+            flags |= FLAG_HIGH_IS_GOOD
+        if attribute.stackable is False:
+            flags |= FLAG_PENALIZABLE
+        if attr_id in LIMITED_PRECISION:
+            flags |= FLAG_LIMITED_PRECISION
+        if not self.__is_dense(attr_id):
+            self.__sparse[attr_id] = (flags, attribute.max_attribute, attribute.default_value)
+            return flags
+        missing = attr_id + 1 - len(self.__flags)
+        if missing > 0:
+            self.__flags.extend(bytes(missing))
+            self.__max_attributes.extend((None,) * missing)
+            self.__default_values.extend((None,) * missing)
+        self.__flags[attr_id] = flags
+        self.__max_attributes[attr_id] = attribute.max_attribute
+        self.__default_values[attr_id] = attribute.default_value
+        return flags
+
+    @staticmethod
+    def __is_dense(attr_id):
+        return 0 <= attr_id <= MAX_DENSE_ID
@@ -0,0 +1,485 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import mmap
+import os
+import os.path
+import struct
+from logging import getLogger
+
+from eos.data.cache_object import *
+from eos.util.object_cache import ObjectCache
+from eos.util.repr import make_repr_str
+from .abc import BaseCacheHandler
+from .exception import TypeFetchError, AttributeFetchError, EffectFetchError, ModifierFetchError
+
+
+logger = getLogger(__name__)
+
+
+MAGIC = b'EOSB'
+FORMAT_VERSION = 2
+# Order of sections in file header
+SECTIONS = ('types', 'attributes', 'effects', 'modifiers')
+# Magic, format version, fingerprint record offset, generation
+# state record offset, then entry count and index offset for
+# each section
+HEADER = struct.Struct('<4sIQQ' + 'QQ' * len(SECTIONS))
+# Entity ID and offset of its record
+INDEX_ENTRY = struct.Struct('<qQ')
+INT = struct.Struct('<q')
+FLOAT = struct.Struct('<d')
+LENGTH = struct.Struct('<I')
+
+# Value tags used in records
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STR = 5
+TAG_SEQUENCE = 6
+TAG_MAP = 7
+
+
+class BinaryCacheHandler(BaseCacheHandler):
+    """
+    This cache handler implements on-disk cache store in the form
+    of indexed binary file, which is memory-mapped instead of being
+    read into memory. Records of entities are located via per-section
+    offset tables, sorted by entity ID, and decoded only when entity
+    is requested for the first time; assembled objects are kept in
+    object cache with strong LRU and weakref tiers.
+
+    Required arguments:
+    cache_path -- file name where on-disk cache will be stored
+
+    Optional arguments:
+    strong_cache_size -- amount of recently used objects of each kind
+    which are kept alive by handler even when they are not referenced
+    anywhere else (default 0)
+    """
+
+    def __init__(self, cache_path, strong_cache_size=0):
+        self._cache_path = os.path.abspath(cache_path)
+        self.__file = None
+        self.__map = None
+        self.__fingerprint = None
+        # Format: {section name: (entry count, index offset)}
+        self.__indices = {}
+        self.__state_offset = None
+        # Initialize object cache
+        self.__type_obj_cache = ObjectCache(strong_cache_size)
+        self.__attribute_obj_cache = ObjectCache(strong_cache_size)
+        self.__effect_obj_cache = ObjectCache(strong_cache_size)
+        self.__modifier_obj_cache = ObjectCache(strong_cache_size)
+        # If cache doesn't exist, silently finish initialization
+        if not os.path.exists(self._cache_path):
+            return
+        try:
+            self.__open()
+        except KeyboardInterrupt:
+            raise
+        # If file is corrupt or anything else bad happens,
+        # leave handler empty
+        except:
+            self.__close()
+            msg = 'error during reading cache'
+            logger.error(msg)
+
+    def get_type(self, type_id):
+        try:
+            type_id = int(type_id)
+        except TypeError as e:
+            raise TypeFetchError(type_id) from e
+        try:
+            type_ = self.__type_obj_cache[type_id]
+        except KeyError:
+            type_data = self.__get_record('types', type_id)
+            if type_data is None:
+                raise TypeFetchError(type_id)
+            type_ = Type(
+                type_id=type_id,
+                group=type_data[0],
+                category=type_data[1],
+                attributes=type_data[2],
+                effects=tuple(self.get_effect(effect_id) for effect_id in type_data[3]),
+                default_effect=None if type_data[4] is None else self.get_effect(type_data[4])
+            )
+            self.__type_obj_cache[type_id] = type_
+        return type_
+
+    def get_attribute(self, attr_id):
+        try:
+            attr_id = int(attr_id)
+        except TypeError as e:
+            raise AttributeFetchError(attr_id) from e
+        try:
+            attribute = self.__attribute_obj_cache[attr_id]
+        except KeyError:
+            attr_data = self.__get_record('attributes', attr_id)
+            if attr_data is None:
+                raise AttributeFetchError(attr_id)
+            attribute = Attribute(
+                attribute_id=attr_id,
+                max_attribute=attr_data[0],
+                default_value=attr_data[1],
+                high_is_good=attr_data[2],
+                stackable=attr_data[3]
+            )
+            self.__attribute_obj_cache[attr_id] = attribute
+        return attribute
+
+    def get_effect(self, effect_id):
+        try:
+            effect_id = int(effect_id)
+        except TypeError as e:
+            raise EffectFetchError(effect_id) from e
+        try:
+            effect = self.__effect_obj_cache[effect_id]
+        except KeyError:
+            effect_data = self.__get_record('effects', effect_id)
+            if effect_data is None:
+                raise EffectFetchError(effect_id)
+            effect = Effect(
+                effect_id=effect_id,
+                category=effect_data[0],
+                is_offensive=effect_data[1],
+                is_assistance=effect_data[2],
+                duration_attribute=effect_data[3],
+                discharge_attribute=effect_data[4],
+                range_attribute=effect_data[5],
+                falloff_attribute=effect_data[6],
+                tracking_speed_attribute=effect_data[7],
+                fitting_usage_chance_attribute=effect_data[8],
+                build_status=effect_data[9],
+                modifiers=tuple(self.get_modifier(modifier_id) for modifier_id in effect_data[10])
+            )
+            self.__effect_obj_cache[effect_id] = effect
+        return effect
+
+    def get_modifier(self, modifier_id):
+        try:
+            modifier_id = int(modifier_id)
+        except TypeError as e:
+            raise ModifierFetchError(modifier_id) from e
+        try:
+            modifier = self.__modifier_obj_cache[modifier_id]
+        except KeyError:
+            modifier_data = self.__get_record('modifiers', modifier_id)
+            if modifier_data is None:
+                raise ModifierFetchError(modifier_id)
+            modifier = Modifier(
+                modifier_id=modifier_id,
+                state=modifier_data[0],
+                scope=modifier_data[1],
+                src_attr=modifier_data[2],
+                operator=modifier_data[3],
+                tgt_attr=modifier_data[4],
+                domain=modifier_data[5],
+                filter_type=modifier_data[6],
+                filter_value=modifier_data[7]
+            )
+            self.__modifier_obj_cache[modifier_id] = modifier
+        return modifier
+
+    def get_fingerprint(self):
+        return self.__fingerprint
+
+    def get_cache_stats(self):
+        """
+        Get object cache statistics.
+
+        Return value:
+        Dictionary in {object kind: ObjectCacheStats} format
+        """
+        return {
+            'types': self.__type_obj_cache.stats,
+            'attributes': self.__attribute_obj_cache.stats,
+            'effects': self.__effect_obj_cache.stats,
+            'modifiers': self.__modifier_obj_cache.stats
+        }
+
+    def get_generation_state(self):
+        if self.__state_offset is None:
+            return None
+        return _decode(self.__map, self.__state_offset)[0]
+
+    def update_cache(self, data, fingerprint):
+        sections = self.__strip_data(data)
+        # Compose file contents
+        body = bytearray(HEADER.size)
+        header_values = []
+        for section in SECTIONS:
+            rows = sections[section]
+            record_offsets = {}
+            for entity_id in sorted(rows):
+                record_offsets[entity_id] = len(body)
+                _encode(rows[entity_id], body)
+            # Keep index entries aligned
+            body.extend(bytes(-len(body) % 8))
+            header_values.append(len(record_offsets))
+            header_values.append(len(body))
+            for entity_id in sorted(record_offsets):
+                body.extend(INDEX_ENTRY.pack(entity_id, record_offsets[entity_id]))
+        fingerprint_offset = len(body)
+        _encode(fingerprint, body)
+        state_offset = len(body)
+        _encode(data.get('generation_state'), body)
+        HEADER.pack_into(body, 0, MAGIC, FORMAT_VERSION, fingerprint_offset, state_offset, *header_values)
+        # Update disk cache. Write data into temporary file first,
+        # to make sure we do not leave half-written cache behind
+        cache_folder = os.path.dirname(self._cache_path)
+        if os.path.isdir(cache_folder) is not True:
+            os.makedirs(cache_folder, mode=0o755)
+        tmp_path = '{}.tmp'.format(self._cache_path)
+        with open(tmp_path, 'wb') as file:
+            file.write(body)
+        # Release mapping of old file before replacing it
+        self.__close()
+        os.replace(tmp_path, self._cache_path)
+        self.__open()
+
+    def __strip_data(self, data):
+        """
+        Rework passed data, keying it and stripping dictionary
+        keys from rows.
+        """
+        slim_data = {}
+
+        slim_types = {}
+        for type_row in data['types']:
+            type_id = type_row['type_id']
+            slim_types[type_id] = (
+                type_row['group'],
+                type_row['category'],
+                type_row['attributes'],
+                tuple(type_row['effects']),
+                type_row['default_effect']
+            )
+        slim_data['types'] = slim_types
+
+        slim_attribs = {}
+        for attr_row in data['attributes']:
+            attribute_id = attr_row['attribute_id']
+            slim_attribs[attribute_id] = (
+                attr_row['max_attribute'],
+                attr_row['default_value'],
+                attr_row['high_is_good'],
+                attr_row['stackable']
+            )
+        slim_data['attributes'] = slim_attribs
+
+        slim_effects = {}
+        for effect_row in data['effects']:
+            effect_id = effect_row['effect_id']
+            slim_effects[effect_id] = (
+                effect_row['effect_category'],
+                effect_row['is_offensive'],
+                effect_row['is_assistance'],
+                effect_row['duration_attribute'],
+                effect_row['discharge_attribute'],
+                effect_row['range_attribute'],
+                effect_row['falloff_attribute'],
+                effect_row['tracking_speed_attribute'],
+                effect_row['fitting_usage_chance_attribute'],
+                effect_row['build_status'],
+                tuple(effect_row['modifiers'])
+            )
+        slim_data['effects'] = slim_effects
+
+        slim_modifiers = {}
+        for modifier_row in data['modifiers']:
+            modifier_id = modifier_row['modifier_id']
+            slim_modifiers[modifier_id] = (
+                modifier_row['state'],
+                modifier_row['scope'],
+                modifier_row['src_attr'],
+                modifier_row['operator'],
+                modifier_row['tgt_attr'],
+                modifier_row['domain'],
+                modifier_row['filter_type'],
+                modifier_row['filter_value']
+            )
+        slim_data['modifiers'] = slim_modifiers
+
+        return slim_data
+
+    def __open(self):
+        """
+        Map cache file into memory and read its header.
+
+        Possible exceptions:
+        ValueError -- raised when file is not valid cache file
+        """
+        self.__file = open(self._cache_path, 'rb')
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self.__map, 0)
+        magic, version, fingerprint_offset, state_offset = header[:4]
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('unexpected cache file format')
+        indices = {}
+        for i, section in enumerate(SECTIONS):
+            indices[section] = (header[4 + i * 2], header[5 + i * 2])
+        self.__indices = indices
+        self.__state_offset = state_offset
+        self.__fingerprint = _decode(self.__map, fingerprint_offset)[0]
+        # Also clear object cache to make sure objects composed
+        # from old data are gone
+        self.__type_obj_cache.clear()
+        self.__attribute_obj_cache.clear()
+        self.__effect_obj_cache.clear()
+        self.__modifier_obj_cache.clear()
+        self.get_attribute_table().clear()
+
+    def __close(self):
+        """Unmap cache file and reset handler to empty state."""
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        self.__indices = {}
+        self.__state_offset = None
+        self.__fingerprint = None
+
+    def __get_record(self, section, entity_id):
+        """
+        Find and decode record of entity.
+
+        Required arguments:
+        section -- name of section, where entity is stored
+        entity_id -- ID of entity
+
+        Return value:
+        Decoded record, or None if entity is not found
+        """
+        try:
+            count, index_offset = self.__indices[section]
+        except KeyError:
+            return None
+        cache_map = self.__map
+        # Binary search over index entries, which are sorted by ID
+        low = 0
+        high = count
+        while low < high:
+            middle = (low + high) // 2
+            middle_id, record_offset = INDEX_ENTRY.unpack_from(
+                cache_map, index_offset + middle * INDEX_ENTRY.size)
+            if middle_id < entity_id:
+                low = middle + 1
+            elif middle_id > entity_id:
+                high = middle
+            else:
+                return _decode(cache_map, record_offset)[0]
+        return None
+
+    def __repr__(self):
+        spec = [['cache_path', '_cache_path']]
+        return make_repr_str(self, spec)
+
+
+def _encode(value, buffer):
+    """
+    Append binary representation of value to the buffer.
+
+    Required arguments:
+    value -- value to encode; None, bools, ints, floats, strings
+    and sequences/dictionaries of these are supported
+    buffer -- bytearray to append data to
+
+    Possible exceptions:
+    TypeError -- raised when value of unsupported type is passed
+    """
+    if value is None:
+        buffer.append(TAG_NONE)
+    elif value is False:
+        buffer.append(TAG_FALSE)
+    elif value is True:
+        buffer.append(TAG_TRUE)
+    elif isinstance(value, int):
+        buffer.append(TAG_INT)
+        buffer.extend(INT.pack(value))
+    elif isinstance(value, float):
+        buffer.append(TAG_FLOAT)
+        buffer.extend(FLOAT.pack(value))
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        buffer.append(TAG_STR)
+        buffer.extend(LENGTH.pack(len(encoded)))
+        buffer.extend(encoded)
+    elif isinstance(value, (tuple, list)):
+        buffer.append(TAG_SEQUENCE)
+        buffer.extend(LENGTH.pack(len(value)))
+        for item in value:
+            _encode(item, buffer)
+    elif isinstance(value, dict):
+        buffer.append(TAG_MAP)
+        buffer.extend(LENGTH.pack(len(value)))
+        for key, item in value.items():
+            _encode(key, buffer)
+            _encode(item, buffer)
+    else:
+        raise TypeError('cannot encode value of type {}'.format(type(value).__name__))
+
+
+def _decode(buffer, offset):
+    """
+    Decode value from the buffer.
+
+    Required arguments:
+    buffer -- object which supports buffer protocol
+    offset -- position at which encoded value starts
+
+    Return value:
+    (decoded value, position after encoded value) tuple
+    """
+    tag = buffer[offset]
+    offset += 1
+    if tag == TAG_NONE:
+        return None, offset
+    if tag == TAG_FALSE:
+        return False, offset
+    if tag == TAG_TRUE:
+        return True, offset
+    if tag == TAG_INT:
+        return INT.unpack_from(buffer, offset)[0], offset + INT.size
+    if tag == TAG_FLOAT:
+        return FLOAT.unpack_from(buffer, offset)[0], offset + FLOAT.size
+    length = LENGTH.unpack_from(buffer, offset)[0]
+    offset += LENGTH.size
+    if tag == TAG_STR:
+        end = offset + length
+        return bytes(buffer[offset:end]).decode('utf-8'), end
+    if tag == TAG_SEQUENCE:
+        items = []
+        for _ in range(length):
+            item, offset = _decode(buffer, offset)
+            items.append(item)
+        return tuple(items), offset
+    if tag == TAG_MAP:
+        items = {}
+        for _ in range(length):
+            key, offset = _decode(buffer, offset)
+            items[key], offset = _decode(buffer, offset)
+        return items, offset
+    raise ValueError('unknown value tag {}'.format(tag))
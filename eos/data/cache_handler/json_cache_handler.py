@@ -23,9 +23,9 @@ import bz2
 import json
 import os.path
 from logging import getLogger
-from weakref import WeakValueDictionary
 
 from eos.data.cache_object import *
+from eos.util.object_cache import ObjectCache
 from eos.util.repr import make_repr_str
 from .abc import BaseCacheHandler
 from .exception import TypeFetchError, AttributeFetchError, EffectFetchError, ModifierFetchError
@@ -38,26 +38,34 @@ class JsonCacheHandler(BaseCacheHandler):
     """
     This cache handler implements on-disk cache store in the form
     of compressed JSON. To improve performance further, it also
-    keeps loads data from on-disk cache to memory, and uses weakref
-    object cache for assembled objects.
+    keeps loads data from on-disk cache to memory, and uses object
+    cache with strong LRU and weakref tiers for assembled objects.
 
     Required arguments:
-    cache_path -- file name where on-disk cache will be stored (.json.bz2)
+    cache_path -- file name where on-disk cache will be stored (.json.bz2);
+    generation state of the cache is stored separately, in file with
+    .state suffix added to this name
+
+    Optional arguments:
+    strong_cache_size -- amount of recently used objects of each kind
+    which are kept alive by handler even when they are not referenced
+    anywhere else (default 0)
     """
 
-    def __init__(self, cache_path):
+    def __init__(self, cache_path, strong_cache_size=0):
         self._cache_path = os.path.abspath(cache_path)
+        self._state_path = '{}.state'.format(self._cache_path)
         # Initialize memory data cache
         self.__type_data_cache = {}
         self.__attribute_data_cache = {}
         self.__effect_data_cache = {}
         self.__modifier_data_cache = {}
         self.__fingerprint = None
-        # Initialize weakref object cache
-        self.__type_obj_cache = WeakValueDictionary()
-        self.__attribute_obj_cache = WeakValueDictionary()
-        self.__effect_obj_cache = WeakValueDictionary()
-        self.__modifier_obj_cache = WeakValueDictionary()
+        # Initialize object cache
+        self.__type_obj_cache = ObjectCache(strong_cache_size)
+        self.__attribute_obj_cache = ObjectCache(strong_cache_size)
+        self.__effect_obj_cache = ObjectCache(strong_cache_size)
+        self.__modifier_obj_cache = ObjectCache(strong_cache_size)
 
         # If cache doesn't exist, silently finish initialization
         if not os.path.exists(self._cache_path):
@@ -189,9 +197,35 @@ class JsonCacheHandler(BaseCacheHandler):
     def get_fingerprint(self):
         return self.__fingerprint
 
+    def get_cache_stats(self):
+        """
+        Get object cache statistics.
+
+        Return value:
+        Dictionary in {object kind: ObjectCacheStats} format
+        """
+        return {
+            'types': self.__type_obj_cache.stats,
+            'attributes': self.__attribute_obj_cache.stats,
+            'effects': self.__effect_obj_cache.stats,
+            'modifiers': self.__modifier_obj_cache.stats
+        }
+
+    def get_generation_state(self):
+        # Generation state is needed only when cache is being
+        # regenerated, thus it's kept in separate file, which
+        # is read from disk on request
+        try:
+            with bz2.BZ2File(self._state_path, 'r') as file:
+                return json.loads(file.read().decode('utf-8'))
+        except KeyboardInterrupt:
+            raise
+        except:
+            return None
+
     def update_cache(self, data, fingerprint):
-        # Make light version of data and add fingerprint
-        # to it
+        generation_state = data.get('generation_state')
+        # Make light version of data and add fingerprint to it
         data = self.__strip_data(data)
         data['fingerprint'] = fingerprint
         # Update disk cache
@@ -201,6 +235,13 @@ class JsonCacheHandler(BaseCacheHandler):
         with bz2.BZ2File(self._cache_path, 'w') as file:
             json_data = json.dumps(data)
             file.write(json_data.encode('utf-8'))
+        # Do not leave state of previous generation behind
+        if generation_state is None:
+            if os.path.exists(self._state_path):
+                os.remove(self._state_path)
+        else:
+            with bz2.BZ2File(self._state_path, 'w') as file:
+                file.write(json.dumps(generation_state).encode('utf-8'))
         # Update data cache; encode to JSON and decode back
         # to make sure form of data is the same as after
         # loading it from cache (e.g. dictionary keys are
@@ -291,6 +332,7 @@ class JsonCacheHandler(BaseCacheHandler):
         self.__attribute_obj_cache.clear()
         self.__effect_obj_cache.clear()
         self.__modifier_obj_cache.clear()
+        self.get_attribute_table().clear()
 
     def __repr__(self):
         spec = [['cache_path', '_cache_path']]
@@ -37,3 +37,12 @@ class ExistingSourceError(EosError):
     already exists.
     """
     pass
+
+
+class SourceNotReadyError(EosError):
+    """
+    Raised when source which is being prepared in background
+    is requested, and it doesn't become ready within requested
+    time.
+    """
+    pass
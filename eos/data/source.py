@@ -21,18 +21,23 @@
 
 from logging import getLogger
 from collections import namedtuple
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from threading import Lock, Thread
 
 from eos import __version__ as eos_version
 from eos.util.repr import make_repr_str
 from .cache_customizer import CacheCustomizer
 from .cache_generator import CacheGenerator
-from .exception import ExistingSourceError, UnknownSourceError
+from .exception import ExistingSourceError, SourceNotReadyError, UnknownSourceError
 
 
 logger = getLogger(__name__)
 
 
 Source = namedtuple('Source', ('alias', 'cache_handler'))
+# Data of source which is added in lazy or asynchronous mode and
+# wasn't prepared yet; future is None for lazy sources
+PendingSource = namedtuple('PendingSource', ('data_handler', 'cache_handler', 'lock', 'future'))
 
 
 class SourceManager:
@@ -46,11 +51,23 @@ class SourceManager:
     # {literal alias: Source}
     _sources = {}
 
+    # Sources added in lazy or asynchronous mode, which are not
+    # prepared yet
+    # Format: {literal alias: PendingSource}
+    _pending = {}
+
     # Default source, will be used implicitly when instantiating fit
     default = None
 
+    # Alias of lazy source which will become default when it's
+    # prepared
+    _default_alias = None
+
+    # Guards access to containers with sources
+    _lock = Lock()
+
     @classmethod
-    def add(cls, alias, data_handler, cache_handler, make_default=False):
+    def add(cls, alias, data_handler, cache_handler, make_default=False, lazy=False):
         """
         Add source to source manager - this includes initializing
         all facilities hidden behind name 'source'. After source
@@ -61,58 +78,138 @@ class SourceManager:
         data_handler -- object which implements standard data interface
         (returns data rows for several tables as dicts and is able to
         get data version)
-        cache_handler -- cache handler implementation
+        cache_handler -- cache handler implementation; in lazy mode, it
+        can also be callable without arguments which returns cache
+        handler, to postpone loading of cache
 
         Optional arguments:
         make_default -- marks passed source default; it will be used
         by default for instantiating new fits
+        lazy -- when True, source is only recorded, and fingerprint
+        check and cache update are run when source is requested for
+        the first time (e.g. when fit uses it); default source added
+        this way becomes accessible via default attribute only after
+        that, or after call to get_default()
         """
         logger.info('adding source with alias "{}"'.format(alias))
-        if alias in cls._sources:
-            raise ExistingSourceError(alias)
+        with cls._lock:
+            if alias in cls._sources or alias in cls._pending:
+                raise ExistingSourceError(alias)
+            if lazy:
+                cls._pending[alias] = PendingSource(
+                    data_handler=data_handler, cache_handler=cache_handler, lock=Lock(), future=None)
+                if make_default is True:
+                    cls._default_alias = alias
+                return
+        source = cls.__prepare_source(alias, data_handler, cache_handler)
+        # Finally, add record to list of sources
+        with cls._lock:
+            cls._sources[alias] = source
+            if make_default is True:
+                cls.default = source
+                cls._default_alias = None
 
-        # Compare fingerprints from data and cache
-        cache_fp = cache_handler.get_fingerprint()
-        data_version = data_handler.get_version()
-        current_fp = cls.__format_fingerprint(data_version)
+    @classmethod
+    def add_async(cls, alias, data_handler, cache_handler, make_default=False, executor=None):
+        """
+        Add source to source manager in background. Fingerprint
+        check, cache update and cache loading are run outside of
+        calling thread, while the source is immediately listed by
+        the manager. Requests of source which is not ready yet
+        wait for it to become ready, see get().
 
-        # If data version is corrupt or fingerprints mismatch, update cache
-        if data_version is None or cache_fp != current_fp:
-            if data_version is None:
-                logger.info('data version is None, updating cache')
-            else:
-                msg = 'fingerprint mismatch: cache "{}", data "{}", updating cache'.format(
-                    cache_fp, current_fp)
-                logger.info(msg)
+        Required arguments:
+        alias -- alias under which source will be accessible
+        data_handler -- object which implements standard data interface
+        cache_handler -- cache handler implementation, or callable
+        without arguments which returns cache handler
 
-            # Generate cache, apply customizations and write it
-            cache_data = CacheGenerator().run(data_handler)
-            CacheCustomizer().run_builtin(cache_data)
-            cache_handler.update_cache(cache_data, current_fp)
+        Optional arguments:
+        make_default -- marks passed source default
+        executor -- thread pool executor to prepare source in; if not
+        specified, source is prepared in dedicated thread
 
-        # Finally, add record to list of sources
-        source = Source(alias=alias, cache_handler=cache_handler)
-        cls._sources[alias] = source
-        if make_default is True:
-            cls.default = source
+        Return value:
+        concurrent.futures.Future, which resolves into (alias,
+        cache_handler) named tuple when source is ready; it can be
+        awaited in asyncio code via asyncio.wrap_future(). If
+        preparation fails, source is removed from manager and future
+        holds raised exception
+        """
+        logger.info('adding source with alias "{}" asynchronously'.format(alias))
+        future = Future()
+        pending = PendingSource(
+            data_handler=data_handler, cache_handler=cache_handler, lock=Lock(), future=future)
+        with cls._lock:
+            if alias in cls._sources or alias in cls._pending:
+                raise ExistingSourceError(alias)
+            cls._pending[alias] = pending
+            if make_default is True:
+                cls._default_alias = alias
+        if executor is None:
+            Thread(target=cls.__prepare_async, args=(alias, pending), daemon=True).start()
+        else:
+            executor.submit(cls.__prepare_async, alias, pending)
+        return future
 
     @classmethod
-    def get(cls, alias):
+    def get(cls, alias, timeout=None):
         """
-        Using source alias, return source data.
+        Using source alias, return source data. If source has
+        been added in lazy mode, it is prepared on first request;
+        concurrent requests wait until preparation is finished.
+        If source has been added asynchronously, wait for its
+        background preparation to finish.
 
         Required arguments:
         alias -- alias of source to return
 
+        Optional arguments:
+        timeout -- how many seconds to wait for source which is
+        prepared in background; by default, wait until it's ready
+
         Return value:
-        (alias, edb, eos) named tuple with alias,
-        SQL Alchemy database session and Eos instance for requested
-        source
+        (alias, cache_handler) named tuple with alias and
+        cache handler for requested source
+
+        Possible exceptions:
+        UnknownSourceError -- raised when there's no source with
+        passed alias
+        SourceNotReadyError -- raised when source prepared in
+        background didn't become ready within timeout
         """
         try:
             return cls._sources[alias]
         except KeyError:
-            raise UnknownSourceError(alias)
+            pass
+        with cls._lock:
+            pending = cls._pending.get(alias)
+        if pending is None:
+            # Source could have been prepared by another thread
+            # between two checks
+            try:
+                return cls._sources[alias]
+            except KeyError:
+                raise UnknownSourceError(alias)
+        if pending.future is not None:
+            try:
+                return pending.future.result(timeout)
+            except FutureTimeoutError:
+                raise SourceNotReadyError(alias)
+        return cls.__resolve_pending(alias, pending)
+
+    @classmethod
+    def get_default(cls):
+        """
+        Return default source, preparing it if it has been
+        added in lazy mode, or waiting for it if it's being
+        prepared in background. If there's no default source,
+        return None.
+        """
+        default_alias = cls._default_alias
+        if default_alias is not None:
+            return cls.get(default_alias)
+        return cls.default
 
     @classmethod
     def remove(cls, alias):
@@ -123,14 +220,132 @@ class SourceManager:
         alias -- alias of source to remove
         """
         logger.info('removing source with alias "{}"'.format(alias))
-        try:
-            del cls._sources[alias]
-        except KeyError:
-            raise UnknownSourceError(alias)
+        with cls._lock:
+            if alias in cls._pending:
+                del cls._pending[alias]
+                if cls._default_alias == alias:
+                    cls._default_alias = None
+                return
+            try:
+                del cls._sources[alias]
+            except KeyError:
+                raise UnknownSourceError(alias)
 
     @classmethod
     def list(cls):
-        return list(cls._sources.keys())
+        with cls._lock:
+            return list(cls._sources.keys()) + list(cls._pending.keys())
+
+    @classmethod
+    def __resolve_pending(cls, alias, pending):
+        """
+        Prepare source which hasn't been prepared yet, and move
+        it from pending sources to ready sources.
+
+        Required arguments:
+        alias -- alias of source
+        pending -- PendingSource object for source
+
+        Return value:
+        Source object
+        """
+        with pending.lock:
+            # Check if other thread prepared it while we were waiting
+            try:
+                return cls._sources[alias]
+            except KeyError:
+                pass
+            cache_handler = pending.cache_handler
+            if not hasattr(cache_handler, 'get_fingerprint'):
+                cache_handler = cache_handler()
+            source = cls.__prepare_source(alias, pending.data_handler, cache_handler)
+            with cls._lock:
+                # Source could have been removed during preparation
+                if cls._pending.get(alias) is not pending:
+                    raise UnknownSourceError(alias)
+                del cls._pending[alias]
+                cls._sources[alias] = source
+                if cls._default_alias == alias:
+                    cls.default = source
+                    cls._default_alias = None
+        return source
+
+    @classmethod
+    def __prepare_async(cls, alias, pending):
+        """
+        Prepare source added asynchronously and pass result
+        to its future.
+
+        Required arguments:
+        alias -- alias of source
+        pending -- PendingSource object for source
+        """
+        future = pending.future
+        if not future.set_running_or_notify_cancel():
+            cls.__discard_pending(alias, pending)
+            return
+        try:
+            source = cls.__resolve_pending(alias, pending)
+        except BaseException as e:
+            logger.warning('failed to prepare source with alias "{}"'.format(alias))
+            cls.__discard_pending(alias, pending)
+            future.set_exception(e)
+        else:
+            future.set_result(source)
+
+    @classmethod
+    def __discard_pending(cls, alias, pending):
+        """
+        Remove record about pending source, if it's still there.
+
+        Required arguments:
+        alias -- alias of source
+        pending -- PendingSource object for source
+        """
+        with cls._lock:
+            if cls._pending.get(alias) is pending:
+                del cls._pending[alias]
+                if cls._default_alias == alias:
+                    cls._default_alias = None
+
+    @classmethod
+    def __prepare_source(cls, alias, data_handler, cache_handler):
+        """
+        Make sure cache is up to date with data, updating it
+        if needed, and compose source.
+
+        Required arguments:
+        alias -- alias of source
+        data_handler -- data handler of source
+        cache_handler -- cache handler of source
+
+        Return value:
+        Source object
+        """
+        # Compare fingerprints from data and cache
+        cache_fp = cache_handler.get_fingerprint()
+        data_version = data_handler.get_version()
+        current_fp = cls.__format_fingerprint(data_version)
+
+        # If data version is corrupt or fingerprints mismatch, update cache
+        if data_version is None or cache_fp != current_fp:
+            if data_version is None:
+                logger.info('data version is None, updating cache')
+            else:
+                msg = 'fingerprint mismatch: cache "{}", data "{}", updating cache'.format(
+                    cache_fp, current_fp)
+                logger.info(msg)
+
+            # Generate cache, apply customizations and write it. Pass
+            # state of previous generation to generator, to rebuild
+            # only data which changed since then
+            generator = CacheGenerator()
+            cache_data = generator.run(data_handler, previous_state=cache_handler.get_generation_state())
+            CacheCustomizer().run_builtin(cache_data)
+            cache_data['generation_state'] = generator.generation_state
+            cache_handler.update_cache(cache_data, current_fp)
+
+        return Source(alias=alias, cache_handler=cache_handler)
 
     @staticmethod
     def __format_fingerprint(data_version):
@@ -19,5 +19,6 @@
 # ===============================================================================
 
 
+from .instrumentation import CalculatorInstrumentation
 from .map import MutableAttributeMap
 from .service import CalculationService
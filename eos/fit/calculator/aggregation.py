@@ -0,0 +1,143 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from math import exp
+
+
+# Stacking penalty base constant, used in attribute calculations
+PENALTY_BASE = 1 / exp((1 / 2.67) ** 2)
+
+# Stacking penalty factors by position of modifier in chain;
+# 12th modifier and further are ignored as non-significant
+PENALTY_FACTORS = tuple(PENALTY_BASE ** (position ** 2) for position in range(11))
+
+BACKEND_PYTHON = 'python'
+BACKEND_NUMPY = 'numpy'
+
+# Name of backend currently in use
+_backend = BACKEND_PYTHON
+
+
+def get_backend():
+    """
+    Return name of aggregation backend currently in use.
+    """
+    return _backend
+
+
+def set_backend(name):
+    """
+    Switch aggregation backend.
+
+    Required arguments:
+    name -- name of backend, BACKEND_PYTHON or BACKEND_NUMPY
+
+    Possible exceptions:
+    ValueError -- raised when unknown backend name is passed
+    ImportError -- raised when NumPy backend is requested, but
+    NumPy is not available
+    """
+    global _backend, penalize_many
+    if name == BACKEND_PYTHON:
+        penalize_many = _penalize_many_python
+    elif name == BACKEND_NUMPY:
+        penalize_many = _make_penalize_many_numpy()
+    else:
+        raise ValueError(name)
+    _backend = name
+
+
+def penalize(mod_list):
+    """
+    Calculate aggregated factor of passed factors, taking into
+    consideration stacking penalty.
+
+    Required arguments:
+    mod_list -- list of factors
+
+    Return value:
+    Final aggregated factor of passed mod_list
+    """
+    # Gather positive modifiers into one chain, negative
+    # into another; values are transformed into form of
+    # multiplier - 1 for ease of stacking chain calculation
+    chain_positive = []
+    chain_negative = []
+    for mod_val in mod_list:
+        mod_val -= 1
+        if mod_val >= 0:
+            chain_positive.append(mod_val)
+        else:
+            chain_negative.append(mod_val)
+    # Strongest modifiers always go first
+    chain_positive.sort(reverse=True)
+    chain_negative.sort()
+    list_result = 1
+    for chain in (chain_positive, chain_negative):
+        chain_result = 1
+        # Modifiers which do not have factor are ignored
+        for modifier, factor in zip(chain, PENALTY_FACTORS):
+            chain_result *= 1 + modifier * factor
+        list_result *= chain_result
+    return list_result
+
+
+def _penalize_many_python(mod_lists):
+    return [penalize(mod_list) for mod_list in mod_lists]
+
+
+def _make_penalize_many_numpy():
+    """
+    Make NumPy-backed version of penalize_many().
+    """
+    import numpy
+    factor_table = numpy.array(PENALTY_FACTORS)
+    chain_len = len(PENALTY_FACTORS)
+
+    def penalize_many_numpy(mod_lists):
+        # Lists with few values are processed faster without
+        # conversion to array
+        width = max((len(mod_list) for mod_list in mod_lists), default=0)
+        if width <= 2:
+            return _penalize_many_python(mod_lists)
+        # Values are padded with 1, which is converted to 0 and ends
+        # up in the end of positive chain, thus does not change result
+        values = numpy.ones((len(mod_lists), width))
+        for row, mod_list in zip(values, mod_lists):
+            row[:len(mod_list)] = mod_list
+        values -= 1
+        chain_positive = -numpy.sort(-numpy.where(values >= 0, values, 0), axis=1)[:, :chain_len]
+        chain_negative = numpy.sort(numpy.where(values < 0, values, 0), axis=1)[:, :chain_len]
+        factors = factor_table[:chain_positive.shape[1]]
+        result = (
+            numpy.prod(1 + chain_positive * factors, axis=1) *
+            numpy.prod(1 + chain_negative * factors, axis=1)
+        )
+        return result.tolist()
+
+    return penalize_many_numpy
+
+
+# Calculate aggregated factors with stacking penalty for multiple
+# lists of factors at once. Takes sequence with lists of factors,
+# returns list with final factor for each of them. Implementation
+# depends on backend, see set_backend()
+penalize_many = _penalize_many_python
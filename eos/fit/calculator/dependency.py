@@ -0,0 +1,133 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.util.keyed_set import KeyedSet
+
+
+class DependencyRegister:
+    """
+    Keep track of dependencies between calculated attribute values.
+    Each node is (holder, attribute ID) pair; edge from one node to
+    another means that value of the latter has been calculated using
+    value of the former, either as modification source or as cap.
+    Edges are recorded when values are calculated, which allows to
+    invalidate everything relying on changed value without
+    regenerating and scanning affectors.
+    """
+
+    def __init__(self):
+        # Format: {(holder, attribute ID): {(holder, attribute ID)}}
+        self.__dependents = KeyedSet()
+
+        # Reverse map for dependents, used to clean up stale edges
+        # when attribute value is recalculated
+        # Format: {(holder, attribute ID): {(holder, attribute ID)}}
+        self.__dependencies = KeyedSet()
+
+        # Attributes of holders which are part of the graph
+        # Format: {holder: {attribute IDs}}
+        self.__holder_attrs = KeyedSet()
+
+    def add_dependency(self, src_holder, src_attr, tgt_holder, tgt_attr):
+        """
+        Record that value of target attribute relies on value
+        of source attribute.
+
+        Required arguments:
+        src_holder -- holder which carries source attribute
+        src_attr -- ID of source attribute
+        tgt_holder -- holder which carries dependent attribute
+        tgt_attr -- ID of dependent attribute
+        """
+        src = (src_holder, src_attr)
+        tgt = (tgt_holder, tgt_attr)
+        self.__dependents.add_data(src, tgt)
+        self.__dependencies.add_data(tgt, src)
+        self.__holder_attrs.add_data(src_holder, src_attr)
+        self.__holder_attrs.add_data(tgt_holder, tgt_attr)
+
+    def clear_dependencies(self, holder, attr):
+        """
+        Remove all edges which lead to passed attribute.
+
+        Required arguments:
+        holder -- holder which carries attribute
+        attr -- ID of attribute
+        """
+        tgt = (holder, attr)
+        for src in self.__dependencies.pop(tgt, ()):
+            self.__dependents.rm_data(src, tgt)
+
+    def pop_dependents(self, holder, attr):
+        """
+        Remove all edges which start at passed attribute.
+
+        Required arguments:
+        holder -- holder which carries attribute
+        attr -- ID of attribute
+
+        Return value:
+        Set with (holder, attribute ID) tuples which were relying
+        on passed attribute
+        """
+        src = (holder, attr)
+        dependents = self.__dependents.pop(src, ())
+        for tgt in dependents:
+            self.__dependencies.rm_data(tgt, src)
+        return dependents
+
+    def get_dependents(self, holder, attr):
+        """
+        Get attributes relying on passed attribute.
+
+        Required arguments:
+        holder -- holder which carries attribute
+        attr -- ID of attribute
+
+        Return value:
+        Set with (holder, attribute ID) tuples
+        """
+        return self.__dependents.get_data((holder, attr))
+
+    def get_dependencies(self, holder, attr):
+        """
+        Get attributes which passed attribute relies on.
+
+        Required arguments:
+        holder -- holder which carries attribute
+        attr -- ID of attribute
+
+        Return value:
+        Set with (holder, attribute ID) tuples
+        """
+        return self.__dependencies.get_data((holder, attr))
+
+    def unregister_holder(self, holder):
+        """
+        Remove all edges which start or end at attributes of
+        passed holder.
+
+        Required arguments:
+        holder -- holder to remove from the graph
+        """
+        for attr in self.__holder_attrs.pop(holder, ()):
+            self.pop_dependents(holder, attr)
+            self.clear_dependencies(holder, attr)
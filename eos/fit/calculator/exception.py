@@ -84,3 +84,11 @@ class OperatorError(AttributeCalculatorError):
     using operator which is not supported by calculate method.
     """
     pass
+
+
+class AttributeCycleError(AttributeCalculatorError):
+    """
+    Raised when attribute, directly or via other attributes,
+    relies on itself, thus its value cannot be calculated.
+    """
+    pass
@@ -0,0 +1,184 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from collections import Counter
+from time import perf_counter
+
+
+class CalculatorInstrumentation:
+    """
+    Collect data about work done by calculator: attribute calculations,
+    cache hits, invalidations, affectors visited during calculations,
+    time spent calculating attributes and amount of attributes
+    invalidated per message. Time spent on calculation of attribute
+    does not include time spent on calculation of attributes it relies
+    on. Holders are accounted by name of their class.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget all collected data."""
+        # Format: {attribute ID: count}
+        self.calculations_by_attr = Counter()
+        # Format: {holder class name: count}
+        self.calculations_by_holder = Counter()
+        # Format: {attribute ID: count}
+        self.hits_by_attr = Counter()
+        # Format: {holder class name: count}
+        self.hits_by_holder = Counter()
+        # Format: {attribute ID: count}
+        self.invalidations_by_attr = Counter()
+        # Format: {holder class name: count}
+        self.invalidations_by_holder = Counter()
+        # Format: {attribute ID: count}
+        self.affectors_by_attr = Counter()
+        # Format: {attribute ID: seconds}
+        self.time_by_attr = Counter()
+        # Format: {message class name: count}
+        self.messages = Counter()
+        # Format: {message class name: count}
+        self.fan_out_total = Counter()
+        # Format: {message class name: count}
+        self.fan_out_max = Counter()
+        # Calculations in progress
+        # Format: [[start time, time spent on nested calculations]]
+        self.__calculation_stack = []
+        # Messages being handled
+        # Format: [[message class name, invalidation count]]
+        self.__message_stack = []
+
+    # Methods used by calculator
+    def calculation_started(self):
+        self.__calculation_stack.append([perf_counter(), 0])
+
+    def calculation_finished(self, holder, attr):
+        start, nested_time = self.__calculation_stack.pop()
+        elapsed = perf_counter() - start
+        self.time_by_attr[attr] += elapsed - nested_time
+        if self.__calculation_stack:
+            self.__calculation_stack[-1][1] += elapsed
+        self.calculations_by_attr[attr] += 1
+        self.calculations_by_holder[type(holder).__name__] += 1
+
+    def affectors_visited(self, attr, count):
+        self.affectors_by_attr[attr] += count
+
+    def cache_hit(self, holder, attr):
+        self.hits_by_attr[attr] += 1
+        self.hits_by_holder[type(holder).__name__] += 1
+
+    def invalidation(self, holder, attr):
+        self.invalidations_by_attr[attr] += 1
+        self.invalidations_by_holder[type(holder).__name__] += 1
+        if self.__message_stack:
+            self.__message_stack[-1][1] += 1
+
+    def message_started(self, message):
+        self.__message_stack.append([type(message).__name__, 0])
+
+    def message_finished(self):
+        message_name, invalidations = self.__message_stack.pop()
+        self.messages[message_name] += 1
+        self.fan_out_total[message_name] += invalidations
+        self.fan_out_max[message_name] = max(self.fan_out_max[message_name], invalidations)
+
+    # Reporting methods
+    def report(self):
+        """
+        Get collected data as dictionary.
+
+        Return value:
+        Dictionary with calculations, cache_hits, invalidations,
+        affectors_visited, time and fan_out entries
+        """
+        return {
+            'calculations': {
+                'total': sum(self.calculations_by_attr.values()),
+                'by_attribute': dict(self.calculations_by_attr),
+                'by_holder_type': dict(self.calculations_by_holder)
+            },
+            'cache_hits': {
+                'total': sum(self.hits_by_attr.values()),
+                'by_attribute': dict(self.hits_by_attr),
+                'by_holder_type': dict(self.hits_by_holder)
+            },
+            'invalidations': {
+                'total': sum(self.invalidations_by_attr.values()),
+                'by_attribute': dict(self.invalidations_by_attr),
+                'by_holder_type': dict(self.invalidations_by_holder)
+            },
+            'affectors_visited': {
+                'total': sum(self.affectors_by_attr.values()),
+                'by_attribute': dict(self.affectors_by_attr)
+            },
+            'time': {
+                'total': sum(self.time_by_attr.values()),
+                'by_attribute': dict(self.time_by_attr)
+            },
+            'fan_out': {
+                message_name: {
+                    'messages': count,
+                    'invalidations': self.fan_out_total[message_name],
+                    'max': self.fan_out_max[message_name]
+                }
+                for message_name, count in self.messages.items()
+            }
+        }
+
+    def to_prometheus(self, prefix='eos_calculator'):
+        """
+        Get collected data in Prometheus text exposition format.
+
+        Optional arguments:
+        prefix -- prefix of metric names (default eos_calculator)
+
+        Return value:
+        String with metrics
+        """
+        lines = []
+        metrics = (
+            ('calculations_total', 'counter', 'Attribute value calculations', (
+                ('attribute', self.calculations_by_attr), ('holder_type', self.calculations_by_holder))),
+            ('cache_hits_total', 'counter', 'Reads of already calculated attribute values', (
+                ('attribute', self.hits_by_attr), ('holder_type', self.hits_by_holder))),
+            ('invalidations_total', 'counter', 'Removals of calculated attribute values', (
+                ('attribute', self.invalidations_by_attr), ('holder_type', self.invalidations_by_holder))),
+            ('affectors_visited_total', 'counter', 'Affectors processed during calculations', (
+                ('attribute', self.affectors_by_attr),)),
+            ('calculation_seconds_total', 'counter', 'Time spent on attribute calculations', (
+                ('attribute', self.time_by_attr),)),
+            ('messages_total', 'counter', 'Messages handled by calculator', (
+                ('message', self.messages),)),
+            ('message_invalidations_total', 'counter', 'Values invalidated while handling messages', (
+                ('message', self.fan_out_total),)),
+            ('message_invalidations_max', 'gauge', 'Maximum values invalidated while handling single message', (
+                ('message', self.fan_out_max),))
+        )
+        for name, metric_type, description, series in metrics:
+            full_name = '{}_{}'.format(prefix, name)
+            lines.append('# HELP {} {}'.format(full_name, description))
+            lines.append('# TYPE {} {}'.format(full_name, metric_type))
+            for label, counter in series:
+                for key in sorted(counter, key=str):
+                    lines.append('{}{{{}="{}"}} {}'.format(full_name, label, key, counter[key]))
+        return '\n'.join(lines) + '\n'
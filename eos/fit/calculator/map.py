@@ -21,15 +21,18 @@
 
 from collections import namedtuple
 from logging import getLogger
-from math import exp
 
 from eos.const.eos import Operator
-from eos.const.eve import Category, Attribute
+from eos.const.eve import Category
+from eos.data.cache_handler.attribute_table import (
+    FLAG_CAPPED, FLAG_HIGH_IS_GOOD, FLAG_PENALIZABLE, FLAG_LIMITED_PRECISION
+)
 from eos.data.cache_handler.exception import AttributeFetchError
 from eos.fit.holder.mixin.holder.exception import NoSourceError
 from eos.fit.messages import AttrValueChanged, AttrValueChangedOverride
-from eos.util.keyed_set import KeyedSet
-from .exception import BaseValueError, AttributeMetaError, OperatorError
+from eos.util.volatile_cache import NO_VALUE, input_frames
+from . import aggregation
+from .exception import BaseValueError, AttributeMetaError, AttributeCycleError
 
 
 OverrideData = namedtuple('OverrideData', ('value', 'persistent'))
@@ -38,9 +41,6 @@ OverrideData = namedtuple('OverrideData', ('value', 'persistent'))
 logger = getLogger(__name__)
 
 
-# Stacking penalty base constant, used in attribute calculations
-PENALTY_BASE = 1 / exp((1 / 2.67) ** 2)
-
 # Items belonging to these categories never have
 # their effects stacking penalized
 PENALTY_IMMUNE_CATEGORIES = (
@@ -90,14 +90,11 @@ MULTIPLICATIONS = (
     Operator.post_percent
 )
 
-# Following attributes have limited precision - only
-# to second number after point
-LIMITED_PRECISION = (
-    Attribute.cpu,
-    Attribute.power,
-    Attribute.cpu_output,
-    Attribute.power_output
-)
+# Ways to aggregate normalized values of operator group
+AGGREGATE_MAX = 1
+AGGREGATE_MIN = 2
+AGGREGATE_ADD = 3
+AGGREGATE_MUL = 4
 
 
 class MutableAttributeMap:
@@ -111,45 +108,57 @@ class MutableAttributeMap:
     def __init__(self, holder):
         # Reference to holder for internal needs
         self.__holder = holder
-        # Actual container of calculated attributes
+        # Actual container of calculated attributes, which
+        # may be shared with equivalent holders
         # Format: {attribute ID: value}
         self.__modified_attributes = {}
+        # Group of holders sharing container of calculated
+        # attributes, None if it's not shared
+        self.__group = None
+        # True when container of calculated attributes is shared
+        # with other fit; such container is copied before change
+        self.__borrowed = False
         # Container for overriden attributes. Initialized
         # to None to not waste memory, will be changed to dict
         # when needed.
         # Format: {attribute ID: (value, persistent)}
         self.__overridden_attributes = None
-        # This variable stores map of attributes which cap
-        # something, and attributes capped by them. Initialized
-        # to None due to the same reasons as override.
-        # Format {capping attribute ID: {capped attribute IDs}}
-        self.__cap_map = None
+        # Compiled calculation plans, which are valid while set
+        # of affectors influencing attribute doesn't change
+        # Format: {attribute ID: plan}
+        self.__plans = {}
+        # Collector of calculator statistics, set by calculation
+        # service when instrumentation is enabled
+        self._instrumentation = None
 
     def __getitem__(self, attr):
+        # Volatile properties which are being calculated
+        # need to know which values they rely on
+        frames = input_frames.stack
+        if frames and frames[-1] is not None:
+            return self.__get_as_input(attr)
         # Try getting override first
         if attr in self._overrides:
             return self._overrides[attr].value
         # If value is stored in modified map, it's considered as valid
         try:
             val = self.__modified_attributes[attr]
-        # Else, we have to run full calculation process
+        # Else, we have to run full calculation process, calculating
+        # values this attribute relies on first
         except KeyError:
             try:
-                val = self.__modified_attributes[attr] = self.__calculate(attr)
-            except BaseValueError as e:
-                msg = 'unable to find base value for attribute {} on item {}'.format(
-                    e.args[0], self.__holder._type_id)
-                logger.warning(msg)
-                raise KeyError(attr) from e
-            except AttributeMetaError as e:
-                msg = 'unable to fetch metadata for attribute {}, requested for item {}'.format(
-                    e.args[0], self.__holder._type_id)
+                failed = self.__resolve(attr)
+            except AttributeCycleError as e:
+                msg = 'unable to calculate attribute {} on item {}: attribute relies on itself via {}'.format(
+                    attr, self.__holder._type_id, ' -> '.join(
+                        'attribute {} on item {}'.format(cycle_attr, cycle_holder._type_id)
+                        for cycle_holder, cycle_attr in e.args[0]))
                 logger.error(msg)
                 raise KeyError(attr) from e
-            except NoSourceError as e:
-                raise KeyError(attr) from e
-            else:
-                self.__holder._fit._publish(AttrValueChanged(holder=self.__holder, attr=attr))
+            val = self._calculate(attr, failed)
+        else:
+            if self._instrumentation is not None:
+                self._instrumentation.cache_hit(self.__holder, attr)
         return val
 
     def __len__(self):
@@ -163,22 +172,60 @@ class MutableAttributeMap:
             yield k
 
     def __delitem__(self, attr):
+        # Attribute is deleted when set of affectors influencing
+        # it changes, thus compiled plan is not valid anymore
+        self.__plans.pop(attr, None)
         # If there's an override, do nothing. While override is
         # present, fetched value of this attribute will not
         # change anyway. Overrides are removed using override-
         # specific method
         if attr in self._overrides:
             return
-        # Clear the value in our calculated attributes dictionary
-        try:
-            del self.__modified_attributes[attr]
         # Do nothing if it wasn't calculated
-        except KeyError:
-            pass
-        # And make sure services are aware of changed value if it
-        # actually was changed
-        else:
-            self.__holder._fit._publish(AttrValueChanged(holder=self.__holder, attr=attr))
+        if attr not in self.__modified_attributes:
+            return
+        # Clear the value in our calculated attributes dictionary
+        if self.__borrowed:
+            self.__own_values()
+        del self.__modified_attributes[attr]
+        # And make sure services are aware of changed value
+        if self._instrumentation is not None:
+            self._instrumentation.invalidation(self.__holder, attr)
+        self.__advance_clock()
+        self.__holder._fit._publish(AttrValueChanged(holder=self.__holder, attr=attr))
+
+    def _drop(self, attr):
+        """
+        Remove calculated value of attribute without notifying
+        anyone. Used by calculation service when it invalidates
+        values relying on changed attribute.
+
+        Required arguments:
+        attr -- ID of attribute to remove
+
+        Return value:
+        True if value has been removed, False if attribute is
+        overridden or wasn't calculated
+        """
+        if attr in self._overrides or attr not in self.__modified_attributes:
+            return False
+        if self.__borrowed:
+            self.__own_values()
+        del self.__modified_attributes[attr]
+        if self._instrumentation is not None:
+            self._instrumentation.invalidation(self.__holder, attr)
+        self.__advance_clock()
+        return True
+
+    def _needs_calculation(self, attr):
+        """
+        Check if value of attribute has to be calculated
+        to be fetched.
+
+        Required arguments:
+        attr -- ID of attribute to check
+        """
+        return attr not in self.__modified_attributes and attr not in self._overrides
 
     def get(self, attr, default=None):
         try:
@@ -196,20 +243,206 @@ class MutableAttributeMap:
 
     def clear(self):
         """Reset map to its initial state."""
-        self.__modified_attributes.clear()
-        self.__cap_map = None
+        if self.__modified_attributes:
+            self.__advance_clock()
+        # Do not touch container, as it might've been shared
+        self.__modified_attributes = {}
+        self.__group = None
+        self.__borrowed = False
+        self.__plans.clear()
         # Clear only non-persistent overrides
         if self.__overridden_attributes is not None:
             overrides = self.__overridden_attributes
             for attr in tuple(filter(lambda attr: overrides[attr].persistent is False, overrides)):
                 self._override_del(attr)
 
-    def __calculate(self, attr):
+    def __get_as_input(self, attr):
+        """
+        Get value of attribute, recording it as input of volatile
+        property which is being calculated.
+        """
+        frames = input_frames.stack
+        frame = frames[-1]
+        # Values read while attribute is calculated are
+        # not inputs of volatile property
+        frames.append(None)
+        try:
+            val = self[attr]
+        except KeyError:
+            frame.add(self, attr, NO_VALUE)
+            raise
+        finally:
+            frames.pop()
+        frame.add(self, attr, val)
+        return val
+
+    @property
+    def _volatile_clock(self):
+        fit = self.__holder._fit
+        if fit is None:
+            return None
+        return fit._calculator._volatile_clock
+
+    def __advance_clock(self):
+        """
+        Let volatile properties know that value of some
+        attribute has changed.
+        """
+        fit = self.__holder._fit
+        if fit is not None:
+            fit._calculator._volatile_clock.advance()
+
+    def _get_stored(self, attr, default=None):
+        """
+        Get value of attribute without calculating it.
+
+        Required arguments:
+        attr -- ID of attribute
+
+        Optional arguments:
+        default -- value returned when attribute is neither
+        overridden nor calculated (default None)
+
+        Return value:
+        Overridden or calculated value of attribute, or default
+        """
+        overrides = self.__overridden_attributes
+        if overrides is not None and attr in overrides:
+            return overrides[attr].value
+        return self.__modified_attributes.get(attr, default)
+
+    def __resolve(self, attr):
+        """
+        Calculate values of attributes which are needed to calculate
+        passed attribute, deepest first. Explicit stack is used instead
+        of recursion, thus length of chain of attributes relying on each
+        other is not limited.
+
+        Required arguments:
+        attr -- ID of attribute to be calculated
+
+        Return value:
+        Set with (holder, attribute ID) tuples, whose values could not
+        be calculated
+
+        Possible exceptions:
+        AttributeCycleError -- raised when attribute relies on itself,
+        contains list with (holder, attribute ID) tuples forming cycle
+        """
+        # Attributes whose sources are being processed
+        # Format: [(holder, attribute ID, iterator over sources)]
+        path = [(self.__holder, attr, iter(self._get_sources(attr)))]
+        # Format: {(holder, attribute ID)}
+        on_path = {(self.__holder, attr)}
+        # Format: {(holder, attribute ID)}
+        failed = set()
+        while path:
+            holder, attr, sources = path[-1]
+            for source in sources:
+                source_holder, source_attr = source
+                if source in failed or not source_holder.attributes._needs_calculation(source_attr):
+                    continue
+                if source in on_path:
+                    cycle = [(path_holder, path_attr) for path_holder, path_attr, _ in path]
+                    raise AttributeCycleError(cycle[cycle.index(source):] + [source])
+                on_path.add(source)
+                path.append((source_holder, source_attr, iter(source_holder.attributes._get_sources(source_attr))))
+                break
+            # All sources are calculated, calculate attribute itself;
+            # requested attribute is left to caller
+            else:
+                path.pop()
+                on_path.discard((holder, attr))
+                if path:
+                    try:
+                        holder.attributes._calculate(attr, failed)
+                    except KeyError:
+                        failed.add((holder, attr))
+        return failed
+
+    def _get_sources(self, attr):
+        """
+        Get attributes which are read when value of attribute is
+        calculated - modification sources and cap.
+
+        Required arguments:
+        attr -- ID of attribute
+
+        Return value:
+        List with (holder, attribute ID) tuples
+        """
+        holder = self.__holder
+        try:
+            attr_table = holder._fit.source.cache_handler.get_attribute_table()
+            attr_flags = attr_table.get_flags(attr)
+        # Let calculation method report metadata issues
+        except (AttributeError, AttributeFetchError):
+            return []
+        plan = self.__plans.get(attr)
+        if plan is None:
+            plan = self.__plans[attr] = self.__build_plan(attr, attr_flags, holder._fit._calculator)
+        sources = []
+        for _, _, group_sources, penalized_sources in plan:
+            sources.extend(group_sources)
+            sources.extend(penalized_sources)
+        if attr_flags & FLAG_CAPPED:
+            sources.append((holder, attr_table.get_max_attribute(attr)))
+        return sources
+
+    def _calculate(self, attr, failed=()):
+        """
+        Calculate value of attribute, store it and notify services
+        about it. Values of attributes it relies on are expected to
+        be calculated already.
+
+        Required arguments:
+        attr -- ID of attribute to be calculated
+
+        Optional arguments:
+        failed -- container with (holder, attribute ID) tuples, whose
+        values could not be calculated; they are not fetched again
+        (default empty tuple)
+
+        Return value:
+        Calculated attribute value
+
+        Possible exceptions:
+        KeyError -- raised when value cannot be calculated
+        """
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            instrumentation.calculation_started()
+        try:
+            val = self.__calculate(attr, failed)
+        except BaseValueError as e:
+            msg = 'unable to find base value for attribute {} on item {}'.format(
+                e.args[0], self.__holder._type_id)
+            logger.warning(msg)
+            raise KeyError(attr) from e
+        except AttributeMetaError as e:
+            msg = 'unable to fetch metadata for attribute {}, requested for item {}'.format(
+                e.args[0], self.__holder._type_id)
+            logger.error(msg)
+            raise KeyError(attr) from e
+        except NoSourceError as e:
+            raise KeyError(attr) from e
+        finally:
+            if instrumentation is not None:
+                instrumentation.calculation_finished(self.__holder, attr)
+        if self.__borrowed:
+            self.__own_values()
+        self.__modified_attributes[attr] = val
+        self.__holder._fit._publish(AttrValueChanged(holder=self.__holder, attr=attr))
+        return val
+
+    def __calculate(self, attr, failed):
         """
         Run calculations to find the actual value of attribute.
 
         Required arguments:
         attr -- ID of attribute to be calculated
+        failed -- container with (holder, attribute ID) tuples, whose
+        values could not be calculated
 
         Return value:
         Calculated attribute value
@@ -222,9 +455,10 @@ class MutableAttributeMap:
         # we're calculating attribute for item/fit without source, it fails
         # with null source error (triggered by accessing item's attribute)
         item_attrs = self.__holder.item.attributes
-        # Attribute object for attribute being calculated
+        # Metadata of attribute being calculated
         try:
-            attr_meta = self.__holder._fit.source.cache_handler.get_attribute(attr)
+            attr_table = self.__holder._fit.source.cache_handler.get_attribute_table()
+            attr_flags = attr_table.get_flags(attr)
         # Raise error if we can't get metadata for requested attribute
         except (AttributeError, AttributeFetchError) as e:
             raise AttributeMetaError(attr) from e
@@ -234,133 +468,238 @@ class MutableAttributeMap:
         # If attribute isn't available on base item,
         # base off its default value
         except KeyError:
-            result = attr_meta.default_value
+            result = attr_table.get_default_value(attr)
             # If original attribute is not specified and default
             # value isn't available, raise error - without valid
             # base we can't go on
             if result is None:
                 raise BaseValueError(attr)
-        # Container for non-penalized modifiers
-        # Format: {operator: [values]}
-        normal_mods = {}
-        # Container for penalized modifiers
-        # Format: {operator: [values]}
-        penalized_mods = {}
-        # Now, go through all affectors affecting our holder
-        for affector in self.__holder._fit._calculator.get_affectors(self.__holder, attr=attr):
-            try:
-                source_holder, modifier = affector
-                operator = modifier.operator
-                # Decide if it should be stacking penalized or not, based on stackable property,
-                # source item category and operator
-                penalize = (
-                    attr_meta.stackable is False and
-                    source_holder.item.category not in PENALTY_IMMUNE_CATEGORIES and
-                    operator in PENALIZABLE_OPERATORS
-                )
+        calculator = self.__holder._fit._calculator
+        # Values which this attribute relied on previously may be
+        # different this time, thus record dependencies from scratch
+        dependencies = calculator._dependencies
+        dependencies.clear_dependencies(self.__holder, attr)
+        holder = self.__holder
+        plan = self.__plans.get(attr)
+        if plan is None:
+            plan = self.__plans[attr] = self.__build_plan(attr, attr_flags, calculator)
+        if self._instrumentation is not None:
+            self._instrumentation.affectors_visited(
+                attr, sum(len(sources) + len(penalized_sources) for _, _, sources, penalized_sources in plan))
+        # Fetch modification values of all groups first, so that
+        # stacking penalty is applied to all of them at once
+        # Format: [(aggregation, [values], index of penalized list or None)]
+        group_values = []
+        # Format: [[values]]
+        penalized_lists = []
+        for aggregation_type, normalization_func, sources, penalized_sources in plan:
+            mod_list = []
+            penalized_index = None
+            for source_holder, src_attr in sources:
                 try:
-                    mod_value = source_holder.attributes[modifier.src_attr]
-                # Silently skip current affector: error should already
+                    if failed and (source_holder, src_attr) in failed:
+                        continue
+                    mod_value = source_holder.attributes[src_attr]
+                # Silently skip current source: error should already
                 # be logged by map before it raised KeyError
                 except KeyError:
                     continue
-                # Normalize operations to just three types:
-                # assignments, additions, multiplications
-                try:
-                    normalization_func = NORMALIZATION_MAP[operator]
-                # Raise error on any unknown operator types
-                except KeyError as e:
-                    raise OperatorError(operator) from e
-                mod_value = normalization_func(mod_value)
-                # Add value to appropriate dictionary
-                if penalize is True:
-                    mod_list = penalized_mods.setdefault(operator, [])
-                else:
-                    mod_list = normal_mods.setdefault(operator, [])
-                mod_list.append(mod_value)
-            # Handle operator type failure
-            except OperatorError as e:
-                msg = 'malformed modifier on item {}: unknown operator {}'.format(
-                    source_holder._type_id, e.args[0])
-                logger.warning(msg)
+                # Dependency is recorded only after attempt to fetch source
+                # value, as its calculation invalidates its dependents
+                finally:
+                    dependencies.add_dependency(source_holder, src_attr, holder, attr)
+                mod_list.append(normalization_func(mod_value))
+            if penalized_sources:
+                penalized_list = []
+                for source_holder, src_attr in penalized_sources:
+                    try:
+                        if failed and (source_holder, src_attr) in failed:
+                            continue
+                        mod_value = source_holder.attributes[src_attr]
+                    except KeyError:
+                        continue
+                    finally:
+                        dependencies.add_dependency(source_holder, src_attr, holder, attr)
+                    penalized_list.append(normalization_func(mod_value))
+                # Penalized modifications are aggregated into single value
+                # on per-operator basis
+                if penalized_list:
+                    penalized_index = len(penalized_lists)
+                    penalized_lists.append(penalized_list)
+            group_values.append((aggregation_type, mod_list, penalized_index))
+        if penalized_lists:
+            penalized_values = aggregation.penalize_many(penalized_lists)
+            for _, mod_list, penalized_index in group_values:
+                if penalized_index is not None:
+                    mod_list.append(penalized_values[penalized_index])
+        # Go through groups of modifications in order of their operators
+        for aggregation_type, mod_list, _ in group_values:
+            if not mod_list:
                 continue
-        # When data gathering is complete, process penalized modifiers
-        # They are penalized on per-operator basis
-        for operator, mod_list in penalized_mods.items():
-            penalized_value = self.__penalize_values(mod_list)
-            mod_list = normal_mods.setdefault(operator, [])
-            mod_list.append(penalized_value)
-        # Calculate result of normal dictionary, according to operator order
-        for operator in sorted(normal_mods):
-            mod_list = normal_mods[operator]
-            # Pick best modifier for assignments, based on high_is_good value
-            if operator in ASSIGNMENTS:
-                result = max(mod_list) if attr_meta.high_is_good is True else min(mod_list)
-            elif operator in ADDITIONS:
+            if aggregation_type is AGGREGATE_MAX:
+                result = max(mod_list)
+            elif aggregation_type is AGGREGATE_MIN:
+                result = min(mod_list)
+            elif aggregation_type is AGGREGATE_ADD:
                 for mod_val in mod_list:
                     result += mod_val
-            elif operator in MULTIPLICATIONS:
+            else:
                 for mod_val in mod_list:
                     result *= mod_val
         # If attribute has upper cap, do not let
         # its value to grow above it
-        if attr_meta.max_attribute is not None:
+        if attr_flags & FLAG_CAPPED:
+            max_attr = attr_table.get_max_attribute(attr)
             try:
-                max_value = self[attr_meta.max_attribute]
+                if failed and (self.__holder, max_attr) in failed:
+                    raise KeyError(max_attr)
+                max_value = self[max_attr]
             # If max value isn't available, don't
             # cap anything
             except KeyError:
                 pass
             else:
                 result = min(result, max_value)
-                # Let map know that capping attribute
-                # restricts current attribute
-                self._cap_set(attr_meta.max_attribute, attr)
+            # Capping attribute restricts current attribute
+            dependencies.add_dependency(self.__holder, max_attr, self.__holder, attr)
+        if self.__group is not None:
+            calculator._sharing.propagate_dependencies(self.__holder, attr)
         # Some of attributes are rounded for whatever reason,
         # deal with it after all the calculations
-        if attr in LIMITED_PRECISION:
+        if attr_flags & FLAG_LIMITED_PRECISION:
             result = round(result, 2)
         return result
 
-    def __penalize_values(self, mod_list):
+    def __build_plan(self, attr, attr_flags, calculator):
         """
-        Calculate aggregated factor of passed factors, taking into
-        consideration stacking penalty.
+        Compile affectors which influence attribute into calculation
+        plan: group them by operator in order of operator application,
+        resolve normalization function, stacking penalty and way of
+        aggregation of each group beforehand.
 
-        Positional argument:
-        mod_list -- list of factors
+        Required arguments:
+        attr -- ID of attribute for which plan is built
+        attr_flags -- flags of attribute from attribute table
+        calculator -- calculation service of holder's fit
 
         Return value:
-        Final aggregated factor of passed mod_list
+        Tuple with (aggregation, normalization function, sources,
+        penalized sources) tuples, where sources are tuples with
+        (source holder, source attribute ID) tuples
         """
-        # Gather positive modifiers into one chain, negative
-        # into another
-        chain_positive = []
-        chain_negative = []
-        for mod_val in mod_list:
-            # Transform value into form of multiplier - 1 for ease of
-            # stacking chain calculation
-            mod_val -= 1
-            if mod_val >= 0:
-                chain_positive.append(mod_val)
+        # Format: {operator: ([sources], [penalized sources])}
+        groups = {}
+        for affector in calculator.get_affectors(self.__holder, attr=attr):
+            source_holder, modifier = affector
+            operator = modifier.operator
+            # Skip modifiers with unknown operators
+            if operator not in NORMALIZATION_MAP:
+                msg = 'malformed modifier on item {}: unknown operator {}'.format(
+                    source_holder._type_id, operator)
+                logger.warning(msg)
+                continue
+            # Decide if it should be stacking penalized or not, based on stackable property,
+            # source item category and operator
+            penalize = (
+                bool(attr_flags & FLAG_PENALIZABLE) and
+                source_holder.item.category not in PENALTY_IMMUNE_CATEGORIES and
+                operator in PENALIZABLE_OPERATORS
+            )
+            sources, penalized_sources = groups.setdefault(operator, ([], []))
+            if penalize is True:
+                penalized_sources.append((source_holder, modifier.src_attr))
+            else:
+                sources.append((source_holder, modifier.src_attr))
+        plan = []
+        for operator in sorted(groups):
+            sources, penalized_sources = groups[operator]
+            # Pick best modifier for assignments, based on high_is_good value
+            if operator in ASSIGNMENTS:
+                aggregation = AGGREGATE_MAX if attr_flags & FLAG_HIGH_IS_GOOD else AGGREGATE_MIN
+            elif operator in ADDITIONS:
+                aggregation = AGGREGATE_ADD
             else:
-                chain_negative.append(mod_val)
-        # Strongest modifiers always go first
-        chain_positive.sort(reverse=True)
-        chain_negative.sort()
-        # Base final multiplier on 1
-        list_result = 1
-        for chain in (chain_positive, chain_negative):
-            # Same for intermediate per-chain result
-            chain_result = 1
-            for position, modifier in enumerate(chain):
-                # Ignore 12th modifier and further as non-significant
-                if position > 10:
-                    break
-                # Apply stacking penalty based on modifier position
-                chain_result *= 1 + modifier * PENALTY_BASE ** (position ** 2)
-            list_result *= chain_result
-        return list_result
+                aggregation = AGGREGATE_MUL
+            plan.append((aggregation, NORMALIZATION_MAP[operator], tuple(sources), tuple(penalized_sources)))
+        return tuple(plan)
+
+    # Sharing-related methods
+    @property
+    def _values(self):
+        return self.__modified_attributes
+
+    @property
+    def _group(self):
+        return self.__group
+
+    @property
+    def _plans(self):
+        return self.__plans
+
+    @property
+    def _borrowed(self):
+        return self.__borrowed
+
+    def _set_values(self, values, group, borrowed=False):
+        """
+        Replace container of calculated attributes.
+
+        Required arguments:
+        values -- dictionary with calculated values
+        group -- group of holders which share this dictionary,
+        or None if it's not shared
+
+        Optional arguments:
+        borrowed -- True if dictionary is shared with other
+        fit (default False)
+        """
+        self.__modified_attributes = values
+        self.__group = group
+        self.__borrowed = borrowed
+
+    def _borrow_values(self, other):
+        """
+        Take over container of calculated attributes from map of
+        equivalent holder of other fit. Both maps keep using the same
+        container until either of them changes it; map which does it
+        first makes its own copy. Holders which share values with this
+        holder take over the container as well.
+
+        Required arguments:
+        other -- map to take container from
+
+        Return value:
+        True if container has been taken over, False if this map
+        has calculated attributes already or other map has none
+        """
+        values = other._values
+        if self.__modified_attributes or not values:
+            return False
+        other.__replace_values(values, True)
+        self.__replace_values(values, True)
+        return True
+
+    def __own_values(self):
+        """
+        Make own copy of container of calculated attributes shared
+        with other fit, before changing it. Other fit keeps treating
+        its container as shared, and copies it on its next change too.
+        """
+        self.__replace_values(dict(self.__modified_attributes), False)
+
+    def __replace_values(self, values, borrowed):
+        """
+        Replace container of calculated attributes of this holder
+        and of all holders which share it.
+        """
+        group = self.__group
+        if group is None:
+            self._set_values(values, None, borrowed)
+            return
+        group.values = values
+        group.borrowed = borrowed
+        for member in group.holders:
+            member.attributes._set_values(values, group, borrowed)
 
     # Override-related methods
     @property
@@ -380,10 +719,14 @@ class MutableAttributeMap:
         else:
             old_composite = self.__modified_attributes.get(attr)
         self.__overridden_attributes[attr] = OverrideData(value=value, persistent=persist)
+        fit = self.__holder._fit
+        # Holder with overrides cannot share values with other holders
+        if fit is not None:
+            fit._calculator._sharing.update_holder(self.__holder)
         # If value of attribute is changing after operation, force refresh
         # of attributes which rely on it
-        fit = self.__holder._fit
         if fit is not None and value != old_composite:
+            self.__advance_clock()
             fit._publish(AttrValueChangedOverride(holder=self.__holder, attr=attr))
 
     def _override_del(self, attr):
@@ -397,25 +740,11 @@ class MutableAttributeMap:
             self.__overridden_attributes = None
         # If value of attribute was calculated at some point,
         # remove it - as potentially it might've changed
-        try:
+        if attr in self.__modified_attributes:
+            if self.__borrowed:
+                self.__own_values()
             del self.__modified_attributes[attr]
-        except KeyError:
-            pass
         fit = self.__holder._fit
         if fit is not None:
+            self.__advance_clock()
             fit._publish(AttrValueChangedOverride(holder=self.__holder, attr=attr))
-
-    # Cap-related methods
-    @property
-    def _cap_map(self):
-        return self.__cap_map or {}
-
-    def _cap_set(self, capping_attr, capped_attr):
-        if self.__cap_map is None:
-            self.__cap_map = KeyedSet()
-        self.__cap_map.add_data(capping_attr, capped_attr)
-
-    def _cap_del(self, capping_attr, capped_attr):
-        self.__cap_map.rm_data(capping_attr, capped_attr)
-        if len(self.__cap_map) == 0:
-            self.__cap_map = None
@@ -34,9 +34,10 @@ class LinkRegister:
     Keep track of currently existing links between affectors
     (Affector objects) and affectees (holders). This is hard
     requirement for efficient partial attribute recalculation.
-    Register is not aware of links between specific attributes,
-    doesn't know anything about states and scopes, just
-    affectors and affectees.
+    Register doesn't know anything about states and scopes, just
+    affectors and affectees; active affectors are additionally
+    indexed by their target attribute, to make per-attribute
+    lookups cheap.
 
     Required arguments:
     fit -- fit, to which this register is bound to
@@ -74,6 +75,17 @@ class LinkRegister:
         # Format: {targetHolder: {affectors}}
         self.__active_direct_affectors = KeyedSet()
 
+        # Same data as in maps above, but additionally keyed by target
+        # attribute of affector's modifier
+        # Format: {(domain, attr): {affectors}}
+        self.__affector_domain_attr = KeyedSet()
+        # Format: {(domain, group, attr): {affectors}}
+        self.__affector_domain_group_attr = KeyedSet()
+        # Format: {(domain, skill, attr): {affectors}}
+        self.__affector_domain_skill_attr = KeyedSet()
+        # Format: {(targetHolder, attr): {affectors}}
+        self.__active_direct_affectors_attr = KeyedSet()
+
         # Keep track of affectors which influence something directly,
         # but are disabled as their target domain is not available
         # Format: {source_holder: {affectors}}
@@ -132,6 +144,9 @@ class LinkRegister:
             key, affector_map = self.__get_affector_map(affector)
             # Actually add data to map
             affector_map.add_data(key, affector)
+            attr_affector_map = self.__get_attr_affector_map(affector_map)
+            if attr_affector_map is not None:
+                attr_affector_map.add_data(self.__attrize_key(key, affector), affector)
         except Exception as e:
             self.__handle_affector_errors(e, affector)
 
@@ -146,6 +161,9 @@ class LinkRegister:
         try:
             key, affector_map = self.__get_affector_map(affector)
             affector_map.rm_data(key, affector)
+            attr_affector_map = self.__get_attr_affector_map(affector_map)
+            if attr_affector_map is not None:
+                attr_affector_map.rm_data(self.__attrize_key(key, affector), affector)
         # Following block handles exceptions; all of them must be handled
         # when registering affector too
         except Exception as e:
@@ -207,7 +225,7 @@ class LinkRegister:
             self.__handle_affector_errors(e, affector)
         return affectees
 
-    def get_affectors(self, target_holder):
+    def get_affectors(self, target_holder, attr=None):
         """
         Get all affectors, which influence passed holder.
 
@@ -215,9 +233,15 @@ class LinkRegister:
         target_holder -- holder, for which we're seeking for affecting it
         affectors
 
+        Optional arguments:
+        attr -- target attribute ID filter; when specified, only affectors
+        which influence attribute with this ID are returned (default None)
+
         Return value:
         Set with affectors, incluencing target_holder
         """
+        if attr is not None:
+            return self.__get_attr_affectors(target_holder, attr)
         affectors = set()
         # Add all affectors which directly affect it
         affectors.update(self.__active_direct_affectors.get(target_holder) or set())
@@ -232,6 +256,22 @@ class LinkRegister:
             affectors.update(self.__affector_domain_skill.get((domain, skill)) or set())
         return affectors
 
+    def __get_attr_affectors(self, target_holder, attr):
+        """
+        Get affectors, which influence specific attribute of passed
+        holder. Uses attribute-keyed maps, thus cost of this method
+        depends only on amount of matching affectors.
+        """
+        affectors = set()
+        affectors.update(self.__active_direct_affectors_attr.get((target_holder, attr)) or ())
+        domain = target_holder._domain
+        affectors.update(self.__affector_domain_attr.get((domain, attr)) or ())
+        group = target_holder.item.group
+        affectors.update(self.__affector_domain_group_attr.get((domain, group, attr)) or ())
+        for skill in target_holder.item.required_skills:
+            affectors.update(self.__affector_domain_skill_attr.get((domain, skill, attr)) or ())
+        return affectors
+
     # General-purpose auxiliary methods
     def __get_affectee_maps(self, target_holder):
         """
@@ -340,6 +380,46 @@ class LinkRegister:
             raise FilterTypeError(modifier.filter_type)
         return key, affector_map
 
+    def __get_attr_affector_map(self, affector_map):
+        """
+        Get attribute-keyed counterpart of passed affector map. Maps
+        with disabled affectors do not have it, as they're never used
+        for affector lookups.
+        """
+        if affector_map is self.__active_direct_affectors:
+            return self.__active_direct_affectors_attr
+        elif affector_map is self.__affector_domain:
+            return self.__affector_domain_attr
+        elif affector_map is self.__affector_domain_group:
+            return self.__affector_domain_group_attr
+        elif affector_map is self.__affector_domain_skill:
+            return self.__affector_domain_skill_attr
+        else:
+            return None
+
+    @staticmethod
+    def __attrize_key(key, affector):
+        """
+        Convert key of regular affector map into key for
+        its attribute-keyed counterpart.
+        """
+        tgt_attr = affector.modifier.tgt_attr
+        if isinstance(key, tuple):
+            return key + (tgt_attr,)
+        return key, tgt_attr
+
+    def __add_active_direct(self, target_holder, affectors):
+        """Add affectors to both active direct affector maps."""
+        self.__active_direct_affectors.add_data_set(target_holder, affectors)
+        for affector in affectors:
+            self.__active_direct_affectors_attr.add_data((target_holder, affector.modifier.tgt_attr), affector)
+
+    def __rm_active_direct(self, target_holder, affectors):
+        """Remove affectors from both active direct affector maps."""
+        self.__active_direct_affectors.rm_data_set(target_holder, affectors)
+        for affector in affectors:
+            self.__active_direct_affectors_attr.rm_data((target_holder, affector.modifier.tgt_attr), affector)
+
     def __handle_affector_errors(self, error, affector):
         """
         Multiple register methods which get data based on passed affector
@@ -462,7 +542,7 @@ class LinkRegister:
         # Move all of them to direct modification dictionary
         for source_holder, affectors in affectors_to_enable.items():
             self.__disabled_direct_affectors.rm_data_set(source_holder, affectors)
-            self.__active_direct_affectors.add_data_set(target_holder, affectors)
+            self.__add_active_direct(target_holder, affectors)
 
     def __disable_direct_spec(self, target_holder):
         """
@@ -484,7 +564,7 @@ class LinkRegister:
             return
         # Move data from map to map
         for source_holder, affectors in affectors_to_disable.items():
-            self.__active_direct_affectors.rm_data_set(target_holder, affectors)
+            self.__rm_active_direct(target_holder, affectors)
             self.__disabled_direct_affectors.add_data_set(source_holder, affectors)
 
     def __enable_direct_other(self, target_holder):
@@ -510,7 +590,7 @@ class LinkRegister:
         if not affectors_to_enable:
             return
         # Move all of them to direct modification dictionary
-        self.__active_direct_affectors.add_data_set(target_holder, affectors_to_enable)
+        self.__add_active_direct(target_holder, affectors_to_enable)
         self.__disabled_direct_affectors.rm_data_set(other_holder, affectors_to_enable)
 
     def __disable_direct_other(self, target_holder):
@@ -536,7 +616,7 @@ class LinkRegister:
             return
         # If we have, move them from map to map
         self.__disabled_direct_affectors.add_data_set(other_holder, affectors_to_disable)
-        self.__active_direct_affectors.rm_data_set(target_holder, affectors_to_disable)
+        self.__rm_active_direct(target_holder, affectors_to_disable)
 
     def __get_other_linked_holder(self, holder):
         """
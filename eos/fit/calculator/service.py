@@ -19,14 +19,19 @@
 # ===============================================================================
 
 
-from eos.const.eos import State, Scope
+from eos.const.eos import Domain, State, Scope
 from eos.fit.messages import (
     HolderAdded, HolderRemoved, HolderStateChanged, EffectsEnabled, EffectsDisabled,
-    AttrValueChanged, AttrValueChangedOverride, EnableServices, DisableServices
+    ProfileSkillsAdded, ProfileSkillsRemoved, AttrValueChanged, AttrValueChangedOverride, EnableServices,
+    DisableServices, EnableHolders, DisableHolders, StartBatch, CommitBatch
 )
 from eos.util.pubsub import BaseSubscriber
+from eos.util.volatile_cache import VolatileClock
 from .affector import Affector
+from .dependency import DependencyRegister
+from .instrumentation import CalculatorInstrumentation
 from .register import LinkRegister
+from .sharing import SharingRegister
 
 
 class CalculationService(BaseSubscriber):
@@ -45,6 +50,30 @@ class CalculationService(BaseSubscriber):
         self.__enabled = False
         self._fit = fit
         self._register = LinkRegister(fit)
+        self._dependencies = DependencyRegister()
+        self._sharing = SharingRegister(fit, self._dependencies)
+        # Skills generated from fit skill profile; they are
+        # not passed with service enabling/disabling messages
+        # Format: {holders}
+        self.__profile_skills = set()
+        # Invalidations postponed until batch commit. When no
+        # batch is in progress, these are None
+        # Format: {(holder, attribute ID)}
+        self.__batch_cleared_attrs = None
+        # Format: {(holder, attribute ID)}
+        self.__batch_changed_attrs = None
+        # Holders which may have attributes without calculated
+        # values, used for materialization
+        # Format: {holders}
+        self.__dirty_holders = set()
+        # Holders registered in service
+        # Format: {holders}
+        self.__holders = set()
+        # Collector of statistics, None when instrumentation is disabled
+        self.__instrumentation = None
+        # Advanced whenever calculated or overridden value changes,
+        # lets volatile properties skip checking their inputs
+        self._volatile_clock = VolatileClock()
         fit._subscribe(self, self._handler_map.keys())
 
     def get_affectors(self, holder, attr=None):
@@ -63,14 +92,7 @@ class CalculationService(BaseSubscriber):
         Return value:
         Set with Affector objects
         """
-        if attr is None:
-            affectors = self._register.get_affectors(holder)
-        else:
-            affectors = set()
-            for affector in self._register.get_affectors(holder):
-                if affector.modifier.tgt_attr == attr:
-                    affectors.add(affector)
-        return affectors
+        return self._register.get_affectors(holder, attr=attr)
 
     def get_affectees(self, affector):
         """
@@ -84,6 +106,113 @@ class CalculationService(BaseSubscriber):
         """
         return self._register.get_affectees(affector)
 
+    def materialize(self):
+        """
+        Calculate values of all attributes of holders which got
+        new or invalidated attributes since previous call. Values
+        are calculated in dependency order using explicit stack, so
+        that modification sources and caps are always calculated
+        before attributes which rely on them.
+        """
+        if not self.__enabled:
+            return
+        holders = self.__dirty_holders
+        self.__dirty_holders = set()
+        for holder in holders:
+            # Holder could have left the fit
+            if holder._fit is not self._fit:
+                continue
+            attributes = holder.attributes
+            for attr in attributes.keys():
+                if attributes._needs_calculation(attr):
+                    attributes.get(attr)
+
+    @property
+    def instrumentation(self):
+        """
+        Collector of calculator statistics, or None if
+        instrumentation is disabled.
+        """
+        return self.__instrumentation
+
+    def enable_instrumentation(self, instrumentation=None):
+        """
+        Start collecting statistics about work done by calculator.
+        When instrumentation is disabled, calculator does not spend
+        time on it.
+
+        Optional arguments:
+        instrumentation -- collector to use, if not specified, new
+        collector is created
+
+        Return value:
+        Collector which is used
+        """
+        if instrumentation is None:
+            instrumentation = CalculatorInstrumentation()
+        self.__instrumentation = instrumentation
+        for holder in self.__holders:
+            holder.attributes._instrumentation = instrumentation
+        self._fit._refresh_subscriber(self)
+        return instrumentation
+
+    def disable_instrumentation(self):
+        """
+        Stop collecting statistics about work done by calculator.
+
+        Return value:
+        Collector which has been used, or None
+        """
+        instrumentation = self.__instrumentation
+        self.__instrumentation = None
+        for holder in self.__holders:
+            holder.attributes._instrumentation = None
+        self._fit._refresh_subscriber(self)
+        return instrumentation
+
+    def copy_values(self, other, holder_map):
+        """
+        Take calculated attribute values from calculation service of
+        other fit, so that they do not have to be calculated again.
+        Containers of values are shared by both fits until either of
+        them changes them, and dependencies of taken values are recorded
+        for counterparts of holders they rely on. Holders of this fit
+        should have the same state and sources of modification as
+        their counterparts.
+
+        Required arguments:
+        other -- calculation service to take values from
+        holder_map -- map in {other fit holder: this fit holder} format
+        """
+        # Values of other fit are not reliable while invalidations
+        # are postponed
+        if not self.__enabled or not other.__enabled or other.__batch_cleared_attrs is not None:
+            return
+        # Values may rely on any holder of other fit, thus they are
+        # taken over only when all holders have counterparts
+        if not other.__holders.issubset(holder_map):
+            return
+        # Format: [(other fit holder, this fit holder)]
+        borrowers = []
+        for src_holder, tgt_holder in holder_map.items():
+            # Profile skills keep values in context of skill profile
+            if tgt_holder not in self.__holders:
+                continue
+            tgt_holder.attributes._borrow_values(src_holder.attributes)
+            # Holders sharing values with the borrower take
+            # over container of their group as well
+            if tgt_holder.attributes._values is src_holder.attributes._values:
+                borrowers.append((src_holder, tgt_holder))
+        get_dependencies = other._dependencies.get_dependencies
+        add_dependency = self._dependencies.add_dependency
+        for src_holder, tgt_holder in borrowers:
+            for attr in src_holder.attributes._values:
+                for dep_holder, dep_attr in get_dependencies(src_holder, attr):
+                    # Holders without counterparts, like profile
+                    # skills, are shared by both fits
+                    dep_holder = holder_map.get(dep_holder, dep_holder)
+                    add_dependency(dep_holder, dep_attr, tgt_holder, attr)
+
     # Message handling
     def _handle_holder_addition(self, message):
         """
@@ -103,6 +232,24 @@ class CalculationService(BaseSubscriber):
             return
         self.__remove_holder(message.holder)
 
+    def _handle_profile_skills_addition(self, message):
+        """
+        Enable affectors of all skills from skill profile in one pass.
+        """
+        self.__profile_skills.update(message.holders)
+        if not self.__enabled:
+            return
+        self.__add_profile_skills(message.holders)
+
+    def _handle_profile_skills_removal(self, message):
+        """
+        Disable affectors of all skills from skill profile in one pass.
+        """
+        self.__profile_skills.difference_update(message.holders)
+        if not self.__enabled:
+            return
+        self.__remove_profile_skills(message.holders)
+
     def _handle_holder_state_change(self, message):
         """
         Enable/disable affectors based on state change direction.
@@ -110,12 +257,15 @@ class CalculationService(BaseSubscriber):
         if not self.__enabled:
             return
         holder, old_state, new_state = message
+        self._sharing.leave(holder)
         if new_state > old_state:
             states = set(filter(lambda s: old_state < s <= new_state, State))
             self.__enable_states(holder, states)
         elif new_state < old_state:
             states = set(filter(lambda s: new_state < s <= old_state, State))
             self.__disable_states(holder, states)
+        # Holder switches its state after notification
+        self.__update_sharing(holder, pending=(new_state, holder._enabled_effects))
 
     def _handle_holder_effects_enabling(self, message):
         """
@@ -129,7 +279,9 @@ class CalculationService(BaseSubscriber):
             message.holder, effect_filter=message.effects, state_filter=processed_states,
             scope_filter=processed_scopes
         )
+        self._sharing.leave(message.holder)
         self.__enable_affectors(affectors)
+        self.__update_sharing(message.holder)
 
     def _handle_holder_effects_disabling(self, message):
         """
@@ -143,73 +295,306 @@ class CalculationService(BaseSubscriber):
             message.holder, effect_filter=message.effects, state_filter=processed_states,
             scope_filter=processed_scopes
         )
+        self._sharing.leave(message.holder)
         self.__disable_affectors(affectors)
+        # Holder disables effects after notification
+        pending = (message.holder.state, message.holder._enabled_effects.difference(message.effects))
+        self.__update_sharing(message.holder, pending=pending)
 
     def _clear_holder_attribute_dependents(self, message):
         """
-        Clear calculated attributes relying on the attribute of a holder.
+        Clear calculated attributes relying on the attribute of a holder,
+        walking attribute dependency graph.
         """
         holder, attr = message
-        # Clear attributes capped by this attribute
-        for capped_attr in (holder.attributes._cap_map.get(attr) or ()):
-            del holder.attributes[capped_attr]
-        # Clear attributes which are using this attribute as modification source
-        for affector in self.__generate_affectors(holder, effect_filter=holder._enabled_effects):
-            modifier = affector.modifier
-            # Skip affectors which do not use attribute being damaged as source
-            if modifier.src_attr != attr:
+        # Value shared by several holders changes for all of them
+        group = holder.attributes._group
+        if group is None:
+            self.__clear_dependents(((holder, attr),))
+        else:
+            self.__clear_dependents([(member, attr) for member in group.holders])
+
+    def _handle_attribute_override(self, message):
+        """
+        Clear calculated attributes relying on overridden attribute,
+        or remember to do it on batch commit.
+        """
+        self.__dirty_holders.add(message.holder)
+        if self.__batch_changed_attrs is not None:
+            self.__batch_changed_attrs.add(tuple(message))
+        else:
+            self._clear_holder_attribute_dependents(message)
+        if self.__enabled:
+            self.__update_sharing(message.holder)
+
+    def _handle_start_batch(self, _):
+        """
+        Start postponing attribute invalidations.
+        """
+        self.__batch_cleared_attrs = set()
+        self.__batch_changed_attrs = set()
+        self._sharing.suspend()
+
+    def _handle_commit_batch(self, _):
+        """
+        Run all invalidations which have been postponed during
+        the batch, processing each holder attribute only once.
+        """
+        cleared_attrs = self.__batch_cleared_attrs
+        changed_attrs = self.__batch_changed_attrs
+        self.__batch_cleared_attrs = None
+        self.__batch_changed_attrs = None
+        if cleared_attrs is None:
+            return
+        for holder, attr in changed_attrs:
+            # Holder could have left the fit during the batch, cleanup
+            # for such holders was done on their removal
+            if holder._fit is not self._fit:
                 continue
-            # Go through all holders targeted by modifier
-            for target_holder in self.get_affectees(affector):
-                # And remove target attribute
-                del target_holder.attributes[modifier.tgt_attr]
+            self._clear_holder_attribute_dependents(AttrValueChangedOverride(holder=holder, attr=attr))
+        for holder, attr in cleared_attrs:
+            if holder._fit is not self._fit:
+                continue
+            del holder.attributes[attr]
+        # Values are reliable only now, thus holders changed
+        # during the batch can start sharing them
+        self.__clear_dependents(self._sharing.resume())
 
     def _handle_enable_services(self, message):
         """
         Enable service and register passed holders.
         """
         self.__enabled = True
-        for holder in message.holders:
-            self.__add_holder(holder)
+        if message.holders:
+            self.__add_holders(message.holders)
+        if self.__profile_skills:
+            self.__add_profile_skills(self.__profile_skills)
 
     def _handle_disable_services(self, message):
         """
         Unregister passed holders from this service and
         disable it.
         """
-        for holder in message.holders:
-            self.__remove_holder(holder)
+        if self.__profile_skills:
+            self.__remove_profile_skills(self.__profile_skills)
+        # Affectors of all holders are disabled before any holder is
+        # unregistered, as affectors directly targeting unregistered
+        # holder (e.g. ship) cannot be found anymore
+        if message.holders:
+            self.__remove_holders(message.holders)
         self.__enabled = False
 
+    def _handle_holders_enabling(self, message):
+        """
+        Register holders whose source data has been refreshed.
+        """
+        if not self.__enabled:
+            return
+        self.__add_holders(message.holders)
+
+    def _handle_holders_disabling(self, message):
+        """
+        Unregister holders whose source data is about to be
+        refreshed, keeping the service enabled.
+        """
+        if not self.__enabled:
+            return
+        self.__remove_holders(message.holders)
+
     _handler_map = {
         HolderAdded: _handle_holder_addition,
         HolderRemoved: _handle_holder_removal,
         HolderStateChanged: _handle_holder_state_change,
+        ProfileSkillsAdded: _handle_profile_skills_addition,
+        ProfileSkillsRemoved: _handle_profile_skills_removal,
         EffectsEnabled: _handle_holder_effects_enabling,
         EffectsDisabled: _handle_holder_effects_disabling,
         AttrValueChanged: _clear_holder_attribute_dependents,
-        AttrValueChangedOverride: _clear_holder_attribute_dependents,
+        AttrValueChangedOverride: _handle_attribute_override,
         EnableServices: _handle_enable_services,
-        DisableServices: _handle_disable_services
+        DisableServices: _handle_disable_services,
+        EnableHolders: _handle_holders_enabling,
+        DisableHolders: _handle_holders_disabling,
+        StartBatch: _handle_start_batch,
+        CommitBatch: _handle_commit_batch
     }
 
+    def _get_handler(self, message_type):
+        # Instrumented messages have to be handled by _notify,
+        # which accounts invalidations caused by them
+        if self.__instrumentation is not None and message_type in self._handler_map:
+            return self._notify
+        return BaseSubscriber._get_handler(self, message_type)
+
     def _notify(self, message):
         try:
             handler = self._handler_map[type(message)]
         except KeyError:
             return
-        handler(self, message)
+        instrumentation = self.__instrumentation
+        if instrumentation is None:
+            handler(self, message)
+            return
+        instrumentation.message_started(message)
+        try:
+            handler(self, message)
+        finally:
+            instrumentation.message_finished()
 
     # Private methods for message handlers
     def __add_holder(self, holder):
+        self.__holders.add(holder)
+        holder.attributes._instrumentation = self.__instrumentation
         self._register.register_affectee(holder)
+        self.__dirty_holders.add(holder)
+        self._sharing.leave(holder)
         states = set(filter(lambda s: s <= holder.state, State))
         self.__enable_states(holder, states)
+        self.__clear_dependents(self._sharing.register_holder(holder))
 
     def __remove_holder(self, holder):
+        self._sharing.leave(holder)
         states = set(filter(lambda s: s <= holder.state, State))
         self.__disable_states(holder, states)
         self._register.unregister_affectee(holder)
+        self.__clear_dependents(self._sharing.unregister_holder(holder))
+        self._dependencies.unregister_holder(holder)
+        self.__dirty_holders.discard(holder)
+        self.__holders.discard(holder)
+        holder.attributes._instrumentation = None
+
+    def __add_holders(self, holders):
+        """
+        Add multiple holders, collecting affectors of all of them
+        and enabling them at once.
+
+        Required arguments:
+        holders -- iterable with holders to add
+        """
+        affectors = set()
+        for holder in holders:
+            self.__holders.add(holder)
+            holder.attributes._instrumentation = self.__instrumentation
+            self._register.register_affectee(holder)
+            self.__dirty_holders.add(holder)
+            self._sharing.leave(holder)
+            affectors.update(self.__generate_affectors(
+                holder, effect_filter=holder._enabled_effects,
+                state_filter=set(filter(lambda s: s <= holder.state, State)), scope_filter=(Scope.local,)
+            ))
+        self.__enable_affectors(affectors)
+        for holder in holders:
+            self.__clear_dependents(self._sharing.register_holder(holder))
+
+    def __remove_holders(self, holders):
+        """
+        Remove multiple holders, disabling all their affectors at once.
+
+        Required arguments:
+        holders -- iterable with holders to remove
+        """
+        affectors = set()
+        for holder in holders:
+            self._sharing.leave(holder)
+            affectors.update(self.__generate_affectors(
+                holder, effect_filter=holder._enabled_effects,
+                state_filter=set(filter(lambda s: s <= holder.state, State)), scope_filter=(Scope.local,)
+            ))
+        self.__disable_affectors(affectors)
+        for holder in holders:
+            self._register.unregister_affectee(holder)
+            self.__clear_dependents(self._sharing.unregister_holder(holder))
+            self._dependencies.unregister_holder(holder)
+            self.__dirty_holders.discard(holder)
+            self.__holders.discard(holder)
+            holder.attributes._instrumentation = None
+
+    def __add_profile_skills(self, skills):
+        """
+        Enable affectors of skills from skill profile. Attributes of
+        such skills are calculated in context shared between fits,
+        thus skills are not registered as affectees.
+
+        Required arguments:
+        skills -- iterable with profile skills to add
+        """
+        self.__enable_affectors(self.__generate_profile_affectors(skills))
+
+    def __remove_profile_skills(self, skills):
+        """
+        Disable affectors of skills from skill profile.
+
+        Required arguments:
+        skills -- iterable with profile skills to remove
+        """
+        self.__disable_affectors(self.__generate_profile_affectors(skills))
+        for skill in skills:
+            self._dependencies.unregister_holder(skill)
+
+    def __generate_profile_affectors(self, skills):
+        """
+        Get affectors of profile skills which modify fit holders.
+        Modifications of skills themselves are applied by context
+        which calculates their attributes.
+
+        Required arguments:
+        skills -- iterable with profile skills
+
+        Return value:
+        Set with Affector objects
+        """
+        affectors = set()
+        for skill in skills:
+            for affector in self.__generate_affectors(
+                skill, effect_filter=skill._enabled_effects,
+                state_filter=set(filter(lambda s: s <= skill.state, State)), scope_filter=(Scope.local,)
+            ):
+                modifier = affector.modifier
+                if modifier.filter_type is None and modifier.domain == Domain.self_:
+                    continue
+                affectors.add(affector)
+        return affectors
+
+    def __update_sharing(self, holder, pending=None):
+        """
+        Update sharing of attribute values for holder after
+        its change has been processed.
+
+        Required arguments:
+        holder -- changed holder
+
+        Optional arguments:
+        pending -- tuple with state and set of enabled effect IDs
+        which holder is going to have (default None)
+        """
+        self.__dirty_holders.add(holder)
+        self.__clear_dependents(self._sharing.update_holder(holder, pending=pending))
+
+    def __clear_dependents(self, nodes):
+        """
+        Clear calculated attributes relying on passed attributes,
+        walking attribute dependency graph.
+
+        Required arguments:
+        nodes -- iterable with (holder, attribute ID) tuples
+        """
+        pop_dependents = self._dependencies.pop_dependents
+        stack = list(nodes)
+        while stack:
+            holder, attr = stack.pop()
+            for dependent_holder, dependent_attr in pop_dependents(holder, attr):
+                # Values which haven't been calculated or are overridden
+                # do not change, thus their dependents are left intact
+                dependent_attributes = dependent_holder.attributes
+                if not dependent_attributes._drop(dependent_attr):
+                    continue
+                group = dependent_attributes._group
+                if group is None:
+                    self.__dirty_holders.add(dependent_holder)
+                    stack.append((dependent_holder, dependent_attr))
+                else:
+                    self.__dirty_holders.update(group.holders)
+                    stack.extend((member, dependent_attr) for member in group.holders)
 
     def __enable_states(self, holder, states):
         """
@@ -278,11 +663,24 @@ class CalculationService(BaseSubscriber):
         Required arguments:
         affectors -- iterable with affectors in question
         """
+        # Collect holder attributes first, so that attributes
+        # targeted by multiple affectors are cleared only once.
+        # If batch is in progress, clearing is postponed until
+        # batch commit
+        cleared_attrs = self.__batch_cleared_attrs
+        postponed = cleared_attrs is not None
+        if not postponed:
+            cleared_attrs = set()
         for affector in affectors:
+            tgt_attr = affector.modifier.tgt_attr
             # Go through all holders targeted by modifier
             for target_holder in self.get_affectees(affector):
-                # And remove target attribute
-                del target_holder.attributes[affector.modifier.tgt_attr]
+                cleared_attrs.add((target_holder, tgt_attr))
+                self.__dirty_holders.add(target_holder)
+        if postponed:
+            return
+        for target_holder, attr in cleared_attrs:
+            del target_holder.attributes[attr]
 
     def __generate_affectors(self, holder, effect_filter=None, state_filter=None, scope_filter=None):
         """
@@ -0,0 +1,296 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+class ShareGroup:
+    """
+    Calculated attribute values shared by equivalent holders.
+
+    Required arguments:
+    values -- dictionary with attribute values to share
+
+    Optional arguments:
+    borrowed -- True if dictionary is shared with other
+    fit as well (default False)
+    """
+
+    __slots__ = ('values', 'holders', 'borrowed')
+
+    def __init__(self, values, borrowed=False):
+        # Format: {attribute ID: value}
+        self.values = values
+        # Format: {holders}
+        self.holders = set()
+        self.borrowed = borrowed
+
+
+class SharingRegister:
+    """
+    Detect holders which are guaranteed to have the same attribute
+    values - holders of the same type, state and domain, with the same
+    effects enabled, linked to equivalent charge or container, without
+    overridden attributes - and make them use single table of values.
+    Holder which stops being equivalent to its group leaves it with
+    a copy of the table.
+
+    To keep attribute dependency graph complete, edges leading to
+    attribute calculated by one holder of the group are recorded for
+    all other holders of the group as well, with references to holder
+    itself and its charge or container replaced by references to
+    corresponding holders.
+
+    Required arguments:
+    fit -- fit, to which this register is bound to
+    dependencies -- dependency register of the fit
+    """
+
+    def __init__(self, fit, dependencies):
+        self._fit = fit
+        self.__dependencies = dependencies
+        # Holders which are allowed to share values
+        # Format: {holders}
+        self.__holders = set()
+        # Format: {holder: sharing key}
+        self.__holder_keys = {}
+        # Format: {sharing key: ShareGroup}
+        self.__groups = {}
+        # Holders whose regrouping is postponed until sharing
+        # is resumed; when sharing is not suspended, it is None
+        # Format: {holders}
+        self.__suspended_holders = None
+        # State and enabled effects of holder which is being
+        # updated, if holder itself does not have them yet
+        # Format: {holder: (state, {effect IDs})}
+        self.__pending = {}
+
+    def register_holder(self, holder):
+        """
+        Allow holder to share values with equivalent holders.
+
+        Required arguments:
+        holder -- holder to register
+
+        Return value:
+        List with (holder, attribute ID) tuples, whose values
+        changed as result of the operation
+        """
+        self.__holders.add(holder)
+        return self.update_holder(holder)
+
+    def unregister_holder(self, holder):
+        """
+        Make holder use its own values.
+
+        Required arguments:
+        holder -- holder to unregister
+
+        Return value:
+        List with (holder, attribute ID) tuples, whose values
+        changed as result of the operation
+        """
+        self.__holders.discard(holder)
+        return self.update_holder(holder)
+
+    def leave(self, holder):
+        """
+        Make holder and its charge or container use their own values,
+        until next update. Used before changes which influence them
+        are processed, to avoid invalidating values of other holders.
+
+        Required arguments:
+        holder -- holder which is going to be changed
+        """
+        self.__leave(holder)
+        other = self.__get_other(holder)
+        if other is not None:
+            self.__leave(other)
+
+    def update_holder(self, holder, pending=None):
+        """
+        Move holder and its charge or container to groups which
+        correspond to their current state.
+
+        Required arguments:
+        holder -- holder which has been changed
+
+        Optional arguments:
+        pending -- tuple with state and set of enabled effect IDs
+        which holder is going to have, for changes which are
+        processed before holder applies them (default None)
+
+        Return value:
+        List with (holder, attribute ID) tuples, whose values
+        changed as result of the operation
+        """
+        other = self.__get_other(holder)
+        suspended_holders = self.__suspended_holders
+        if suspended_holders is not None:
+            self.leave(holder)
+            suspended_holders.add(holder)
+            if other is not None:
+                suspended_holders.add(other)
+            return []
+        if pending is not None:
+            self.__pending[holder] = pending
+        try:
+            changed = self.__regroup(holder)
+            if other is not None:
+                changed.extend(self.__regroup(other))
+        finally:
+            self.__pending.clear()
+        return changed
+
+    def suspend(self):
+        """
+        Postpone regrouping of changed holders until resume. Changed
+        holders still leave their groups right away. Used while attribute
+        invalidations are postponed, as values of holders are not reliable
+        until invalidations are done.
+        """
+        if self.__suspended_holders is None:
+            self.__suspended_holders = set()
+
+    def resume(self):
+        """
+        Regroup all holders which have been changed while
+        sharing was suspended.
+
+        Return value:
+        List with (holder, attribute ID) tuples, whose values
+        changed as result of the operation
+        """
+        holders = self.__suspended_holders
+        self.__suspended_holders = None
+        changed = []
+        if holders is None:
+            return changed
+        for holder in holders:
+            changed.extend(self.__regroup(holder))
+        return changed
+
+    def propagate_dependencies(self, holder, attr):
+        """
+        Record dependencies of calculated attribute for all
+        holders which share values with passed holder.
+
+        Required arguments:
+        holder -- holder which calculated attribute
+        attr -- ID of calculated attribute
+        """
+        group = holder.attributes._group
+        if group is None:
+            return
+        for member in group.holders:
+            if member is not holder:
+                self.__copy_dependencies(holder, member, attr)
+
+    def __regroup(self, holder):
+        new_key = self.__get_key(holder)
+        if new_key == self.__holder_keys.get(holder):
+            return []
+        self.__leave(holder)
+        if new_key is None:
+            return []
+        self.__holder_keys[holder] = new_key
+        attributes = holder.attributes
+        group = self.__groups.get(new_key)
+        if group is None:
+            group = self.__groups[new_key] = ShareGroup(attributes._values, attributes._borrowed)
+            group.holders.add(holder)
+            attributes._set_values(group.values, group, group.borrowed)
+            return []
+        # Adopt values of the group, reporting values which differ
+        # from what holder has had
+        representative = next(iter(group.holders))
+        changed = []
+        for attr, value in attributes._values.items():
+            self.__dependencies.clear_dependencies(holder, attr)
+            if attr not in group.values or group.values[attr] != value:
+                changed.append((holder, attr))
+        group.holders.add(holder)
+        attributes._set_values(group.values, group, group.borrowed)
+        for attr in group.values:
+            self.__copy_dependencies(representative, holder, attr)
+        return changed
+
+    def __leave(self, holder):
+        key = self.__holder_keys.pop(holder, None)
+        if key is None:
+            return
+        group = self.__groups[key]
+        group.holders.discard(holder)
+        if group.holders:
+            holder.attributes._set_values(dict(group.values), None)
+        else:
+            del self.__groups[key]
+            holder.attributes._set_values(group.values, None, group.borrowed)
+
+    def __copy_dependencies(self, src_holder, tgt_holder, attr):
+        # References to holder and its linked holder are
+        # replaced by references to their counterparts
+        counterparts = {src_holder: tgt_holder}
+        src_other = self.__get_other(src_holder)
+        if src_other is not None:
+            counterparts[src_other] = self.__get_other(tgt_holder)
+        dependencies = self.__dependencies
+        dependencies.clear_dependencies(tgt_holder, attr)
+        for dep_holder, dep_attr in tuple(dependencies.get_dependencies(src_holder, attr)):
+            dep_holder = counterparts.get(dep_holder, dep_holder)
+            if dep_holder is not None:
+                dependencies.add_dependency(dep_holder, dep_attr, tgt_holder, attr)
+
+    def __get_key(self, holder):
+        """
+        Compose key which is equal for holders which can
+        share attribute values, or None if holder can't share
+        its values.
+        """
+        if holder not in self.__holders or holder.attributes._overrides:
+            return None
+        other = self.__get_other(holder)
+        if other is None or other not in self.__holders:
+            other_key = None
+        elif other.attributes._overrides:
+            return None
+        else:
+            other_state, other_effects = self.__get_status(other)
+            other_key = (type(other), other._type_id, other_state, frozenset(other_effects))
+        state, effects = self.__get_status(holder)
+        return (type(holder), holder._type_id, state, frozenset(effects), holder._domain, other_key)
+
+    def __get_status(self, holder):
+        """Get state and enabled effect IDs of holder, including pending changes."""
+        try:
+            return self.__pending[holder]
+        except KeyError:
+            return holder.state, holder._enabled_effects
+
+    @staticmethod
+    def __get_other(holder):
+        """
+        Get holder linked via 'other' link, like charge's
+        module or module's charge, or None.
+        """
+        if hasattr(holder, 'charge'):
+            return holder.charge
+        elif hasattr(holder, 'container'):
+            return holder.container
+        else:
+            return None
@@ -19,6 +19,8 @@
 # ===============================================================================
 
 
+from contextlib import contextmanager
+
 from eos.const.eve import Type
 from eos.data.source import SourceManager, Source
 from eos.util.pubsub import MessageBroker, BaseSubscriber
@@ -26,9 +28,15 @@ from eos.util.repr import make_repr_str
 from .calculator import CalculationService
 from .holder.container import HolderDescriptorOnFit, HolderList, HolderRestrictedSet, HolderSet, ModuleRacks
 from .holder.item import *
-from .messages import HolderAdded, HolderRemoved, EnableServices, DisableServices, RefreshSource
+from .messages import (
+    HolderAdded, HolderRemoved, HolderStateChanged, EffectsEnabled, EffectsDisabled, ProfileSkillsAdded,
+    ProfileSkillsRemoved, AttrValueChangedOverride, EnableServices, DisableServices, RefreshSource,
+    EnableHolders, DisableHolders, StartBatch, CommitBatch
+)
 from .restrictions import RestrictionService
+from .source_diff import SourceDiff
 from .stats import StatService
+from .tuples import StatDelta
 from .volatile import FitVolatileManager
 
 
@@ -37,14 +45,32 @@ class Fit(MessageBroker, BaseSubscriber):
     Fit holds all fit items and facilities to calculate their attributes.
 
     Optional arguments:
-    source -- source to use for this fit
+    source -- source to use for this fit; when alias of source which
+    is prepared in background is passed, fit waits until it's ready
+    eager -- when True, values of all attributes are calculated after
+    each change of the fit, see materialize() (default False)
     """
 
-    def __init__(self, source=None):
+    def __init__(self, source=None, eager=False):
         MessageBroker.__init__(self)
         self.__source = None
+        # Depth of nested batch contexts currently entered
+        self.__batch_depth = 0
+        # Depth of nested message publications currently processed
+        self.__publish_depth = 0
+        self.__eager = False
+        self.__materializing = False
         # Keep list of all holders which belong to this fit
         self.__holders = set()
+        # Skill profile assigned to fit, and skills from it which
+        # are applied to the fit
+        self.__skill_profile = None
+        # Format: {skill type ID: profile skill}
+        self.__profile_skills = {}
+        # Copy of the fit which is used to evaluate deltas, kept
+        # until the fit changes
+        # Format: (copy of the fit, {holder of this fit: holder of copy})
+        self.__scratch = None
         self._subscribe(self, self._handler_map.keys())
         # Character-related holder containers
         self.skills = HolderRestrictedSet(self, Skill)
@@ -70,18 +96,42 @@ class Fit(MessageBroker, BaseSubscriber):
         # enable services (if there's source), thus it has to be after service
         # initialization
         if source is None:
-            source = SourceManager.default
+            source = SourceManager.get_default()
         self.source = source
         # As character object shouldn't change in any sane cases, initialize it
         # here. It has to be assigned after fit starts to track list of holders
         # to make sure it's part of it
         self.character = Character(Type.character_static)
+        self.eager = eager
 
     ship = HolderDescriptorOnFit('_ship', Ship)
     stance = HolderDescriptorOnFit('_stance', Stance)
     character = HolderDescriptorOnFit('_character', Character)
     effect_beacon = HolderDescriptorOnFit('_effect_beacon', EffectBeacon)
 
+    # Format: ((holder class, container attribute name),)
+    __holder_containers = (
+        (Skill, 'skills'),
+        (Implant, 'implants'),
+        (Booster, 'boosters'),
+        (Subsystem, 'subsystems'),
+        (Rig, 'rigs'),
+        (Drone, 'drones')
+    )
+    # Format: ((holder class, rack attribute name),)
+    __holder_racks = (
+        (ModuleHigh, 'high'),
+        (ModuleMed, 'med'),
+        (ModuleLow, 'low')
+    )
+    # Format: ((holder class, descriptor attribute name),)
+    __holder_descriptors = (
+        (Ship, 'ship'),
+        (Stance, 'stance'),
+        (Character, 'character'),
+        (EffectBeacon, 'effect_beacon')
+    )
+
     def validate(self, skip_checks=()):
         """
         Run fit validation.
@@ -94,8 +144,186 @@ class Fit(MessageBroker, BaseSubscriber):
         """
         self._restriction.validate(skip_checks)
 
+    @contextmanager
+    def batch(self):
+        """
+        Context manager which groups multiple fit changes together.
+        While it is active, services postpone invalidation of calculated
+        attributes and volatile data, and when outermost context is
+        exited, they run one combined invalidation. Values read inside
+        of the context may not reflect changes made in it.
+        """
+        self.__batch_depth += 1
+        if self.__batch_depth == 1:
+            self._publish(StartBatch())
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self._publish(CommitBatch())
+
+    def materialize(self):
+        """
+        Calculate values of all attributes which are not calculated
+        yet, or have been invalidated by changes of the fit. After
+        that, attribute reads are plain lookups until next change.
+        """
+        if self.__materializing:
+            return
+        self.__materializing = True
+        try:
+            self._calculator.materialize()
+        finally:
+            self.__materializing = False
+
+    def enable_instrumentation(self):
+        """
+        Start collecting statistics about work done by attribute
+        calculator: calculations, cache hits and invalidations per
+        attribute and per holder type, affectors visited, time spent
+        on calculations and invalidations caused by each message.
+
+        Return value:
+        Collector of statistics, which provides report() and
+        to_prometheus() methods
+        """
+        return self._calculator.enable_instrumentation()
+
+    def disable_instrumentation(self):
+        """
+        Stop collecting statistics about work done by attribute calculator.
+
+        Return value:
+        Collector which has been used, or None
+        """
+        return self._calculator.disable_instrumentation()
+
+    @property
+    def instrumentation(self):
+        """
+        Collector of attribute calculator statistics, or None
+        if instrumentation is disabled.
+        """
+        return self._calculator.instrumentation
+
+    def clone(self):
+        """
+        Make independent copy of the fit, with copies of all its
+        holders. Attribute values which are already calculated on
+        this fit are taken over by the copy, thus after change of
+        the copy, only values affected by the change are calculated.
+
+        Return value:
+        New fit
+        """
+        fit, _ = self.__clone()
+        fit.eager = self.eager
+        return fit
+
+    def evaluate_delta(self, stat_getter, add=(), remove=(), state_changes=None):
+        """
+        Evaluate statistics of hypothetical fit, which is this fit with
+        passed changes applied. Changes are applied to scratch copy of the
+        fit, which takes over values calculated on this fit; this fit and
+        passed holders are left intact.
+
+        Required arguments:
+        stat_getter -- callable which receives fit and returns
+        statistics to compare, e.g. lambda fit: fit.stats.worst_case_ehp
+
+        Optional arguments:
+        add -- iterable with holders, which are not assigned to any
+        fit, to add; modules are put into first free slot of their rack,
+        and ship, stance, character and effect beacon replace those of
+        the fit (default empty tuple)
+        remove -- iterable with holders of this fit to remove
+        (default empty tuple)
+        state_changes -- map in {holder: state} format, holders can
+        be holders of this fit or holders passed to add (default None)
+
+        Return value:
+        StatDelta with values returned by getter for this fit
+        and for hypothetical fit
+
+        Possible exceptions:
+        TypeError -- raised when holder of unsupported class is passed
+        ValueError -- raised when holder to add is assigned to fit, or
+        holder to remove or change does not belong to this fit
+        """
+        base = stat_getter(self)
+        fit, holder_map = self.__get_scratch()
+        # Format: {added holder: its copy}
+        added_map = {}
+        # Actions which revert changes applied to scratch copy
+        # Format: [(callable, (arguments))]
+        undo_actions = []
+        try:
+            with fit.batch():
+                for holder in remove:
+                    holder_clone = self.__map_holder(holder, holder_map, added_map)
+                    undo_actions.append(self.__remove_holder(fit, holder_clone))
+                for holder in add:
+                    if holder._fit is not None:
+                        raise ValueError(holder)
+                    holder_clone = self.__clone_holder(holder, added_map)
+                    undo_actions.append(self.__add_holder(fit, holder_clone))
+                for holder, state in (state_changes or {}).items():
+                    holder_clone = self.__map_holder(holder, holder_map, added_map)
+                    undo_actions.append((setattr, (holder_clone, 'state', holder_clone.state)))
+                    holder_clone.state = state
+            changed = stat_getter(fit)
+        finally:
+            try:
+                with fit.batch():
+                    for action, args in reversed(undo_actions):
+                        action(*args)
+            except Exception:
+                # Copy which failed to revert is not used anymore
+                self.__scratch = None
+                raise
+        return StatDelta(base=base, changed=changed)
+
+    @property
+    def eager(self):
+        """
+        Eager calculation mode flag. When it's enabled, fit is
+        materialized after every change, and on exit from batch.
+        """
+        return self.__eager
+
+    @eager.setter
+    def eager(self, new_eager):
+        self.__eager = new_eager
+        if new_eager:
+            self.materialize()
+
+    @property
+    def skill_profile(self):
+        """
+        Shared skill profile, whose skills are applied to the fit
+        in addition to skills from fit.skills container. When skill
+        is present in both, skill from fit.skills takes precedence.
+        """
+        return self.__skill_profile
+
+    @skill_profile.setter
+    def skill_profile(self, new_profile):
+        if new_profile is self.__skill_profile:
+            return
+        self.__skill_profile = new_profile
+        self.__update_profile_skills()
+
     @property
     def source(self):
+        """
+        Source of data used by the fit. When switching between two
+        sources, only holders whose data differs between sources are
+        refreshed. Other holders keep using item objects of previous
+        source, thus its data is kept in memory until these holders
+        are refreshed, e.g. when they are re-added to the fit or when
+        source is switched via None.
+        """
         return self.__source
 
     @source.setter
@@ -108,6 +336,11 @@ class Fit(MessageBroker, BaseSubscriber):
         # Do not update anything if sources are the same
         if new_source is old_source:
             return
+        # When switching between two sources, try to refresh
+        # only holders whose data differs between them
+        if old_source is not None and new_source is not None:
+            if self.__switch_source_incrementally(old_source, new_source):
+                return
         # Disable everything dependent on old source prior to switch
         if old_source is not None:
             self._publish(DisableServices(self.__holders))
@@ -120,14 +353,47 @@ class Fit(MessageBroker, BaseSubscriber):
 
     # Message handling
     def _handle_holder_addition(self, message):
-        self.__holders.add(message.holder)
+        self._handle_fit_change(message)
+        holder = message.holder
+        self.__holders.add(holder)
+        # Skill from fit.skills replaces profile skill of the same type
+        if isinstance(holder, Skill):
+            profile_skill = self.__profile_skills.pop(holder._type_id, None)
+            if profile_skill is not None:
+                self._publish(ProfileSkillsRemoved((profile_skill,)))
 
     def _handle_holder_removal(self, message):
-        self.__holders.discard(message.holder)
+        self._handle_fit_change(message)
+        holder = message.holder
+        self.__holders.discard(holder)
+        if isinstance(holder, Skill):
+            profile_skill = self.__get_shared_skills(self.source).get(holder._type_id)
+            if profile_skill is not None:
+                self.__profile_skills[holder._type_id] = profile_skill
+                self._publish(ProfileSkillsAdded((profile_skill,)))
+
+    def _handle_refresh_source(self, message):
+        self._handle_fit_change(message)
+        self.__update_profile_skills()
+
+    def _handle_fit_change(self, _):
+        # Scratch copy does not reflect the fit anymore
+        self.__scratch = None
 
     _handler_map = {
         HolderAdded: _handle_holder_addition,
-        HolderRemoved: _handle_holder_removal
+        HolderRemoved: _handle_holder_removal,
+        HolderStateChanged: _handle_fit_change,
+        EffectsEnabled: _handle_fit_change,
+        EffectsDisabled: _handle_fit_change,
+        ProfileSkillsAdded: _handle_fit_change,
+        ProfileSkillsRemoved: _handle_fit_change,
+        AttrValueChangedOverride: _handle_fit_change,
+        EnableServices: _handle_fit_change,
+        DisableServices: _handle_fit_change,
+        RefreshSource: _handle_refresh_source,
+        EnableHolders: _handle_fit_change,
+        DisableHolders: _handle_fit_change
     }
 
     def _notify(self, message):
@@ -137,10 +403,269 @@ class Fit(MessageBroker, BaseSubscriber):
             return
         handler(self, message)
 
+    def _publish(self, message):
+        self.__publish_depth += 1
+        try:
+            MessageBroker._publish(self, message)
+        finally:
+            self.__publish_depth -= 1
+        # In eager mode, calculate everything only when change
+        # has been completely processed
+        if self.__eager and self.__publish_depth == 0 and self.__batch_depth == 0:
+            self.materialize()
+
+    def _publish_many(self, messages):
+        self.__publish_depth += 1
+        try:
+            MessageBroker._publish_many(self, messages)
+        finally:
+            self.__publish_depth -= 1
+        if self.__eager and self.__publish_depth == 0 and self.__batch_depth == 0:
+            self.materialize()
+
     # Auxiliary methods
+    def __switch_source_incrementally(self, old_source, new_source):
+        """
+        Switch to new source, refreshing only holders whose type data
+        differs between sources. Values calculated for other holders
+        are kept, unless they are invalidated by refreshed holders.
+
+        Required arguments:
+        old_source -- source currently used by fit
+        new_source -- source to switch to
+
+        Return value:
+        True if source has been switched, False if all holders
+        have to be refreshed
+        """
+        diff = SourceDiff(old_source, new_source)
+        changed_holders = set()
+        kept_holders = []
+        for holder in self.__holders:
+            if diff.type_changed(holder._type_id):
+                changed_holders.add(holder)
+            else:
+                kept_holders.append(holder)
+        changed_skills = []
+        for type_id, skill in self.__profile_skills.items():
+            if diff.type_changed(type_id):
+                changed_skills.append(skill)
+            else:
+                kept_holders.append(skill)
+        if not kept_holders:
+            return False
+        # Calculated values rely on attribute metadata too. Compiled
+        # calculation plans contain it as well, and they are kept
+        # when values are dropped
+        kept_attrs = set()
+        for holder in kept_holders:
+            kept_attrs.update(holder.attributes._values)
+            kept_attrs.update(holder.attributes._plans)
+        if diff.attributes_changed(kept_attrs):
+            return False
+        self.__publish_depth += 1
+        try:
+            # Skills are removed while holders they affect are still
+            # registered, so that their affectors are found
+            if changed_skills:
+                self._publish(ProfileSkillsRemoved(tuple(changed_skills)))
+            if changed_holders:
+                self._publish(DisableHolders(changed_holders))
+            self.__source = new_source
+            # Holders which are kept use items of old source, as
+            # services rely on identity of item data (e.g. modifiers)
+            for holder in changed_holders:
+                holder._refresh_source()
+            if changed_skills:
+                new_skills = self.__get_shared_skills(new_source)
+                added_skills = []
+                for skill in changed_skills:
+                    new_skill = new_skills[skill._type_id]
+                    self.__profile_skills[skill._type_id] = new_skill
+                    added_skills.append(new_skill)
+                self._publish(ProfileSkillsAdded(tuple(added_skills)))
+            if changed_holders:
+                self._publish(EnableHolders(changed_holders))
+        finally:
+            self.__publish_depth -= 1
+        if self.__eager and self.__publish_depth == 0 and self.__batch_depth == 0:
+            self.materialize()
+        return True
+
+    def __clone(self):
+        """
+        Make copy of the fit with copies of all its holders.
+
+        Return value:
+        Tuple with new fit and map in {holder of this fit: holder
+        of new fit} format
+        """
+        fit = type(self)(source=self.source)
+        if self.source is None:
+            fit.source = None
+        # Format: {holder of this fit: holder of new fit}
+        holder_map = {}
+        with fit.batch():
+            fit.ship = self.__clone_holder(self.ship, holder_map)
+            fit.stance = self.__clone_holder(self.stance, holder_map)
+            fit.character = self.__clone_holder(self.character, holder_map)
+            fit.effect_beacon = self.__clone_holder(self.effect_beacon, holder_map)
+            for _, container_name in self.__holder_containers:
+                container = getattr(fit, container_name)
+                for holder in getattr(self, container_name):
+                    container.add(self.__clone_holder(holder, holder_map))
+            for _, rack_name in self.__holder_racks:
+                rack = getattr(fit.modules, rack_name)
+                for index, holder in enumerate(getattr(self.modules, rack_name)):
+                    if holder is not None:
+                        rack.place(index, self.__clone_holder(holder, holder_map))
+            fit.skill_profile = self.skill_profile
+            # Overrides are set after holders have been assigned to fit,
+            # as assignment clears non-persistent overrides
+            for holder, holder_clone in holder_map.items():
+                for attr, override in holder.attributes._overrides.items():
+                    holder_clone.attributes._override_set(attr, override.value, persist=override.persistent)
+        # Profile skills are shared, but after incremental source
+        # switch fits may use skills taken from different sources
+        for type_id, skill in self.__profile_skills.items():
+            holder_map[skill] = fit.__profile_skills[type_id]
+        fit._calculator.copy_values(self._calculator, holder_map)
+        return fit, holder_map
+
+    def __get_scratch(self):
+        """
+        Get scratch copy of the fit, making it if the fit
+        has changed since the copy was made.
+
+        Return value:
+        Tuple with copy of the fit and map in {holder of this
+        fit: holder of copy} format
+        """
+        if self.__scratch is None:
+            self.__scratch = self.__clone()
+        return self.__scratch
+
+    def __get_shared_skills(self, source):
+        """
+        Get skills of assigned skill profile for passed source.
+
+        Required arguments:
+        source -- source to take skill data from, can be None
+
+        Return value:
+        Map in {skill type ID: profile skill} format
+        """
+        if self.__skill_profile is None or source is None:
+            return {}
+        return self.__skill_profile._get_skills(source)
+
+    def __update_profile_skills(self):
+        """
+        Apply skills of assigned skill profile for current source,
+        except for skills which are present in fit.skills container.
+        """
+        # Format: {skill type ID: profile skill}
+        new_skills = dict(self.__get_shared_skills(self.source))
+        for skill in self.skills:
+            new_skills.pop(skill._type_id, None)
+        old_skills = self.__profile_skills
+        removed_skills = tuple(
+            skill for type_id, skill in old_skills.items()
+            if new_skills.get(type_id) is not skill
+        )
+        added_skills = tuple(
+            skill for type_id, skill in new_skills.items()
+            if old_skills.get(type_id) is not skill
+        )
+        self.__profile_skills = new_skills
+        if removed_skills:
+            self._publish(ProfileSkillsRemoved(removed_skills))
+        if added_skills:
+            self._publish(ProfileSkillsAdded(added_skills))
+
+    @staticmethod
+    def __add_holder(fit, holder):
+        """
+        Put holder into fit container which corresponds to its class.
+
+        Return value:
+        Tuple with callable and its arguments, which reverts the change
+        """
+        for holder_class, container_name in Fit.__holder_containers:
+            if isinstance(holder, holder_class):
+                container = getattr(fit, container_name)
+                container.add(holder)
+                return container.remove, (holder,)
+        for holder_class, rack_name in Fit.__holder_racks:
+            if isinstance(holder, holder_class):
+                rack = getattr(fit.modules, rack_name)
+                rack.equip(holder)
+                return rack.free, (holder,)
+        for holder_class, attr_name in Fit.__holder_descriptors:
+            if isinstance(holder, holder_class):
+                old_holder = getattr(fit, attr_name)
+                setattr(fit, attr_name, holder)
+                return setattr, (fit, attr_name, old_holder)
+        raise TypeError(type(holder))
+
+    @staticmethod
+    def __remove_holder(fit, holder):
+        """
+        Remove holder from fit container which corresponds to its class.
+
+        Return value:
+        Tuple with callable and its arguments, which reverts the change
+        """
+        for holder_class, container_name in Fit.__holder_containers:
+            if isinstance(holder, holder_class):
+                container = getattr(fit, container_name)
+                container.remove(holder)
+                return container.add, (holder,)
+        for holder_class, rack_name in Fit.__holder_racks:
+            if isinstance(holder, holder_class):
+                rack = getattr(fit.modules, rack_name)
+                index = rack.index(holder)
+                rack.free(holder)
+                return rack.place, (index, holder)
+        for holder_class, attr_name in Fit.__holder_descriptors:
+            if isinstance(holder, holder_class):
+                setattr(fit, attr_name, None)
+                return setattr, (fit, attr_name, holder)
+        raise TypeError(type(holder))
+
+    @staticmethod
+    def __map_holder(holder, *holder_maps):
+        """
+        Get copy of holder from the first map which has it.
+
+        Possible exceptions:
+        ValueError -- raised when no map has passed holder
+        """
+        for holder_map in holder_maps:
+            try:
+                return holder_map[holder]
+            except KeyError:
+                continue
+        raise ValueError(holder)
+
+    @staticmethod
+    def __clone_holder(holder, holder_map):
+        """
+        Copy holder along with its charge, and record
+        pairs of original holders and their copies.
+        """
+        if holder is None:
+            return None
+        holder_clone = holder._clone()
+        holder_map[holder] = holder_clone
+        charge = getattr(holder, 'charge', None)
+        if charge is not None:
+            holder_map[charge] = holder_clone.charge
+        return holder_clone
+
     def __repr__(self):
         spec = [
             'source', 'ship', 'stance', 'subsystems', 'modules', 'rigs', 'drones',
-            'character', 'skills', 'implants', 'boosters'
+            'character', 'skills', 'skill_profile', 'implants', 'boosters'
         ]
         return make_repr_str(self, spec)
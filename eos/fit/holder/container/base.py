@@ -63,6 +63,19 @@ class HolderContainerBase:
             self._handle_holder_addition(fit, charge)
         fit._publish(HolderAdded(holder))
 
+    def _handle_holders_addition(self, fit, holders):
+        """
+        Do all the generic work to add multiple holders to
+        container in one pass, so that services process them
+        as single change. Must be called after holders have
+        been checked and assigned to specific container.
+        """
+        messages = []
+        for holder in holders:
+            self.__link_holder(fit, holder, messages)
+        with fit.batch():
+            fit._publish_many(messages)
+
     def _handle_holder_removal(self, fit, holder):
         """
         Do all the generic work to remove holder to container.
@@ -81,6 +94,54 @@ class HolderContainerBase:
             self._handle_holder_removal(fit, charge)
         holder._fit = None
 
+    def _check_holders(self, holders, kept=(), allow_none=False):
+        """
+        Check that all passed holders can be added to container,
+        before any of them is actually added.
+
+        Required arguments:
+        holders -- iterable with holders to check
+
+        Optional arguments:
+        kept -- holders which are already in container and
+        are allowed to stay there (default empty tuple)
+        allow_none -- whether None is accepted (default False)
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder is passed more than once
+        HolderAlreadyAssignedError -- raised when holder, or its
+        charge, already belongs to some fit
+        """
+        checked = set()
+        for holder in holders:
+            self._check_class(holder, allow_none=allow_none)
+            if holder is None:
+                continue
+            if holder in checked:
+                msg = 'holder {} is passed more than once'.format(holder)
+                raise ValueError(msg)
+            checked.add(holder)
+            if holder in kept:
+                continue
+            if holder._fit is not None:
+                raise HolderAlreadyAssignedError(holder)
+            charge = getattr(holder, 'charge', None)
+            if charge is not None and charge._fit is not None:
+                raise HolderAlreadyAssignedError(charge)
+
+    def __link_holder(self, fit, holder, messages):
+        """
+        Link holder and its charge to fit, collecting
+        messages about their addition.
+        """
+        holder._fit = fit
+        charge = getattr(holder, 'charge', None)
+        if charge is not None:
+            self.__link_holder(fit, charge, messages)
+        messages.append(HolderAdded(holder))
+
     def _check_class(self, holder, allow_none=False):
         """
         Check if class of passed holder corresponds
@@ -84,6 +84,64 @@ class HolderList(HolderContainerBase):
             del self.__list[-1]
             raise ValueError(*e.args) from e
 
+    def extend(self, holders):
+        """
+        Append multiple holders to the end of container in one
+        pass. All holders are checked before any of them is
+        added, and services process them as single change.
+
+        Required arguments:
+        holders -- iterable with holders to append
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder cannot be added to
+        container (e.g. already belongs to some fit or is
+        passed more than once)
+        """
+        holders = tuple(holders)
+        try:
+            self._check_holders(holders)
+        except HolderAlreadyAssignedError as e:
+            raise ValueError(*e.args) from e
+        self.__list.extend(holders)
+        self._handle_holders_addition(self.__fit, holders)
+
+    def replace_all(self, values):
+        """
+        Replace contents of container with passed values in one
+        pass. Values can be holders or Nones, which stand for
+        empty slots. Holders which are already in container are
+        kept there (possibly on other positions), others are
+        removed.
+
+        Required arguments:
+        values -- iterable with new contents of container
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder cannot be added to
+        container (e.g. already belongs to some other fit or
+        is passed more than once)
+        """
+        values = tuple(values)
+        old_holders = set(self.holders())
+        try:
+            self._check_holders(values, kept=old_holders, allow_none=True)
+        except HolderAlreadyAssignedError as e:
+            raise ValueError(*e.args) from e
+        new_holders = set(values)
+        removed = tuple(holder for holder in self.holders() if holder not in new_holders)
+        added = tuple(value for value in values if value is not None and value not in old_holders)
+        with self.__fit.batch():
+            for holder in removed:
+                self._handle_holder_removal(self.__fit, holder)
+            self.__list[:] = values
+            self._cleanup()
+            self._handle_holders_addition(self.__fit, added)
+
     def place(self, index, holder):
         """
         Put holder to given position; if position is out of
@@ -184,6 +242,10 @@ class HolderList(HolderContainerBase):
         self.__list[index] = None
         self._cleanup()
 
+    @property
+    def _fit(self):
+        return self.__fit
+
     def holders(self):
         """Return view over container with just holders."""
         return ListHolderView(self.__list)
@@ -22,6 +22,7 @@
 from itertools import chain
 
 from eos.util.repr import make_repr_str
+from .exception import HolderAlreadyAssignedError
 
 
 class ModuleRacks:
@@ -35,6 +36,61 @@ class ModuleRacks:
         self.med = med
         self.low = low
 
+    def extend(self, high=(), med=(), low=()):
+        """
+        Append holders to multiple racks in one pass. Holders for
+        all racks are checked before any of them is added, and
+        services process them as single change.
+
+        Optional arguments:
+        high -- iterable with holders for high slot rack
+        med -- iterable with holders for medium slot rack
+        low -- iterable with holders for low slot rack
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder cannot be added to
+        its rack (e.g. already belongs to some fit or is
+        passed more than once)
+        """
+        racks = ((self.high, tuple(high)), (self.med, tuple(med)), (self.low, tuple(low)))
+        for rack, holders in racks:
+            try:
+                rack._check_holders(holders)
+            except HolderAlreadyAssignedError as e:
+                raise ValueError(*e.args) from e
+        with self.high._fit.batch():
+            for rack, holders in racks:
+                rack.extend(holders)
+
+    def replace_all(self, high=(), med=(), low=()):
+        """
+        Replace contents of all racks in one pass. Values can be
+        holders or Nones, which stand for empty slots.
+
+        Optional arguments:
+        high -- iterable with new contents of high slot rack
+        med -- iterable with new contents of medium slot rack
+        low -- iterable with new contents of low slot rack
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder cannot be added to
+        its rack (e.g. already belongs to some other fit or
+        is passed more than once)
+        """
+        racks = ((self.high, tuple(high)), (self.med, tuple(med)), (self.low, tuple(low)))
+        for rack, values in racks:
+            try:
+                rack._check_holders(values, kept=set(rack.holders()), allow_none=True)
+            except HolderAlreadyAssignedError as e:
+                raise ValueError(*e.args) from e
+        with self.high._fit.batch():
+            for rack, values in racks:
+                rack.replace_all(values)
+
     def holders(self):
         """Return view over all module holders."""
         return ModuleHolderView(self)
@@ -59,6 +59,47 @@ class HolderRestrictedSet(HolderSet):
             del self.__type_id_map[type_id]
             raise
 
+    def add_many(self, holders):
+        """
+        Add multiple holders to container in one pass.
+
+        Required arguments:
+        holders -- iterable with holders to add
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder cannot be added to
+        container (e.g. already belongs to some fit, is passed
+        more than once or holder with its type ID exists in
+        container or among passed holders)
+        """
+        holders = tuple(holders)
+        type_id_map = self.__make_type_id_map(holders, self.__type_id_map)
+        HolderSet.add_many(self, holders)
+        self.__type_id_map = type_id_map
+
+    def replace_all(self, holders):
+        """
+        Replace contents of container with passed holders
+        in one pass.
+
+        Required arguments:
+        holders -- iterable with new contents of container
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder cannot be added to
+        container (e.g. already belongs to some other fit, is
+        passed more than once or holder with its type ID exists
+        among passed holders)
+        """
+        holders = tuple(holders)
+        type_id_map = self.__make_type_id_map(holders, {})
+        HolderSet.replace_all(self, holders)
+        self.__type_id_map = type_id_map
+
     def remove(self, holder):
         """
         Remove holder from container.
@@ -83,3 +124,18 @@ class HolderRestrictedSet(HolderSet):
         """Remove holder by type ID"""
         holder = self.__type_id_map[type_id]
         self.remove(holder)
+
+    @staticmethod
+    def __make_type_id_map(holders, type_id_map):
+        """
+        Make copy of type ID map with passed holders added,
+        checking that type IDs do not repeat.
+        """
+        type_id_map = dict(type_id_map)
+        for holder in holders:
+            type_id = getattr(holder, '_type_id', None)
+            if type_id in type_id_map and type_id_map[type_id] is not holder:
+                msg = 'holder with type ID {} already exists in this set'.format(type_id)
+                raise ValueError(msg)
+            type_id_map[type_id] = holder
+        return type_id_map
@@ -56,6 +56,61 @@ class HolderSet(HolderContainerBase):
             self.__set.remove(holder)
             raise ValueError from e
 
+    def add_many(self, holders):
+        """
+        Add multiple holders to container in one pass. All holders
+        are checked before any of them is added, and services
+        process them as single change.
+
+        Required arguments:
+        holders -- iterable with holders to add
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder cannot be added to
+        container (e.g. already belongs to some fit or is
+        passed more than once)
+        """
+        holders = tuple(holders)
+        try:
+            self._check_holders(holders)
+        except HolderAlreadyAssignedError as e:
+            raise ValueError from e
+        self.__set.update(holders)
+        self._handle_holders_addition(self.__fit, holders)
+
+    def replace_all(self, holders):
+        """
+        Replace contents of container with passed holders in one
+        pass. Holders which are already in container are kept
+        there, others are removed.
+
+        Required arguments:
+        holders -- iterable with new contents of container
+
+        Possible exceptions:
+        TypeError -- raised when holder of unacceptable class
+        is passed
+        ValueError -- raised when holder cannot be added to
+        container (e.g. already belongs to some other fit or
+        is passed more than once)
+        """
+        holders = tuple(holders)
+        try:
+            self._check_holders(holders, kept=self.__set)
+        except HolderAlreadyAssignedError as e:
+            raise ValueError from e
+        new_set = set(holders)
+        removed = tuple(holder for holder in self.__set if holder not in new_set)
+        added = tuple(holder for holder in holders if holder not in self.__set)
+        with self.__fit.batch():
+            for holder in removed:
+                self._handle_holder_removal(self.__fit, holder)
+            self.__set.difference_update(removed)
+            self.__set.update(added)
+            self._handle_holders_addition(self.__fit, added)
+
     def remove(self, holder):
         """
         Remove holder from container.
@@ -45,6 +45,7 @@ class ChargeableMixin(HolderBase, CooperativeVolatileMixin):
 
     Cooperative methods:
     __init__
+    _clone
     """
 
     def __init__(self, charge, **kwargs):
@@ -53,6 +54,12 @@ class ChargeableMixin(HolderBase, CooperativeVolatileMixin):
 
     charge = HolderDescriptorOnHolder('_charge', 'container', Charge)
 
+    def _clone(self):
+        holder = super()._clone()
+        if self.charge is not None:
+            holder.charge = self.charge._clone()
+        return holder
+
     @VolatileProperty
     def charge_quantity(self):
         """
@@ -42,6 +42,7 @@ class HolderBase(BaseSubscriber):
 
     Cooperative methods:
     __init__
+    _clone
     """
 
     def __init__(self, type_id, **kwargs):
@@ -74,10 +75,23 @@ class HolderBase(BaseSubscriber):
         if old_fit is not None:
             old_fit._unsubscribe(self, (RefreshSource,))
         self.__fit = new_fit
-        self.__refresh_source()
+        self._refresh_source()
         if new_fit is not None:
             new_fit._subscribe(self, (RefreshSource,))
 
+    def _clone(self):
+        """
+        Make copy of the holder which is not assigned to any fit,
+        with the same type and effect statuses. Overridden
+        attribute values are not copied.
+
+        Return value:
+        New holder
+        """
+        holder = type(self)(self._type_id)
+        holder.__disabled_effects.update(self.__disabled_effects)
+        return holder
+
     # Effect methods
     @property
     def _effect_data(self):
@@ -187,7 +201,7 @@ class HolderBase(BaseSubscriber):
 
     # Message handling
     def _handle_refresh_source(self, message):
-        self.__refresh_source()
+        self._refresh_source()
 
     _handler_map = {
         RefreshSource: _handle_refresh_source
@@ -200,8 +214,8 @@ class HolderBase(BaseSubscriber):
             return
         handler(self, message)
 
-    # Private methods for message handlers
-    def __refresh_source(self):
+    # Auxiliary methods
+    def _refresh_source(self):
         """
         Each time holder's context is changed (the source it relies on,
         which may change when holder switches fit or its fit switches
@@ -54,6 +54,7 @@ class MutableStateMixin(HolderBase):
 
     Cooperative methods:
     __init__
+    _clone
     """
 
     def __init__(self, state, **kwargs):
@@ -75,3 +76,8 @@ class MutableStateMixin(HolderBase):
         if fit is not None:
             fit._publish(HolderStateChanged(self, old_state, new_state))
         self.__state = new_state
+
+    def _clone(self):
+        holder = super()._clone()
+        holder.__state = self.__state
+        return holder
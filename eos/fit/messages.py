@@ -26,13 +26,19 @@ __all__ = [
     'HolderAdded',
     'HolderRemoved',
     'HolderStateChanged',
+    'ProfileSkillsAdded',
+    'ProfileSkillsRemoved',
     'EffectsEnabled',
     'EffectsDisabled',
     'AttrValueChanged',
     'AttrValueChangedOverride',
     'EnableServices',
     'DisableServices',
-    'RefreshSource'
+    'RefreshSource',
+    'EnableHolders',
+    'DisableHolders',
+    'StartBatch',
+    'CommitBatch'
 ]
 
 
@@ -42,6 +48,8 @@ HolderRemoved = namedtuple('HolderRemoved', ('holder',))
 HolderStateChanged = namedtuple('HolderStateChanged', ('holder', 'old', 'new'))
 EffectsEnabled = namedtuple('EffectsEnabled', ('holder', 'effects'))
 EffectsDisabled = namedtuple('EffectsDisabled', ('holder', 'effects'))
+ProfileSkillsAdded = namedtuple('ProfileSkillsAdded', ('holders',))
+ProfileSkillsRemoved = namedtuple('ProfileSkillsRemoved', ('holders',))
 # Attribute-related
 AttrValueChanged = namedtuple('AttrValueChanged', ('holder', 'attr'))
 AttrValueChangedOverride = namedtuple('AttrValueChangedOverride', ('holder', 'attr'))
@@ -49,3 +57,7 @@ AttrValueChangedOverride = namedtuple('AttrValueChangedOverride', ('holder', 'at
 EnableServices = namedtuple('EnableServices', ('holders',))
 DisableServices = namedtuple('DisableServices', ('holders',))
 RefreshSource = namedtuple('RefreshSource', ())
+EnableHolders = namedtuple('EnableHolders', ('holders',))
+DisableHolders = namedtuple('DisableHolders', ('holders',))
+StartBatch = namedtuple('StartBatch', ())
+CommitBatch = namedtuple('CommitBatch', ())
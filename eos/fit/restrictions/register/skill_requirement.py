@@ -38,8 +38,8 @@ class SkillRequirementRegister(RestrictionRegister):
     To use holder, all its skill requirements must be met.
 
     Details:
-    Only holders located within fit.skills container are able to
-    satisfy skill requirements.
+    Only holders located within fit.skills container and skills
+    from fit skill profile are able to satisfy skill requirements.
     Original item attributes are taken to determine skill and
     skill level requirements.
     If corresponding skill is found, but its skill level is None,
@@ -76,7 +76,7 @@ class SkillRequirementRegister(RestrictionRegister):
                 try:
                     skill_level = self._fit.skills[required_skill_id].level
                 except KeyError:
-                    skill_level = None
+                    skill_level = self.__get_profile_level(required_skill_id)
                 # Last check - if skill level is lower than expected, current holder
                 # is tainted; mark it so and move to the next one
                 if skill_level is None or skill_level < required_skill_level:
@@ -91,6 +91,13 @@ class SkillRequirementRegister(RestrictionRegister):
         if tainted_holders:
             raise RegisterValidationError(tainted_holders)
 
+    def __get_profile_level(self, skill_id):
+        """Get skill level from fit skill profile, or None if it's not there"""
+        skill_profile = self._fit.skill_profile
+        if skill_profile is None:
+            return None
+        return skill_profile.get(skill_id)
+
     @property
     def restriction_type(self):
         return Restriction.skill_requirement
@@ -22,7 +22,9 @@
 from itertools import chain
 
 from eos.const.eos import State
-from eos.fit.messages import HolderAdded, HolderRemoved, HolderStateChanged, EnableServices, DisableServices
+from eos.fit.messages import (
+    HolderAdded, HolderRemoved, HolderStateChanged, EnableServices, DisableServices, EnableHolders, DisableHolders
+)
 from eos.util.pubsub import BaseSubscriber
 from .exception import RegisterValidationError, ValidationError
 from .register import *
@@ -173,12 +175,33 @@ class RestrictionService(BaseSubscriber):
             self.__remove_holder(holder)
         self.__enabled = False
 
+    def _handle_holders_enabling(self, message):
+        """
+        Register holders whose source data has been refreshed.
+        """
+        if not self.__enabled:
+            return
+        for holder in message.holders:
+            self.__add_holder(holder)
+
+    def _handle_holders_disabling(self, message):
+        """
+        Unregister holders whose source data is about to be
+        refreshed, keeping the service enabled.
+        """
+        if not self.__enabled:
+            return
+        for holder in message.holders:
+            self.__remove_holder(holder)
+
     _handler_map = {
         HolderAdded: _handle_holder_addition,
         HolderRemoved: _handle_holder_removal,
         HolderStateChanged: _handle_holder_state_change,
         EnableServices: _handle_enable_services,
-        DisableServices: _handle_disable_services
+        DisableServices: _handle_disable_services,
+        EnableHolders: _handle_holders_enabling,
+        DisableHolders: _handle_holders_disabling
     }
 
     def _notify(self, message):
@@ -0,0 +1,233 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from array import array
+from bisect import bisect_left
+
+from threading import Lock
+from weakref import WeakKeyDictionary, ref
+
+from eos.const.eos import Domain, State
+from eos.const.eve import Attribute
+from eos.util.pubsub import MessageBroker
+from eos.util.repr import make_repr_str
+from .calculator import CalculationService, MutableAttributeMap
+from .messages import EnableHolders, EnableServices
+
+
+class SkillProfile:
+    """
+    Compact read-only map of skill levels, which can be shared
+    between multiple fits. Type IDs and levels are stored in two
+    parallel arrays, sorted by type ID. Skills which apply levels
+    to fits are created once per source and shared by all fits
+    which use the profile; they are kept while cache handler of
+    the source is alive.
+
+    Optional arguments:
+    levels -- map in {skill type ID: skill level} format, or iterable
+    with (skill type ID, skill level) pairs
+
+    Possible exceptions:
+    ValueError -- raised when skill level is out of 0..5 range
+    """
+
+    def __init__(self, levels=()):
+        if hasattr(levels, 'items'):
+            levels = levels.items()
+        # Format: {skill type ID: skill level}
+        level_map = {}
+        for type_id, level in levels:
+            level = int(level)
+            if not 0 <= level <= 5:
+                raise ValueError('skill {} has invalid level {}'.format(type_id, level))
+            level_map[type_id] = level
+        entries = sorted(level_map.items())
+        self.__type_ids = array('l', (type_id for type_id, _ in entries))
+        self.__levels = array('b', (level for _, level in entries))
+        # Skills generated from the profile for cache handler
+        # of each source
+        # Format: {cache handler: {skill type ID: profile skill}}
+        self.__skills = WeakKeyDictionary()
+        self.__skills_lock = Lock()
+
+    def __find(self, type_id):
+        """Return index of type ID in storage, or None if it's not there"""
+        type_ids = self.__type_ids
+        index = bisect_left(type_ids, type_id)
+        if index < len(type_ids) and type_ids[index] == type_id:
+            return index
+        return None
+
+    def __getitem__(self, type_id):
+        index = self.__find(type_id)
+        if index is None:
+            raise KeyError(type_id)
+        return self.__levels[index]
+
+    def get(self, type_id, default=None):
+        index = self.__find(type_id)
+        if index is None:
+            return default
+        return self.__levels[index]
+
+    def __contains__(self, type_id):
+        return self.__find(type_id) is not None
+
+    def __iter__(self):
+        return iter(self.__type_ids)
+
+    def __len__(self):
+        return len(self.__type_ids)
+
+    def items(self):
+        return zip(self.__type_ids, self.__levels)
+
+    def _get_skills(self, source):
+        """
+        Get skills which apply levels of this profile, with
+        data taken from passed source. Skills are created on
+        first request and then shared by all fits.
+
+        Required arguments:
+        source -- source to take skill data from
+
+        Return value:
+        Map in {skill type ID: profile skill} format
+        """
+        cache_handler = source.cache_handler
+        skills = self.__skills.get(cache_handler)
+        if skills is not None:
+            return skills
+        with self.__skills_lock:
+            skills = self.__skills.get(cache_handler)
+            if skills is None:
+                context = ProfileSkillContext(cache_handler)
+                skills = self.__skills[cache_handler] = context.add_skills(self.items())
+        return skills
+
+    def __repr__(self):
+        return '<SkillProfile(skills={})>'.format(len(self))
+
+
+class ProfileSkillContext(MessageBroker):
+    """
+    Minimal environment in which attributes of profile skills are
+    calculated. Skills are not modified by anything besides their own
+    and each other's effects, thus their values do not depend on fit
+    and are calculated once, when skills are added.
+
+    Required arguments:
+    cache_handler -- cache handler to take skill data from
+    """
+
+    def __init__(self, cache_handler):
+        MessageBroker.__init__(self)
+        # Skill profile keeps context while cache handler is
+        # alive, thus context must not keep it alive itself
+        self.__cache_handler = ref(cache_handler)
+        self.ship = None
+        self.character = None
+        self._calculator = CalculationService(self)
+        self._publish(EnableServices(()))
+
+    @property
+    def source(self):
+        """
+        Context serves as source for its skills, giving
+        calculator access to cache handler.
+        """
+        return self
+
+    @property
+    def cache_handler(self):
+        return self.__cache_handler()
+
+    def add_skills(self, levels):
+        """
+        Create skills with passed levels and calculate
+        their attributes.
+
+        Required arguments:
+        levels -- iterable with (skill type ID, skill level) pairs
+
+        Return value:
+        Map in {skill type ID: profile skill} format
+        """
+        get_type = self.source.cache_handler.get_type
+        # Format: {skill type ID: profile skill}
+        skills = {}
+        for type_id, level in levels:
+            skills[type_id] = ProfileSkill(type_id, level, self, get_type(type_id))
+        # Unlike fits, context registers skills as regular holders
+        self._publish(EnableHolders(tuple(skills.values())))
+        # Calculate everything right away, so that fits which use
+        # the skills from different threads only read values
+        self._calculator.materialize()
+        return skills
+
+
+class ProfileSkill:
+    """
+    Lightweight skill representation used by fit to apply skills
+    from skill profile. Unlike regular holders, these are not
+    subscribed to fit messages, and fit handles them in bulk.
+    Attributes of the skill are calculated in profile skill context,
+    which is shared by all fits using the skill.
+
+    Required arguments:
+    type_id -- type ID of skill
+    level -- level of skill
+    context -- profile skill context the skill belongs to
+    item -- item with skill data
+    """
+
+    __slots__ = ('_type_id', '_fit', 'item', 'attributes', '__weakref__')
+
+    def __init__(self, type_id, level, context, item):
+        self._type_id = type_id
+        # Skill joins context only after its level is set, as
+        # attribute map reports overrides to fit holder belongs to
+        self._fit = None
+        self.item = item
+        self.attributes = MutableAttributeMap(self)
+        self.attributes._override_set(Attribute.skill_level, level, persist=True)
+        self._fit = context
+
+    @property
+    def level(self):
+        return self.attributes.get(Attribute.skill_level)
+
+    @property
+    def state(self):
+        return State.offline
+
+    @property
+    def _domain(self):
+        return Domain.character
+
+    @property
+    def _enabled_effects(self):
+        return set(e.id for e in self.item.effects)
+
+    def __repr__(self):
+        spec = [['type_id', '_type_id'], 'level']
+        return make_repr_str(self, spec)
@@ -0,0 +1,127 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from operator import attrgetter
+
+from eos.data.cache_handler.exception import TypeFetchError, AttributeFetchError
+
+
+# Getters of data which influences calculation results
+# and other source-dependent data of holders
+_get_type_data = attrgetter('id', 'group', 'category', 'attributes')
+_get_effect_data = attrgetter(
+    'id', 'category', 'is_offensive', 'is_assistance', 'duration_attribute', 'discharge_attribute',
+    'range_attribute', 'falloff_attribute', 'tracking_speed_attribute', 'fitting_usage_chance_attribute',
+    'build_status'
+)
+_get_modifier_data = attrgetter(
+    'state', 'scope', 'src_attr', 'operator', 'tgt_attr', 'domain', 'filter_type', 'filter_value')
+_get_attribute_data = attrgetter('max_attribute', 'default_value', 'high_is_good', 'stackable')
+
+
+class SourceDiff:
+    """
+    Compare data of two sources. Used on fit source switch,
+    to refresh only holders whose data differs between sources.
+
+    Required arguments:
+    old_source -- source which is currently used
+    new_source -- source which is going to be used
+    """
+
+    def __init__(self, old_source, new_source):
+        self.__old_handler = old_source.cache_handler
+        self.__new_handler = new_source.cache_handler
+        # Format: {type ID: flag}
+        self.__type_changes = {}
+
+    def type_changed(self, type_id):
+        """
+        Check if type data differs between sources. Type effects
+        and their modifiers are compared too.
+
+        Required arguments:
+        type_id -- ID of type to check
+
+        Return value:
+        True if data differs or can't be fetched from
+        any of sources, else False
+        """
+        try:
+            return self.__type_changes[type_id]
+        except KeyError:
+            pass
+        try:
+            old_type = self.__old_handler.get_type(type_id)
+            new_type = self.__new_handler.get_type(type_id)
+        except TypeFetchError:
+            changed = True
+        else:
+            changed = not self.__types_equal(old_type, new_type)
+        self.__type_changes[type_id] = changed
+        return changed
+
+    def attributes_changed(self, attr_ids):
+        """
+        Check if metadata of any of attributes differs between
+        sources. Attribute metadata is used in calculation of
+        attribute value, thus if it differs, values calculated
+        with old source are not valid.
+
+        Required arguments:
+        attr_ids -- iterable with IDs of attributes to check
+
+        Return value:
+        True if metadata of at least one attribute differs
+        or can't be fetched from any of sources, else False
+        """
+        for attr_id in attr_ids:
+            try:
+                old_attr = self.__old_handler.get_attribute(attr_id)
+                new_attr = self.__new_handler.get_attribute(attr_id)
+            except AttributeFetchError:
+                return True
+            if old_attr is not new_attr and _get_attribute_data(old_attr) != _get_attribute_data(new_attr):
+                return True
+        return False
+
+    def __types_equal(self, old_type, new_type):
+        if old_type is new_type:
+            return True
+        return (
+            _get_type_data(old_type) == _get_type_data(new_type) and
+            self.__effects_equal(old_type.default_effect, new_type.default_effect) and
+            len(old_type.effects) == len(new_type.effects) and
+            all(map(self.__effects_equal, old_type.effects, new_type.effects))
+        )
+
+    @staticmethod
+    def __effects_equal(old_effect, new_effect):
+        if old_effect is new_effect:
+            return True
+        if old_effect is None or new_effect is None:
+            return False
+        return (
+            _get_effect_data(old_effect) == _get_effect_data(new_effect) and
+            len(old_effect.modifiers) == len(new_effect.modifiers) and
+            all(_get_modifier_data(old) == _get_modifier_data(new)
+                for old, new in zip(old_effect.modifiers, new_effect.modifiers))
+        )
@@ -23,7 +23,9 @@ import math
 
 from eos.const.eos import State
 from eos.const.eve import Attribute
-from eos.fit.messages import HolderAdded, HolderRemoved, HolderStateChanged, EnableServices, DisableServices
+from eos.fit.messages import (
+    HolderAdded, HolderRemoved, HolderStateChanged, EnableServices, DisableServices, EnableHolders, DisableHolders
+)
 from eos.fit.tuples import DamageTypes, TankingLayers, TankingLayersTotal
 from eos.util.pubsub import BaseSubscriber
 from eos.util.volatile_cache import InheritableVolatileMixin, VolatileProperty
@@ -106,6 +108,15 @@ class StatService(InheritableVolatileMixin, BaseSubscriber):
             self.launcher_slots,
             self.launched_drones
         )
+        # Containers relying on registers which take holder state into
+        # account; their data changes without changes of attribute values
+        # Format: (container,)
+        self.__stateful_containers = (
+            self.cpu,
+            self.powergrid,
+            self.drone_bandwidth,
+            self.launched_drones
+        )
         fit._subscribe(self, self._handler_map.keys())
 
     @VolatileProperty
@@ -273,6 +284,8 @@ class StatService(InheritableVolatileMixin, BaseSubscriber):
         elif new_state < old_state:
             states = set(filter(lambda s: new_state < s <= old_state, State))
             self.__disable_states(holder, states)
+        for container in self.__stateful_containers:
+            container._clear_volatile_attrs()
 
     def _handle_enable_services(self, message):
         """
@@ -290,12 +303,33 @@ class StatService(InheritableVolatileMixin, BaseSubscriber):
         for holder in message.holders:
             self.__remove_holder(holder)
 
+    def _handle_holders_enabling(self, message):
+        """
+        Register holders whose source data has been refreshed.
+        """
+        if not self.__enabled:
+            return
+        for holder in message.holders:
+            self.__add_holder(holder)
+
+    def _handle_holders_disabling(self, message):
+        """
+        Unregister holders whose source data is about to be
+        refreshed, keeping the service enabled.
+        """
+        if not self.__enabled:
+            return
+        for holder in message.holders:
+            self.__remove_holder(holder)
+
     _handler_map = {
         HolderAdded: _handle_holder_addition,
         HolderRemoved: _handle_holder_removal,
         HolderStateChanged: _handle_holder_state_change,
         EnableServices: _handle_enable_services,
-        DisableServices: _handle_disable_services
+        DisableServices: _handle_disable_services,
+        EnableHolders: _handle_holders_enabling,
+        DisableHolders: _handle_holders_disabling
     }
 
     def _notify(self, message):
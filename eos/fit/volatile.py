@@ -20,17 +20,24 @@
 
 
 from .messages import (
-    HolderAdded, HolderRemoved, HolderStateChanged, EffectsEnabled, EffectsDisabled,
-    AttrValueChangedOverride, RefreshSource
+    HolderAdded, HolderRemoved, HolderStateChanged, EffectsEnabled, EffectsDisabled, RefreshSource,
+    EnableHolders, StartBatch, CommitBatch
 )
+from eos.util.pubsub import BaseSubscriber
 from eos.util.volatile_cache import InheritableVolatileMixin, CooperativeVolatileMixin
 
 
-class FitVolatileManager:
+class FitVolatileManager(BaseSubscriber):
     """
     Class which tracks on-fit objects with volatile
     data and clears this data when requested.
 
+    Volatile properties check attribute values they have read on
+    each access, thus changes of attribute values do not need to
+    be handled here. Data is cleared on changes of fit structure
+    and source, which volatile properties cannot track; changes of
+    holder state and effects clear data of changed holder only.
+
     Required arguments:
     msg_broker -- object which handles message publication
     and subscriptions
@@ -43,6 +50,10 @@ class FitVolatileManager:
     def __init__(self, msg_broker, volatiles=()):
         self.__msg_broker = msg_broker
         self.__volatile_objects = set()
+        # When batch is in progress, volatile data is cleared only
+        # once on commit. None means that there's no batch, else
+        # it's flag which tells if clear is needed on commit
+        self.__batch_clear_needed = None
         msg_broker._subscribe(self, self._handler_map.keys())
         for volatile in volatiles:
             self.__add_volatile_object(volatile)
@@ -56,17 +67,33 @@ class FitVolatileManager:
         self.__clear_volatile_attrs()
         self.__remove_volatile_object(message.holder)
 
+    def _handle_holder_changes(self, message):
+        holder = message.holder
+        if holder in self.__volatile_objects:
+            holder._clear_volatile_attrs()
+
     def _handle_other_changes(self, _):
         self.__clear_volatile_attrs()
 
+    def _handle_start_batch(self, _):
+        self.__batch_clear_needed = False
+
+    def _handle_commit_batch(self, _):
+        clear_needed = self.__batch_clear_needed
+        self.__batch_clear_needed = None
+        if clear_needed:
+            self.__clear_volatile_attrs()
+
     _handler_map = {
         HolderAdded: _handle_holder_addition,
         HolderRemoved: _handle_holder_removal,
-        HolderStateChanged: _handle_other_changes,
-        EffectsEnabled: _handle_other_changes,
-        EffectsDisabled: _handle_other_changes,
-        AttrValueChangedOverride: _handle_other_changes,
-        RefreshSource: _handle_other_changes
+        HolderStateChanged: _handle_holder_changes,
+        EffectsEnabled: _handle_holder_changes,
+        EffectsDisabled: _handle_holder_changes,
+        RefreshSource: _handle_other_changes,
+        EnableHolders: _handle_other_changes,
+        StartBatch: _handle_start_batch,
+        CommitBatch: _handle_commit_batch
     }
 
     def _notify(self, message):
@@ -89,6 +116,11 @@ class FitVolatileManager:
         """
         Remove passed object from internal storage
         """
+        # If we're in the middle of batch, make sure that object
+        # doesn't leave fit with stale data, as it won't receive
+        # cleanup on commit
+        if self.__batch_clear_needed is not None and object in self.__volatile_objects:
+            object._clear_volatile_attrs()
         self.__volatile_objects.discard(object)
 
     def __clear_volatile_attrs(self):
@@ -96,5 +128,9 @@ class FitVolatileManager:
         Go through objects in internal storage and clear
         volatile attribs stored on them.
         """
+        # During batch, just mark that cleanup is needed
+        if self.__batch_clear_needed is not None:
+            self.__batch_clear_needed = True
+            return
         for volatile in self.__volatile_objects:
             volatile._clear_volatile_attrs()
@@ -0,0 +1,102 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from collections import OrderedDict, namedtuple
+from weakref import WeakValueDictionary
+
+
+ObjectCacheStats = namedtuple('ObjectCacheStats', ('strong_hits', 'weak_hits', 'misses', 'evictions', 'strong_size'))
+
+
+class ObjectCache:
+    """
+    Two-tier object cache. Recently used objects are kept in
+    strong LRU tier of limited size, which keeps them alive even
+    when nothing else references them; objects evicted from it
+    stay accessible via weakref tier while they are in use.
+
+    Optional arguments:
+    strong_size -- maximum amount of objects kept in strong
+    tier; when 0, only weakref tier is used (default 0)
+    """
+
+    def __init__(self, strong_size=0):
+        self.__strong_size = strong_size
+        self.__strong = OrderedDict()
+        self.__weak = WeakValueDictionary()
+        self.__strong_hits = 0
+        self.__weak_hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __getitem__(self, key):
+        strong = self.__strong
+        try:
+            obj = strong[key]
+        except KeyError:
+            pass
+        else:
+            strong.move_to_end(key)
+            self.__strong_hits += 1
+            return obj
+        try:
+            obj = self.__weak[key]
+        except KeyError:
+            self.__misses += 1
+            raise
+        self.__weak_hits += 1
+        self.__put_strong(key, obj)
+        return obj
+
+    def __setitem__(self, key, obj):
+        self.__weak[key] = obj
+        self.__put_strong(key, obj)
+
+    def clear(self):
+        """Remove all objects from both tiers, keeping counters."""
+        self.__strong.clear()
+        self.__weak.clear()
+
+    @property
+    def stats(self):
+        """
+        Return ObjectCacheStats with amount of hits in strong
+        and weakref tiers, misses, strong tier evictions and
+        current strong tier size.
+        """
+        return ObjectCacheStats(
+            strong_hits=self.__strong_hits,
+            weak_hits=self.__weak_hits,
+            misses=self.__misses,
+            evictions=self.__evictions,
+            strong_size=len(self.__strong)
+        )
+
+    def __put_strong(self, key, obj):
+        """Put object into strong tier, evicting least recently used ones."""
+        if self.__strong_size <= 0:
+            return
+        strong = self.__strong
+        strong[key] = obj
+        strong.move_to_end(key)
+        while len(strong) > self.__strong_size:
+            strong.popitem(last=False)
+            self.__evictions += 1
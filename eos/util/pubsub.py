@@ -24,46 +24,271 @@ Implementation of publish-subscribe pattern.
 """
 
 
+import json
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from time import perf_counter
+from types import MethodType
 
 
 class MessageBroker:
     """
     Manages subscriptions and dispatches received
     publications according to active subscriptions.
+
+    Subscribers receive messages in order of subscription. For each
+    message type, handlers of all subscribers are compiled into tuple
+    on first publication, and reused until subscriptions to this
+    message type change.
     """
 
     def __init__(self):
-        # Format: {event class: subscribers}
+        # Format: {message class: {subscriber: None}}
         self.__subscribers = {}
+        # Format: {message class: (handlers,)}
+        self.__dispatch = {}
+        # Tracer which receives data about handler calls,
+        # None when tracing is disabled
+        self.__tracer = None
+
+    @property
+    def tracer(self):
+        """
+        Tracer which collects data about message delivery,
+        or None if tracing is disabled.
+        """
+        return self.__tracer
+
+    def enable_tracing(self, tracer=None):
+        """
+        Start recording time spent by each subscriber on handling each
+        message type. When tracing is disabled, it doesn't slow down
+        message delivery.
+
+        Optional arguments:
+        tracer -- tracer to use, if not specified, new tracer is created
+
+        Return value:
+        Tracer which is used
+        """
+        if tracer is None:
+            tracer = MessageTracer()
+        self.__tracer = tracer
+        self.__dispatch.clear()
+        return tracer
+
+    def disable_tracing(self):
+        """
+        Stop recording data about message delivery.
+
+        Return value:
+        Tracer which has been used, or None
+        """
+        tracer = self.__tracer
+        self.__tracer = None
+        self.__dispatch.clear()
+        return tracer
 
     def _subscribe(self, subscriber, message_types):
         """
         Register subscriber for passed message types.
         """
         for message_type in message_types:
-            subscribers = self.__subscribers.setdefault(message_type, set())
-            subscribers.add(subscriber)
+            subscribers = self.__subscribers.get(message_type)
+            if subscribers is None:
+                subscribers = self.__subscribers[message_type] = OrderedDict()
+            subscribers[subscriber] = None
+            self.__dispatch.pop(message_type, None)
 
     def _unsubscribe(self, subscriber, message_types):
         """
         Unregister subscriber from passed message types.
         """
         for message_type in message_types:
-            try:
-                subscribers = self.__subscribers[message_type]
-            except KeyError:
+            subscribers = self.__subscribers.get(message_type)
+            if subscribers is None or subscriber not in subscribers:
                 continue
-            subscribers.discard(subscriber)
+            del subscribers[subscriber]
+            if not subscribers:
+                del self.__subscribers[message_type]
+            self.__dispatch.pop(message_type, None)
+
+    def _refresh_subscriber(self, subscriber):
+        """
+        Compile handlers of subscriber again, e.g. when
+        it starts processing messages differently.
+        """
+        for message_type, subscribers in self.__subscribers.items():
+            if subscriber in subscribers:
+                self.__dispatch.pop(message_type, None)
 
     def _publish(self, message):
         """
         Publish message and make sure that all
         interested subscribers are notified.
         """
-        subscribers = self.__subscribers.get(type(message), ())
-        for subscriber in subscribers:
-            subscriber._notify(message)
+        try:
+            handlers = self.__dispatch[type(message)]
+        except KeyError:
+            handlers = self.__compile(type(message))
+        for handler in handlers:
+            handler(message)
+
+    def _publish_many(self, messages):
+        """
+        Publish multiple messages in passed order.
+        """
+        dispatch = self.__dispatch
+        for message in messages:
+            try:
+                handlers = dispatch[type(message)]
+            except KeyError:
+                handlers = self.__compile(type(message))
+            for handler in handlers:
+                handler(message)
+
+    def __compile(self, message_type):
+        """
+        Compose tuple of handlers of all subscribers
+        for messages of passed type.
+        """
+        tracer = self.__tracer
+        handlers = []
+        for subscriber in self.__subscribers.get(message_type, ()):
+            if isinstance(subscriber, BaseSubscriber):
+                handler = subscriber._get_handler(message_type)
+            else:
+                handler = subscriber._notify
+            if handler is None:
+                continue
+            if tracer is not None:
+                handler = tracer.wrap(handler, message_type, subscriber)
+            handlers.append(handler)
+        handlers = self.__dispatch[message_type] = tuple(handlers)
+        return handlers
+
+
+class MessageTracer:
+    """
+    Record deliveries of messages to subscribers: per message type and
+    subscriber class, amount of deliveries, cumulative and maximum time
+    spent in handler, and maximum nesting depth, i.e. amount of handlers
+    which were running when message was delivered. Handler time includes
+    time spent on handling messages published from inside of it.
+
+    Optional arguments:
+    timeline -- when True, every delivery is recorded for export in
+    Chrome trace format (default True)
+    """
+
+    def __init__(self, timeline=True):
+        self.__timeline = timeline
+        self.reset()
+
+    def reset(self):
+        """Forget all recorded data."""
+        # Format: {(message class name, subscriber class name):
+        #   [deliveries, total time, max time, max depth]}
+        self.__stats = OrderedDict()
+        # Format: [(message class name, subscriber class name, start, duration, depth)]
+        self.__events = []
+        self.__depth = 0
+        self.__start = perf_counter()
+
+    def wrap(self, handler, message_type, subscriber):
+        """
+        Make handler which records its calls.
+
+        Required arguments:
+        handler -- callable which handles message
+        message_type -- class of messages handler receives
+        subscriber -- subscriber, on behalf of which handler works
+
+        Return value:
+        Callable which accepts message
+        """
+        key = (message_type.__name__, type(subscriber).__name__)
+
+        def traced_handler(message):
+            depth = self.__depth
+            self.__depth = depth + 1
+            start = perf_counter()
+            try:
+                handler(message)
+            finally:
+                duration = perf_counter() - start
+                self.__depth = depth
+                self.__record(key, start, duration, depth)
+
+        return traced_handler
+
+    def __record(self, key, start, duration, depth):
+        try:
+            stats = self.__stats[key]
+        except KeyError:
+            stats = self.__stats[key] = [0, 0, 0, 0]
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+        stats[3] = max(stats[3], depth)
+        if self.__timeline:
+            self.__events.append((key[0], key[1], start, duration, depth))
+
+    def summary(self):
+        """
+        Get recorded data, most time consuming entries first.
+
+        Return value:
+        List with (message class name, subscriber class name, deliveries,
+        total time, max time, max depth) tuples, times are in seconds
+        """
+        rows = [key + tuple(stats) for key, stats in self.__stats.items()]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+    def format_summary(self):
+        """
+        Get recorded data as text table.
+
+        Return value:
+        String with table
+        """
+        header = ('message', 'subscriber', 'deliveries', 'total ms', 'max ms', 'max depth')
+        rows = [header]
+        for message_name, subscriber_name, deliveries, total, max_time, max_depth in self.summary():
+            rows.append((
+                message_name, subscriber_name, str(deliveries), '{:.3f}'.format(total * 1000),
+                '{:.3f}'.format(max_time * 1000), str(max_depth)))
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = []
+        for row in rows:
+            lines.append('  '.join(
+                cell.ljust(width) if i < 2 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))).rstrip())
+        return '\n'.join(lines)
+
+    def to_chrome_trace(self):
+        """
+        Get recorded deliveries as JSON in Chrome trace event format,
+        which can be loaded into chrome://tracing or similar tools.
+
+        Return value:
+        String with JSON
+        """
+        events = []
+        for message_name, subscriber_name, start, duration, depth in self.__events:
+            events.append({
+                'name': '{} -> {}'.format(message_name, subscriber_name),
+                'cat': message_name,
+                'ph': 'X',
+                'ts': (start - self.__start) * 1000000,
+                'dur': duration * 1000000,
+                'pid': 1,
+                'tid': 1,
+                'args': {'subscriber': subscriber_name, 'depth': depth}
+            })
+        events.sort(key=lambda event: event['ts'])
+        return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'})
 
 
 class BaseSubscriber(metaclass=ABCMeta):
@@ -75,3 +300,28 @@ class BaseSubscriber(metaclass=ABCMeta):
     @abstractmethod
     def _notify(self, message):
         ...
+
+    def _get_handler(self, message_type):
+        """
+        Get callable which processes messages of passed type on
+        behalf of subscriber. When subscriber defines _handler_map
+        in {message class: method} format, its methods are used
+        directly, else all messages are passed to _notify. Subscribers
+        which do more than call handler from map in _notify should
+        override this method.
+
+        Required arguments:
+        message_type -- class of message
+
+        Return value:
+        Callable which accepts message, or None
+        if messages of this type are ignored
+        """
+        handler_map = getattr(self, '_handler_map', None)
+        if handler_map is None:
+            return self._notify
+        try:
+            handler = handler_map[message_type]
+        except KeyError:
+            return None
+        return MethodType(handler, self)
@@ -19,25 +19,154 @@
 # ===============================================================================
 
 
+from threading import local
+
+
+class InputFrames(local):
+    """
+    Inputs read by volatile properties which are being calculated, kept
+    separately for each thread. Frames are stacked, innermost last. When
+    value is read on behalf of something else than volatile property
+    (e.g. attribute calculation), None is put on top. Sources of values
+    add what they provide to topmost frame; source should provide
+    _get_stored(key, default) method, which returns current value without
+    calculating it, or default if value is not available, and
+    _volatile_clock attribute with clock which source advances when any
+    value it provides changes, or None if source doesn't have clock.
+    """
+
+    def __init__(self):
+        # Format: [InputFrame or None]
+        self.stack = []
+
+
+input_frames = InputFrames()
+
+
+# Marks value which was not available when it was read
+NO_VALUE = object()
+
+
+class VolatileClock:
+    """
+    Counter of changes of values provided by sources, which
+    allows to use cached values of volatile properties without
+    checking all their inputs.
+    """
+
+    __slots__ = ('generation',)
+
+    def __init__(self):
+        self.generation = 0
+
+    def advance(self):
+        self.generation += 1
+
+
+class InputFrame:
+    """
+    Inputs read by volatile property which is being calculated,
+    along with generations of clocks of their sources.
+    """
+
+    __slots__ = ('inputs', 'clocks')
+
+    def __init__(self):
+        # Format: [(source, key, value)]
+        self.inputs = []
+        # Generation of each clock is taken when the first
+        # input from source with this clock is read
+        # Format: {clock: generation}
+        self.clocks = {}
+
+    def add(self, source, key, value):
+        self.inputs.append((source, key, value))
+        clock = source._volatile_clock
+        if clock not in self.clocks:
+            self.clocks[clock] = clock.generation if clock is not None else None
+
+    def extend(self, inputs, clocks):
+        self.inputs.extend(inputs)
+        for clock, generation in clocks:
+            self.clocks.setdefault(clock, generation)
+
+
 class VolatileProperty:
     """
-    Caches attribute on instance and adds note
-    about it to special set, which should be added
-    by VolatileMixin.
+    Caches attribute on instance in special dictionary, which should be
+    added by VolatileMixin, along with values it has read while being
+    calculated. Cached value is used only while all these inputs keep
+    their values, else it is calculated again. Inputs are checked only
+    when clocks of their sources have been advanced since the last check,
+    thus reading cached value does not depend on amount of inputs.
     """
 
     def __init__(self, method):
         self.__method = method
+        self.__name = method.__name__
 
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        value = self.__method(instance)
-        name = self.__method.__name__
-        setattr(instance, name, value)
-        instance._volatile_attrs.add(name)
+        name = self.__name
+        cache = instance._volatile_attrs
+        try:
+            value, inputs, clocks = cache[name]
+        except KeyError:
+            pass
+        else:
+            for clock, generation in clocks:
+                if clock is None or clock.generation != generation:
+                    clocks = self.__check_inputs(inputs)
+                    if clocks is not None:
+                        cache[name] = (value, inputs, clocks)
+                    break
+            if clocks is not None:
+                self.__add_inputs(inputs, clocks)
+                return value
+        frames = input_frames.stack
+        frame = InputFrame()
+        frames.append(frame)
+        try:
+            value = self.__method(instance)
+        finally:
+            frames.pop()
+        inputs = tuple(frame.inputs)
+        clocks = tuple(frame.clocks.items())
+        cache[name] = (value, inputs, clocks)
+        self.__add_inputs(inputs, clocks)
         return value
 
+    @staticmethod
+    def __check_inputs(inputs):
+        """
+        Check if inputs still have the same values.
+
+        Return value:
+        Current generations of clocks of input sources in
+        ((clock, generation),) format, or None if any input
+        has changed
+        """
+        # Format: {clock: generation}
+        clocks = {}
+        for source, key, input_value in inputs:
+            if source._get_stored(key, NO_VALUE) != input_value:
+                return None
+            clock = source._volatile_clock
+            if clock not in clocks:
+                clocks[clock] = clock.generation if clock is not None else None
+        return tuple(clocks.items())
+
+    @staticmethod
+    def __add_inputs(inputs, clocks):
+        """
+        Make volatile property which is being calculated
+        rely on passed inputs as well.
+        """
+        frames = input_frames.stack
+        if frames and frames[-1] is not None:
+            frames[-1].extend(inputs, clocks)
+
 
 class InheritableVolatileMixin:
     """
@@ -48,18 +177,14 @@ class InheritableVolatileMixin:
     """
 
     def __init__(self):
-        self._volatile_attrs = set()
+        # Format: {attribute name: (value, inputs, clocks)}
+        self._volatile_attrs = {}
 
     def _clear_volatile_attrs(self):
         """
         Remove all the cached values which were
         stored since the last cleanup.
         """
-        for attr_name in self._volatile_attrs:
-            try:
-                delattr(self, attr_name)
-            except AttributeError:
-                pass
         self._volatile_attrs.clear()
 
 
@@ -76,7 +201,8 @@ class CooperativeVolatileMixin:
     """
 
     def __init__(self, **kwargs):
-        self._volatile_attrs = set()
+        # Format: {attribute name: (value, inputs, clocks)}
+        self._volatile_attrs = {}
         super().__init__(**kwargs)
 
     def _clear_volatile_attrs(self):
@@ -87,11 +213,6 @@ class CooperativeVolatileMixin:
         Attempt to call next method in MRO, do nothing
         on failure to find it.
         """
-        for attr_name in self._volatile_attrs:
-            try:
-                delattr(self, attr_name)
-            except AttributeError:
-                pass
         self._volatile_attrs.clear()
         # Attempt to call next implementation
         next_in_mro = super()
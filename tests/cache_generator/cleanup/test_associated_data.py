@@ -264,3 +264,53 @@ class TestAssociatedData(GeneratorTestCase):
         self.assertEqual(len(expressions), 1)
         expression_ids = set(row['expressionID'] for row in expressions)
         self.assertEqual(expression_ids, {101})
+
+    def test_chained(self, mod_builder):
+        # Check that data pulled in by restored rows pulls in
+        # its own references as well
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 5, 'typeName_en-us': ''})
+        self.dh.data['evegroups'].append({'groupID': 5, 'categoryID': 16, 'groupName_en-us': ''})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 100, 'isDefault': False})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 100, 'effectCategory': 0, 'isOffensive': False, 'isAssistance': False,
+            'fittingUsageChanceAttributeID': None, 'preExpression': 101, 'postExpression': None,
+            'durationAttributeID': None, 'dischargeAttributeID': None, 'rangeAttributeID': None,
+            'falloffAttributeID': None, 'trackingSpeedAttributeID': None, 'modifierInfo': None
+        })
+        self.dh.data['dgmexpressions'].append({
+            'expressionID': 101, 'operandID': 6, 'arg1': None, 'arg2': None,
+            'expressionValue': None, 'expressionTypeID': 2,
+            'expressionGroupID': None, 'expressionAttributeID': None
+        })
+        # Weak type, pulled in through expression; it pulls in its
+        # attribute, which pulls in its max attribute
+        self.dh.data['evetypes'].append({'typeID': 2, 'groupID': 6, 'typeName_en-us': ''})
+        self.dh.data['evegroups'].append({'groupID': 6, 'categoryID': 50, 'groupName_en-us': ''})
+        self.dh.data['dgmtypeattribs'].append({'typeID': 2, 'attributeID': 1000, 'value': 5.0})
+        self.dh.data['dgmattribs'].append({
+            'attributeID': 1000, 'maxAttributeID': 1001, 'defaultValue': 0.0,
+            'highIsGood': False, 'stackable': True, 'attributeName': ''
+        })
+        self.dh.data['dgmattribs'].append({
+            'attributeID': 1001, 'maxAttributeID': None, 'defaultValue': 0.0,
+            'highIsGood': False, 'stackable': True, 'attributeName': ''
+        })
+        self.dh.data['dgmattribs'].append({
+            'attributeID': 1002, 'maxAttributeID': None, 'defaultValue': 0.0,
+            'highIsGood': False, 'stackable': True, 'attributeName': ''
+        })
+        mod_builder.return_value.build.return_value = ([], 0)
+        data = self.run_generator()
+        self.assertEqual(len(self.log), 2)
+        clean_stats = self.log[1]
+        self.assertEqual(clean_stats.name, 'eos.data.cache_generator.cleaner')
+        self.assertEqual(
+            clean_stats.msg,
+            'cleaned: 33.3% from dgmattribs, 0.0% from dgmeffects, 0.0% from dgmexpressions, '
+            '0.0% from dgmtypeattribs, 0.0% from dgmtypeeffects, 0.0% from evegroups, 0.0% from evetypes'
+        )
+        self.assertEqual(len(data['types']), 2)
+        self.assertEqual(data['types'][2]['attributes'], {1000: 5.0})
+        self.assertEqual(len(data['attributes']), 2)
+        self.assertIn(1000, data['attributes'])
+        self.assertIn(1001, data['attributes'])
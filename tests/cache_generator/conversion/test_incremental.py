@@ -0,0 +1,86 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import json
+import logging
+
+from tests.cache_generator.generator_testcase import GeneratorTestCase
+
+
+class TestConversionIncremental(GeneratorTestCase):
+    """
+    Check that modifiers of effects whose data didn't change are
+    taken from previous generation state, and that results are
+    the same as with full generation.
+    """
+
+    def __generate_data(self):
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1, 'typeName_en-us': ''})
+        for effect_id in range(100, 110):
+            self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': effect_id})
+            self.dh.data['dgmeffects'].append({
+                'effectID': effect_id, 'effectCategory': 0, 'isOffensive': False, 'isAssistance': False,
+                'preExpression': None, 'postExpression': None, 'modifierInfo': self.__modinfo(effect_id % 4 + 1)
+            })
+
+    def __modinfo(self, attr_id):
+        return (
+            '- domain: shipID\n  func: ItemModifier\n  modifiedAttributeID: {}\n'
+            '  modifyingAttributeID: 50\n  operator: 6\n'.format(attr_id)
+        )
+
+    def __change_effect(self, effect_id, attr_id):
+        for row in self.dh.data['dgmeffects']:
+            if row['effectID'] == effect_id:
+                row['modifierInfo'] = self.__modinfo(attr_id)
+
+    def __get_build_msg(self):
+        for record in self.log:
+            if record.msg.startswith('modifier building'):
+                return record.msg
+        return None
+
+    def test_reuse(self):
+        self.__generate_data()
+        self.run_generator()
+        self.assertIsNone(self.__get_build_msg())
+        # Emulate storage of state, which changes its form
+        previous_state = json.loads(json.dumps(self.generation_state))
+        self.__change_effect(104, 20)
+        self.log.clear()
+        incremental_data = self.run_generator(previous_state=previous_state)
+        build_msg = self.__get_build_msg()
+        self.log.clear()
+        full_data = self.run_generator()
+        self.assertEqual(build_msg, 'modifier building: 9 effects reused, 1 effects built')
+        self.assertEqual(incremental_data, full_data)
+        self.assertEqual(len(full_data['modifiers']), 5)
+
+    def test_version_mismatch(self):
+        self.__generate_data()
+        self.run_generator()
+        previous_state = dict(self.generation_state)
+        previous_state['eos_version'] = 'other'
+        self.log.clear()
+        self.run_generator(previous_state=previous_state)
+        self.assertEqual(self.__get_build_msg(), 'modifier building: 0 effects reused, 10 effects built')
+        for record in self.log:
+            self.assertEqual(record.levelno, logging.INFO)
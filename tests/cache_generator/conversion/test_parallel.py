@@ -0,0 +1,58 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from tests.cache_generator.generator_testcase import GeneratorTestCase
+
+
+class TestConversionParallel(GeneratorTestCase):
+    """
+    Check that building modifiers in multiple processes
+    yields the same results as building them in one.
+    """
+
+    def __generate_data(self):
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1, 'typeName_en-us': ''})
+        modinfo_template = (
+            '- domain: shipID\n  func: ItemModifier\n  modifiedAttributeID: {}\n'
+            '  modifyingAttributeID: {}\n  operator: 6\n'
+        )
+        for effect_id in range(100, 120):
+            self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': effect_id})
+            # Some effects share modifiers, and some are broken
+            if effect_id % 7 == 0:
+                modinfo = '- domain: shipID\n  func: NoSuchFunc\n'
+            else:
+                modinfo = modinfo_template.format(effect_id % 5 + 1, effect_id % 3 + 10)
+            self.dh.data['dgmeffects'].append({
+                'effectID': effect_id, 'effectCategory': 0, 'isOffensive': False, 'isAssistance': False,
+                'preExpression': None, 'postExpression': None, 'modifierInfo': modinfo
+            })
+
+    def test_determinism(self):
+        self.__generate_data()
+        serial_data = self.run_generator()
+        serial_log = [(record.name, record.levelno, record.msg) for record in self.log]
+        self.log.clear()
+        parallel_data = self.run_generator(workers=3)
+        parallel_log = [(record.name, record.levelno, record.msg) for record in self.log]
+        self.assertEqual(len(serial_data['modifiers']), 13)
+        self.assertEqual(parallel_data, serial_data)
+        self.assertEqual(parallel_log, serial_log)
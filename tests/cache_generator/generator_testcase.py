@@ -30,19 +30,22 @@ class GeneratorTestCase(EosTestCase):
     Additional functionality provided:
 
     self.dh -- default data handler
+    self.generation_state -- generation state of the last
+        generator run
     """
 
     def setUp(self):
         super().setUp()
         self.dh = DataHandler()
 
-    def run_generator(self):
+    def run_generator(self, workers=1, previous_state=None):
         """
         Run generator and rework data structure into
         keyed tables so it's easier to check.
         """
         generator = CacheGenerator()
-        data = generator.run(self.dh)
+        data = generator.run(self.dh, workers=workers, previous_state=previous_state)
+        self.generation_state = generator.generation_state
         keys = {
             'types': 'type_id',
             'attributes': 'attribute_id',
@@ -0,0 +1,113 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.fit.messages import AttrValueChanged, StartBatch, CommitBatch
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem, ShipItem
+
+
+class TestBatch(CalculatorTestCase):
+    """Check that attribute invalidation is postponed until batch commit"""
+
+    def setUp(self):
+        super().setUp()
+        self.tgt_attr = self.ch.attribute(attribute_id=1)
+        self.src_attr = self.ch.attribute(attribute_id=2)
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = FilterType.all_
+        modifier.filter_value = None
+        self.effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        self.effect.modifiers = (modifier,)
+
+    def make_source(self, type_id):
+        return IndependentItem(self.ch.type_(
+            type_id=type_id, effects=(self.effect,), attributes={self.src_attr.id: 20}))
+
+    def test_addition(self):
+        influence_target = ShipItem(self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100}))
+        self.fit.items.add(influence_target)
+        self.assertAlmostEqual(influence_target.attributes[self.tgt_attr.id], 100)
+        # Action
+        self.fit._publish(StartBatch())
+        source1 = self.make_source(2)
+        source2 = self.make_source(3)
+        self.fit.items.add(source1)
+        self.fit.items.add(source2)
+        # Value is not refreshed until commit
+        self.assertAlmostEqual(influence_target.attributes[self.tgt_attr.id], 100)
+        self.fit._publish(CommitBatch())
+        # Verification
+        self.assertAlmostEqual(influence_target.attributes[self.tgt_attr.id], 144)
+        # Misc
+        self.fit.items.remove(source1)
+        self.fit.items.remove(source2)
+        self.fit.items.remove(influence_target)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+
+    def test_merged_invalidation(self):
+        influence_target = ShipItem(self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100}))
+        self.fit.items.add(influence_target)
+        self.assertAlmostEqual(influence_target.attributes[self.tgt_attr.id], 100)
+        self.fit.message_store.clear()
+        # Action
+        self.fit._publish(StartBatch())
+        source1 = self.make_source(2)
+        source2 = self.make_source(3)
+        self.fit.items.add(source1)
+        self.fit.items.add(source2)
+        self.fit.items.remove(source1)
+        self.fit._publish(CommitBatch())
+        # Verification
+        changes = [m for m in self.fit.message_store if isinstance(m, AttrValueChanged)]
+        self.assertEqual(changes, [AttrValueChanged(holder=influence_target, attr=self.tgt_attr.id)])
+        self.assertAlmostEqual(influence_target.attributes[self.tgt_attr.id], 120)
+        # Misc
+        self.fit.items.remove(source2)
+        self.fit.items.remove(influence_target)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+
+    def test_removed_target(self):
+        influence_target = ShipItem(self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100}))
+        self.fit.items.add(influence_target)
+        self.assertAlmostEqual(influence_target.attributes[self.tgt_attr.id], 100)
+        # Action
+        self.fit._publish(StartBatch())
+        source = self.make_source(2)
+        self.fit.items.add(source)
+        self.fit.items.remove(influence_target)
+        self.fit._publish(CommitBatch())
+        # Verification
+        self.assertIsNone(influence_target._fit)
+        # Misc
+        self.fit.items.remove(source)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
@@ -39,3 +39,5 @@ class CalculatorTestCase(EosTestCase):
     def assert_calculator_buffers_empty(self, fit):
         register = fit._calculator._register
         super().assert_object_buffers_empty(register)
+        super().assert_object_buffers_empty(fit._calculator._dependencies)
+        super().assert_object_buffers_empty(fit._calculator._sharing)
@@ -100,6 +100,7 @@ class Fit:
         self._calculator._notify(message)
 
     _subscribe = Mock()
+    _refresh_subscriber = Mock()
 
 
 class Holder:
@@ -0,0 +1,84 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from importlib.util import find_spec
+from unittest import skipIf
+
+from eos.fit.calculator import aggregation
+from tests.eos_testcase import EosTestCase
+
+
+NUMPY_MISSING = find_spec('numpy') is None
+
+
+def penalize_reference(mod_list):
+    positive = sorted((v - 1 for v in mod_list if v >= 1), reverse=True)
+    negative = sorted(v - 1 for v in mod_list if v < 1)
+    result = 1
+    for chain in (positive, negative):
+        for position, value in enumerate(chain[:11]):
+            result *= 1 + value * aggregation.PENALTY_BASE ** (position ** 2)
+    return result
+
+
+class TestAggregation(EosTestCase):
+
+    mod_lists = [
+        [],
+        [1.5],
+        [1.25, 1.5],
+        [1.1, 0.8, 1.3, 0.5, 1, 1.2],
+        [1.05 + 0.01 * i for i in range(15)] + [0.95 - 0.01 * i for i in range(13)]
+    ]
+
+    def tearDown(self):
+        aggregation.set_backend(aggregation.BACKEND_PYTHON)
+        super().tearDown()
+
+    def test_penalize(self):
+        for mod_list in self.mod_lists:
+            self.assertAlmostEqual(aggregation.penalize(mod_list), penalize_reference(mod_list))
+
+    def test_penalize_many(self):
+        results = aggregation.penalize_many(self.mod_lists)
+        self.assertEqual(len(results), len(self.mod_lists))
+        for result, mod_list in zip(results, self.mod_lists):
+            self.assertAlmostEqual(result, penalize_reference(mod_list))
+
+    @skipIf(NUMPY_MISSING, 'NumPy is not available')
+    def test_penalize_many_numpy(self):
+        aggregation.set_backend(aggregation.BACKEND_NUMPY)
+        self.assertEqual(aggregation.get_backend(), aggregation.BACKEND_NUMPY)
+        results = aggregation.penalize_many(self.mod_lists)
+        self.assertEqual(len(results), len(self.mod_lists))
+        for result, mod_list in zip(results, self.mod_lists):
+            self.assertAlmostEqual(result, penalize_reference(mod_list))
+
+    @skipIf(not NUMPY_MISSING, 'NumPy is available')
+    def test_numpy_missing(self):
+        with self.assertRaises(ImportError):
+            aggregation.set_backend(aggregation.BACKEND_NUMPY)
+        self.assertEqual(aggregation.get_backend(), aggregation.BACKEND_PYTHON)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            aggregation.set_backend('fortran')
+        self.assertEqual(aggregation.get_backend(), aggregation.BACKEND_PYTHON)
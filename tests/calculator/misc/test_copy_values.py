@@ -0,0 +1,133 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import Fit, IndependentItem, ShipItem
+
+
+class TestCopyValues(CalculatorTestCase):
+    """Check that calculated values are taken over from other fit"""
+
+    def setUp(self):
+        super().setUp()
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2)
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = FilterType.all_
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = (modifier,)
+        self.ship_type = self.ch.type_(type_id=1, effects=(effect,), attributes={self.src_attr.id: 20})
+        self.holder_type = self.ch.type_(type_id=2, attributes={self.tgt_attr.id: 100})
+        self.fit2 = Fit(self.ch)
+
+    def test_copy(self):
+        ship1 = IndependentItem(self.ship_type)
+        holder1 = ShipItem(self.holder_type)
+        self.fit.ship = ship1
+        self.fit.items.add(holder1)
+        self.assertAlmostEqual(holder1.attributes[self.tgt_attr.id], 120)
+        ship2 = IndependentItem(self.ship_type)
+        holder2 = ShipItem(self.holder_type)
+        self.fit2.ship = ship2
+        self.fit2.items.add(holder2)
+        # Action
+        self.fit2._calculator.copy_values(self.fit._calculator, {ship1: ship2, holder1: holder2})
+        # Checks
+        self.assertFalse(holder2.attributes._needs_calculation(self.tgt_attr.id))
+        self.assertAlmostEqual(holder2.attributes[self.tgt_attr.id], 120)
+        # Action
+        ship2.attributes._override_set(self.src_attr.id, 50)
+        # Checks
+        self.assertAlmostEqual(holder2.attributes[self.tgt_attr.id], 150)
+        self.assertAlmostEqual(holder1.attributes[self.tgt_attr.id], 120)
+        # Misc
+        ship2.attributes._override_del(self.src_attr.id)
+        self.fit.items.remove(holder1)
+        self.fit.ship = None
+        self.fit2.items.remove(holder2)
+        self.fit2.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+        self.assert_calculator_buffers_empty(self.fit2)
+
+    def test_copy_original_changed(self):
+        ship1 = IndependentItem(self.ship_type)
+        holder1 = ShipItem(self.holder_type)
+        self.fit.ship = ship1
+        self.fit.items.add(holder1)
+        self.assertAlmostEqual(holder1.attributes[self.tgt_attr.id], 120)
+        ship2 = IndependentItem(self.ship_type)
+        holder2 = ShipItem(self.holder_type)
+        self.fit2.ship = ship2
+        self.fit2.items.add(holder2)
+        # Action
+        self.fit2._calculator.copy_values(self.fit._calculator, {ship1: ship2, holder1: holder2})
+        # Checks
+        self.assertIs(holder2.attributes._values, holder1.attributes._values)
+        # Action
+        ship1.attributes._override_set(self.src_attr.id, 50)
+        # Checks
+        self.assertAlmostEqual(holder1.attributes[self.tgt_attr.id], 150)
+        self.assertAlmostEqual(holder2.attributes[self.tgt_attr.id], 120)
+        self.assertIsNot(holder2.attributes._values, holder1.attributes._values)
+        # Misc
+        ship1.attributes._override_del(self.src_attr.id)
+        self.fit.items.remove(holder1)
+        self.fit.ship = None
+        self.fit2.items.remove(holder2)
+        self.fit2.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+        self.assert_calculator_buffers_empty(self.fit2)
+
+    def test_no_counterpart(self):
+        ship1 = IndependentItem(self.ship_type)
+        holder1 = ShipItem(self.holder_type)
+        self.fit.ship = ship1
+        self.fit.items.add(holder1)
+        self.assertAlmostEqual(holder1.attributes[self.tgt_attr.id], 120)
+        ship2 = IndependentItem(self.ship_type)
+        holder2 = ShipItem(self.holder_type)
+        self.fit2.ship = ship2
+        self.fit2.items.add(holder2)
+        # Action
+        self.fit2._calculator.copy_values(self.fit._calculator, {holder1: holder2})
+        # Checks
+        self.assertTrue(holder2.attributes._needs_calculation(self.tgt_attr.id))
+        self.assertAlmostEqual(holder2.attributes[self.tgt_attr.id], 120)
+        # Misc
+        self.fit.items.remove(holder1)
+        self.fit.ship = None
+        self.fit2.items.remove(holder2)
+        self.fit2.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+        self.assert_calculator_buffers_empty(self.fit2)
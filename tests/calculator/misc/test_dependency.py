@@ -0,0 +1,107 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem, CharacterItem, ShipItem
+
+
+class TestDependencyGraph(CalculatorTestCase):
+    """Check that attribute dependencies are tracked and used for invalidation"""
+
+    def setUp(self):
+        super().setUp()
+        self.attr1 = self.ch.attribute(attribute_id=1)
+        self.attr2 = self.ch.attribute(attribute_id=2)
+        self.attr3 = self.ch.attribute(attribute_id=3)
+        modifier1 = Modifier()
+        modifier1.state = State.offline
+        modifier1.scope = Scope.local
+        modifier1.src_attr = self.attr1.id
+        modifier1.operator = Operator.post_percent
+        modifier1.tgt_attr = self.attr2.id
+        modifier1.domain = Domain.ship
+        modifier1.filter_type = None
+        modifier1.filter_value = None
+        effect1 = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect1.modifiers = (modifier1,)
+        modifier2 = Modifier()
+        modifier2.state = State.offline
+        modifier2.scope = Scope.local
+        modifier2.src_attr = self.attr2.id
+        modifier2.operator = Operator.post_percent
+        modifier2.tgt_attr = self.attr3.id
+        modifier2.domain = Domain.ship
+        modifier2.filter_type = FilterType.all_
+        modifier2.filter_value = None
+        effect2 = self.ch.effect(effect_id=2, category=EffectCategory.passive)
+        effect2.modifiers = (modifier2,)
+        self.char_holder = CharacterItem(self.ch.type_(type_id=1, effects=(effect1,), attributes={self.attr1.id: 50}))
+        self.ship = IndependentItem(self.ch.type_(type_id=2, effects=(effect2,), attributes={self.attr2.id: 100}))
+        self.ship_holder = ShipItem(self.ch.type_(type_id=3, attributes={self.attr3.id: 10}))
+        self.fit.items.add(self.char_holder)
+        self.fit.ship = self.ship
+        self.fit.items.add(self.ship_holder)
+
+    def tearDown(self):
+        self.fit.items.remove(self.char_holder)
+        self.fit.ship = None
+        self.fit.items.remove(self.ship_holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+        super().tearDown()
+
+    def test_recorded(self):
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 25)
+        dependencies = self.fit._calculator._dependencies
+        self.assertEqual(
+            dependencies.get_dependents(self.char_holder, self.attr1.id), {(self.ship, self.attr2.id)})
+        self.assertEqual(
+            dependencies.get_dependents(self.ship, self.attr2.id), {(self.ship_holder, self.attr3.id)})
+
+    def test_transitive_invalidation(self):
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 25)
+        self.char_holder.attributes._override_set(self.attr1.id, 100)
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 30)
+        self.char_holder.attributes._override_del(self.attr1.id)
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 25)
+
+    def test_invalidation_stopped_on_override(self):
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 25)
+        self.ship.attributes._override_set(self.attr2.id, 200)
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 30)
+        self.char_holder.attributes._override_set(self.attr1.id, 150)
+        # Ship attribute is overridden, so change of its source
+        # doesn't change anything down the chain
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 30)
+        self.ship.attributes._override_del(self.attr2.id)
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 35)
+
+    def test_holder_removal(self):
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 25)
+        self.fit.items.remove(self.char_holder)
+        dependencies = self.fit._calculator._dependencies
+        self.assertEqual(len(dependencies.get_dependents(self.char_holder, self.attr1.id)), 0)
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 20)
+        self.fit.items.add(self.char_holder)
+        self.assertAlmostEqual(self.ship_holder.attributes[self.attr3.id], 25)
@@ -0,0 +1,108 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.fit.calculator import CalculatorInstrumentation
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem, ShipItem
+
+
+class TestInstrumentation(CalculatorTestCase):
+    """Check that calculator collects statistics when asked to"""
+
+    def setUp(self):
+        super().setUp()
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2)
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = FilterType.all_
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = (modifier,)
+        self.ship = IndependentItem(self.ch.type_(type_id=1, effects=(effect,), attributes={self.src_attr.id: 20}))
+        self.holder = ShipItem(self.ch.type_(type_id=2, attributes={self.tgt_attr.id: 100}))
+        self.fit.ship = self.ship
+
+    def tearDown(self):
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+        super().tearDown()
+
+    def test_disabled(self):
+        self.fit.items.add(self.holder)
+        self.assertIsNone(self.fit._calculator.instrumentation)
+        self.assertIsNone(self.holder.attributes._instrumentation)
+        self.assertAlmostEqual(self.holder.attributes[self.tgt_attr.id], 120)
+        self.assertIsNone(self.fit._calculator.disable_instrumentation())
+        self.fit.items.remove(self.holder)
+
+    def test_counters(self):
+        instrumentation = self.fit._calculator.enable_instrumentation()
+        self.assertIs(self.fit._calculator.instrumentation, instrumentation)
+        # Holder added after enabling is instrumented as well
+        self.fit.items.add(self.holder)
+        self.assertIs(self.holder.attributes._instrumentation, instrumentation)
+        self.assertAlmostEqual(self.holder.attributes[self.tgt_attr.id], 120)
+        self.assertAlmostEqual(self.holder.attributes[self.tgt_attr.id], 120)
+        report = instrumentation.report()
+        self.assertEqual(report['calculations']['by_attribute'], {self.src_attr.id: 1, self.tgt_attr.id: 1})
+        self.assertEqual(report['calculations']['by_holder_type'], {'IndependentItem': 1, 'ShipItem': 1})
+        # Source value is calculated before target value, and read
+        # from cache when target is calculated
+        self.assertEqual(report['cache_hits']['by_attribute'], {self.src_attr.id: 1, self.tgt_attr.id: 1})
+        self.assertEqual(report['affectors_visited']['by_attribute'], {self.src_attr.id: 0, self.tgt_attr.id: 1})
+        self.assertEqual(set(report['time']['by_attribute']), {self.src_attr.id, self.tgt_attr.id})
+        self.assertEqual(report['invalidations']['total'], 0)
+        # Action
+        self.ship.attributes._override_set(self.src_attr.id, 50)
+        # Checks
+        report = instrumentation.report()
+        self.assertEqual(report['invalidations']['by_attribute'], {self.tgt_attr.id: 1})
+        self.assertEqual(report['invalidations']['by_holder_type'], {'ShipItem': 1})
+        self.assertEqual(report['fan_out']['AttrValueChangedOverride'], {'messages': 1, 'invalidations': 1, 'max': 1})
+        # Misc
+        self.ship.attributes._override_del(self.src_attr.id)
+        self.fit.items.remove(self.holder)
+        self.assertIsNone(self.holder.attributes._instrumentation)
+        self.assertIs(self.fit._calculator.disable_instrumentation(), instrumentation)
+        self.assertIsNone(self.ship.attributes._instrumentation)
+
+    def test_prometheus(self):
+        instrumentation = self.fit._calculator.enable_instrumentation(CalculatorInstrumentation())
+        self.fit.items.add(self.holder)
+        self.assertAlmostEqual(self.holder.attributes[self.tgt_attr.id], 120)
+        text = instrumentation.to_prometheus()
+        self.assertIn('# TYPE eos_calculator_calculations_total counter\n', text)
+        self.assertIn('eos_calculator_calculations_total{attribute="2"} 1\n', text)
+        self.assertIn('eos_calculator_calculations_total{holder_type="ShipItem"} 1\n', text)
+        instrumentation.reset()
+        self.assertEqual(instrumentation.report()['calculations']['total'], 0)
+        self.fit.items.remove(self.holder)
+        self.fit._calculator.disable_instrumentation()
@@ -0,0 +1,85 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem
+
+
+class TestMaterialize(CalculatorTestCase):
+    """Check that attributes are calculated in dependency order on materialization"""
+
+    def make_chain(self, length):
+        attrs = [self.ch.attribute(attribute_id=i) for i in range(1, length + 1)]
+        modifiers = []
+        for src_attr, tgt_attr in zip(attrs, attrs[1:]):
+            modifier = Modifier()
+            modifier.state = State.offline
+            modifier.scope = Scope.local
+            modifier.src_attr = src_attr.id
+            modifier.operator = Operator.mod_add
+            modifier.tgt_attr = tgt_attr.id
+            modifier.domain = Domain.self_
+            modifier.filter_type = None
+            modifier.filter_value = None
+            modifiers.append(modifier)
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = tuple(modifiers)
+        holder = IndependentItem(self.ch.type_(
+            type_id=1, effects=(effect,), attributes={attr.id: 1 for attr in attrs}))
+        return holder, attrs
+
+    def test_calculation(self):
+        holder, attrs = self.make_chain(5)
+        self.fit.items.add(holder)
+        self.fit._calculator.materialize()
+        for attr in attrs:
+            self.assertFalse(holder.attributes._needs_calculation(attr.id))
+        self.assertEqual(holder.attributes[attrs[-1].id], 5)
+        self.fit.items.remove(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+
+    def test_invalidated(self):
+        holder, attrs = self.make_chain(5)
+        self.fit.items.add(holder)
+        self.fit._calculator.materialize()
+        holder.attributes._override_set(attrs[2].id, 10)
+        self.assertTrue(holder.attributes._needs_calculation(attrs[-1].id))
+        self.fit._calculator.materialize()
+        self.assertFalse(holder.attributes._needs_calculation(attrs[-1].id))
+        self.assertEqual(holder.attributes[attrs[-1].id], 12)
+        self.fit.items.remove(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+
+    def test_long_chain(self):
+        # Lazy calculation of last attribute of such chain would
+        # exceed recursion limit
+        holder, attrs = self.make_chain(3000)
+        self.fit.items.add(holder)
+        self.fit._calculator.materialize()
+        self.assertEqual(holder.attributes[attrs[-1].id], 3000)
+        self.fit.items.remove(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
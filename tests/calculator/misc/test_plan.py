@@ -0,0 +1,85 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import Mock
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem, ShipItem
+
+
+class TestCalculationPlan(CalculatorTestCase):
+    """Check that compiled calculation plans are reused only while they're valid"""
+
+    def setUp(self):
+        super().setUp()
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2, stackable=0)
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = FilterType.all_
+        modifier.filter_value = None
+        self.effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        self.effect.modifiers = (modifier,)
+        self.target = ShipItem(self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100}))
+        self.fit.items.add(self.target)
+        calculator = self.fit._calculator
+        calculator.get_affectors = Mock(wraps=calculator.get_affectors)
+
+    def make_source(self, type_id, value):
+        return IndependentItem(self.ch.type_(
+            type_id=type_id, effects=(self.effect,), attributes={self.src_attr.id: value}))
+
+    def test_reuse_on_source_change(self):
+        source = self.make_source(2, 20)
+        self.fit.items.add(source)
+        self.assertAlmostEqual(self.target.attributes[self.tgt_attr.id], 120)
+        calls_before = self.fit._calculator.get_affectors.call_count
+        source.attributes._override_set(self.src_attr.id, 50)
+        self.assertAlmostEqual(self.target.attributes[self.tgt_attr.id], 150)
+        self.assertEqual(self.fit._calculator.get_affectors.call_count, calls_before)
+        self.fit.items.remove(source)
+        self.fit.items.remove(self.target)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+
+    def test_rebuild_on_affector_change(self):
+        source1 = self.make_source(2, 20)
+        self.fit.items.add(source1)
+        self.assertAlmostEqual(self.target.attributes[self.tgt_attr.id], 120)
+        source2 = self.make_source(3, 50)
+        self.fit.items.add(source2)
+        # Both sources are penalized now
+        self.assertAlmostEqual(self.target.attributes[self.tgt_attr.id], 176.0736, places=4)
+        self.fit.items.remove(source1)
+        self.assertAlmostEqual(self.target.attributes[self.tgt_attr.id], 150)
+        self.fit.items.remove(source2)
+        self.assertAlmostEqual(self.target.attributes[self.tgt_attr.id], 100)
+        self.fit.items.remove(self.target)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
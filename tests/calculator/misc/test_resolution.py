@@ -0,0 +1,90 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import logging
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.fit.calculator.exception import AttributeCycleError
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem
+
+
+class TestResolution(CalculatorTestCase):
+    """Check that attributes relying on other attributes are resolved without recursion"""
+
+    def make_holder(self, attr_ids, links):
+        attrs = {attr_id: self.ch.attribute(attribute_id=attr_id) for attr_id in attr_ids}
+        modifiers = []
+        for src_attr_id, tgt_attr_id in links:
+            modifier = Modifier()
+            modifier.state = State.offline
+            modifier.scope = Scope.local
+            modifier.src_attr = src_attr_id
+            modifier.operator = Operator.mod_add
+            modifier.tgt_attr = tgt_attr_id
+            modifier.domain = Domain.self_
+            modifier.filter_type = None
+            modifier.filter_value = None
+            modifiers.append(modifier)
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = tuple(modifiers)
+        return IndependentItem(self.ch.type_(
+            type_id=1, effects=(effect,), attributes={attr_id: 1 for attr_id in attrs}))
+
+    def test_long_chain(self):
+        # Recursive calculation of last attribute of such
+        # chain would exceed recursion limit
+        attr_ids = range(1, 3001)
+        holder = self.make_holder(attr_ids, zip(attr_ids, attr_ids[1:]))
+        self.fit.items.add(holder)
+        self.assertEqual(holder.attributes[3000], 3000)
+        self.assertFalse(holder.attributes._needs_calculation(1500))
+        holder.attributes._override_set(1, 11)
+        self.assertEqual(holder.attributes[3000], 3010)
+        self.fit.items.remove(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+
+    def test_cycle(self):
+        holder = self.make_holder((1, 2, 3, 4), ((1, 2), (2, 3), (3, 2), (3, 4)))
+        self.fit.items.add(holder)
+        with self.assertRaises(KeyError) as context:
+            holder.attributes[4]
+        cycle_error = context.exception.__cause__
+        self.assertIsInstance(cycle_error, AttributeCycleError)
+        self.assertEqual(cycle_error.args[0], [(holder, 3), (holder, 2), (holder, 3)])
+        self.assertEqual(len(self.log), 1)
+        log_record = self.log[0]
+        self.assertEqual(log_record.name, 'eos.fit.calculator.map')
+        self.assertEqual(log_record.levelno, logging.ERROR)
+        self.assertEqual(
+            log_record.msg, 'unable to calculate attribute 4 on item 1: attribute relies on itself via '
+            'attribute 3 on item 1 -> attribute 2 on item 1 -> attribute 3 on item 1')
+        # Attributes outside of cycle are still available
+        self.assertEqual(holder.attributes[1], 1)
+        # Cycle is broken by override
+        holder.attributes._override_set(2, 5)
+        self.assertEqual(holder.attributes[4], 7)
+        holder.attributes._override_del(2)
+        self.fit.items.remove(holder)
+        self.assert_calculator_buffers_empty(self.fit)
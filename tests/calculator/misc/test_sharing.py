@@ -0,0 +1,193 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.fit.messages import StartBatch, CommitBatch
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import ChargeHolder, ContainerHolder, IndependentItem, ShipItem
+
+
+class TestSharing(CalculatorTestCase):
+    """Check that equivalent holders share calculated values"""
+
+    def make_modifier(self, src_attr, tgt_attr, domain, state=State.offline, filter_type=None):
+        modifier = Modifier()
+        modifier.state = state
+        modifier.scope = Scope.local
+        modifier.src_attr = src_attr.id
+        modifier.operator = Operator.mod_add
+        modifier.tgt_attr = tgt_attr.id
+        modifier.domain = domain
+        modifier.filter_type = filter_type
+        modifier.filter_value = None
+        return modifier
+
+    def setUp(self):
+        super().setUp()
+        self.ship_src_attr = self.ch.attribute(attribute_id=1)
+        self.attr = self.ch.attribute(attribute_id=2)
+        self.active_attr = self.ch.attribute(attribute_id=3)
+        self.ship_tgt_attr = self.ch.attribute(attribute_id=4)
+        # Ship boosts attribute of all holders on it
+        ship_effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        ship_effect.modifiers = (self.make_modifier(
+            self.ship_src_attr, self.attr, Domain.ship, filter_type=FilterType.all_),)
+        # Holders boost their own attribute when online, and use it
+        # to modify ship
+        holder_effect = self.ch.effect(effect_id=2, category=EffectCategory.passive)
+        holder_effect.modifiers = (
+            self.make_modifier(self.active_attr, self.attr, Domain.self_, state=State.online),
+            self.make_modifier(self.attr, self.ship_tgt_attr, Domain.ship)
+        )
+        self.ship = IndependentItem(self.ch.type_(
+            type_id=1, effects=(ship_effect,), attributes={self.ship_src_attr.id: 10, self.ship_tgt_attr.id: 0}))
+        holder_type = self.ch.type_(
+            type_id=2, effects=(holder_effect,), attributes={self.attr.id: 100, self.active_attr.id: 5})
+        self.holder1 = ShipItem(holder_type)
+        self.holder2 = ShipItem(holder_type)
+        self.fit.ship = self.ship
+        self.fit.items.add(self.holder1)
+        self.fit.items.add(self.holder2)
+
+    def tearDown(self):
+        self.fit.items.remove(self.holder1)
+        self.fit.items.remove(self.holder2)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+        super().tearDown()
+
+    def test_shared(self):
+        self.assertIs(self.holder1.attributes._group, self.holder2.attributes._group)
+        self.assertAlmostEqual(self.holder1.attributes[self.attr.id], 110)
+        self.assertFalse(self.holder2.attributes._needs_calculation(self.attr.id))
+        self.assertAlmostEqual(self.holder2.attributes[self.attr.id], 110)
+
+    def test_source_change(self):
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 220)
+        self.ship.attributes._override_set(self.ship_src_attr.id, 20)
+        self.assertAlmostEqual(self.holder2.attributes[self.attr.id], 120)
+        self.assertAlmostEqual(self.holder1.attributes[self.attr.id], 120)
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 240)
+
+    def test_state_divergence(self):
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 220)
+        self.holder2.state = State.online
+        self.assertIsNot(self.holder1.attributes._group, self.holder2.attributes._group)
+        self.assertAlmostEqual(self.holder1.attributes[self.attr.id], 110)
+        self.assertAlmostEqual(self.holder2.attributes[self.attr.id], 115)
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 225)
+        self.ship.attributes._override_set(self.ship_src_attr.id, 20)
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 245)
+        self.holder2.state = State.offline
+        self.assertIs(self.holder1.attributes._group, self.holder2.attributes._group)
+        self.assertAlmostEqual(self.holder2.attributes[self.attr.id], 120)
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 240)
+        self.holder1.state = State.online
+        self.holder2.state = State.online
+        self.assertIs(self.holder1.attributes._group, self.holder2.attributes._group)
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 250)
+        self.holder1.state = State.offline
+        self.holder2.state = State.offline
+
+    def test_override_divergence(self):
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 220)
+        self.holder1.attributes._override_set(self.attr.id, 50)
+        self.assertIsNone(self.holder1.attributes._group)
+        self.assertAlmostEqual(self.holder2.attributes[self.attr.id], 110)
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 160)
+        self.holder1.attributes._override_del(self.attr.id)
+        self.assertIs(self.holder1.attributes._group, self.holder2.attributes._group)
+        self.assertAlmostEqual(self.holder1.attributes[self.attr.id], 110)
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 220)
+
+    def test_batch(self):
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 220)
+        self.fit._publish(StartBatch())
+        self.holder2.state = State.online
+        self.holder1.state = State.online
+        # Groups are formed only when batch is committed
+        self.assertIsNone(self.holder1.attributes._group)
+        self.assertIsNone(self.holder2.attributes._group)
+        self.fit._publish(CommitBatch())
+        self.assertIs(self.holder1.attributes._group, self.holder2.attributes._group)
+        self.assertAlmostEqual(self.holder1.attributes[self.attr.id], 115)
+        self.assertAlmostEqual(self.ship.attributes[self.ship_tgt_attr.id], 230)
+        self.holder1.state = State.offline
+        self.holder2.state = State.offline
+
+
+class TestSharingCharge(CalculatorTestCase):
+    """Check that holders share values only when their charges are equivalent"""
+
+    def setUp(self):
+        super().setUp()
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2)
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.other
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = (modifier,)
+        self.container_type = self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100})
+        self.charge_type = self.ch.type_(type_id=2, effects=(effect,), attributes={self.src_attr.id: 50})
+
+    def make_loaded_container(self):
+        container = ContainerHolder(self.container_type)
+        charge = ChargeHolder(self.charge_type)
+        container.charge = charge
+        charge.container = container
+        self.fit.items.add(container)
+        self.fit.items.add(charge)
+        return container, charge
+
+    def test_charge(self):
+        container1, charge1 = self.make_loaded_container()
+        container2, charge2 = self.make_loaded_container()
+        container3 = ContainerHolder(self.container_type)
+        self.fit.items.add(container3)
+        self.assertIs(container1.attributes._group, container2.attributes._group)
+        self.assertIsNot(container1.attributes._group, container3.attributes._group)
+        self.assertAlmostEqual(container1.attributes[self.tgt_attr.id], 150)
+        self.assertAlmostEqual(container2.attributes[self.tgt_attr.id], 150)
+        self.assertAlmostEqual(container3.attributes[self.tgt_attr.id], 100)
+        charge2.attributes._override_set(self.src_attr.id, 100)
+        self.assertIsNone(container2.attributes._group)
+        self.assertAlmostEqual(container1.attributes[self.tgt_attr.id], 150)
+        self.assertAlmostEqual(container2.attributes[self.tgt_attr.id], 200)
+        self.fit.items.remove(charge2)
+        container2.charge = None
+        charge2.container = None
+        self.assertIs(container2.attributes._group, container3.attributes._group)
+        self.assertAlmostEqual(container2.attributes[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(container1.attributes[self.tgt_attr.id], 150)
+        for holder in (charge1, container1, container2, container3):
+            self.fit.items.remove(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
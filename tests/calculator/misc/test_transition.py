@@ -109,8 +109,9 @@ class TestTransitionFit(CalculatorTestCase):
         fit.ship = ship
         fit.items.add(module)
         self.assertAlmostEqual(module.attributes.get(tgt_attr1.id), 55)
-        # As we have capped attr, this auxiliary map shouldn't be None
-        self.assertGreater(len(module.attributes._cap_map), 0)
+        # As we have capped attr, dependency graph should have link
+        # between capping and capped attributes
+        self.assertEqual(fit._calculator._dependencies.get_dependents(module, 33), {(module, tgt_attr1.id)})
         # Make an 'source switch': disable services
         fit._calculator._notify(DisableServices(holders=(ship, module)))
         # Refresh holders and replace source
@@ -119,13 +120,14 @@ class TestTransitionFit(CalculatorTestCase):
         ship.item = ship_item2
         module.attributes.clear()
         module.item = module_item2
-        # When we cleared holders, auxiliary map for capped attrs should be None.
-        # Using data in this map, attributes which depend on capping attribute will
-        # be cleared. If we don't clear it, there're chances that in new data this
-        # capping-capped attribute pair won't exist, thus if attribute with ID which
-        # used to cap is changed, it will clear attribute which used to be capped -
-        # and we do not want it within scope of new data.
-        self.assertEqual(len(module.attributes._cap_map), 0)
+        # When we removed holders, links between capping and capped attributes
+        # should be removed from dependency graph. Using these links, attributes
+        # which depend on capping attribute will be cleared. If we don't clear
+        # them, there're chances that in new data this capping-capped attribute
+        # pair won't exist, thus if attribute with ID which used to cap is changed,
+        # it will clear attribute which used to be capped - and we do not want it
+        # within scope of new data.
+        self.assertEqual(len(fit._calculator._dependencies.get_dependents(module, 33)), 0)
         # Enable services once switch is complete
         fit._calculator._notify(EnableServices(holders=(ship, module)))
         # Now we should have calculated value based on both updated attribs
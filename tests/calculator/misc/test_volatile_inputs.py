@@ -0,0 +1,120 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.util.volatile_cache import InheritableVolatileMixin, VolatileProperty
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem, ShipItem
+
+
+class VolatileReader(InheritableVolatileMixin):
+
+    def __init__(self, holder, attr):
+        InheritableVolatileMixin.__init__(self)
+        self.holder = holder
+        self.attr = attr
+        self.calls = 0
+
+    @VolatileProperty
+    def value(self):
+        self.calls += 1
+        return self.holder.attributes[self.attr]
+
+
+class TestVolatileInputs(CalculatorTestCase):
+    """Check that volatile properties track attribute values they read"""
+
+    def setUp(self):
+        super().setUp()
+        self.src_attr = self.ch.attribute(attribute_id=1)
+        self.tgt_attr = self.ch.attribute(attribute_id=2)
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = self.src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = FilterType.all_
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = (modifier,)
+        self.ship = IndependentItem(self.ch.type_(type_id=1, effects=(effect,), attributes={self.src_attr.id: 20}))
+        self.holder = ShipItem(self.ch.type_(type_id=2, attributes={self.tgt_attr.id: 100}))
+        self.fit.ship = self.ship
+        self.fit.items.add(self.holder)
+
+    def tearDown(self):
+        self.fit.items.remove(self.holder)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+        super().tearDown()
+
+    def test_inputs(self):
+        reader = VolatileReader(self.holder, self.tgt_attr.id)
+        self.assertAlmostEqual(reader.value, 120)
+        # Values read during calculation are not recorded
+        self.assertEqual(reader._volatile_attrs['value'][1], ((self.holder.attributes, self.tgt_attr.id, 120),))
+        self.assertAlmostEqual(reader.value, 120)
+        self.assertEqual(reader.calls, 1)
+
+    def test_invalidation(self):
+        reader = VolatileReader(self.holder, self.tgt_attr.id)
+        self.assertAlmostEqual(reader.value, 120)
+        self.ship.attributes._override_set(self.src_attr.id, 50)
+        self.assertAlmostEqual(reader.value, 150)
+        self.assertEqual(reader.calls, 2)
+        self.ship.attributes._override_del(self.src_attr.id)
+
+    def test_unrelated_change(self):
+        reader = VolatileReader(self.holder, self.tgt_attr.id)
+        self.assertAlmostEqual(reader.value, 120)
+        self.ship.attributes._override_set(self.tgt_attr.id, 5)
+        self.assertAlmostEqual(reader.value, 120)
+        self.assertEqual(reader.calls, 1)
+        self.ship.attributes._override_del(self.tgt_attr.id)
+
+    def test_override(self):
+        reader = VolatileReader(self.holder, self.tgt_attr.id)
+        self.assertAlmostEqual(reader.value, 120)
+        self.holder.attributes._override_set(self.tgt_attr.id, 5)
+        self.assertAlmostEqual(reader.value, 5)
+        self.holder.attributes._override_del(self.tgt_attr.id)
+        self.assertAlmostEqual(reader.value, 120)
+        self.assertEqual(reader.calls, 3)
+
+    def test_clock(self):
+        clock = self.fit._calculator._volatile_clock
+        reader = VolatileReader(self.holder, self.tgt_attr.id)
+        self.assertAlmostEqual(reader.value, 120)
+        self.assertEqual(reader._volatile_attrs['value'][2], ((clock, clock.generation),))
+        generation = clock.generation
+        self.ship.attributes._override_set(self.tgt_attr.id, 5)
+        self.assertGreater(clock.generation, generation)
+        self.assertAlmostEqual(reader.value, 120)
+        # Inputs have been checked, and they do not have to be
+        # checked again until something changes
+        self.assertEqual(reader._volatile_attrs['value'][2], ((clock, clock.generation),))
+        self.assertEqual(reader.calls, 1)
+        self.ship.attributes._override_del(self.tgt_attr.id)
@@ -80,5 +80,5 @@ class TestFilterUnknown(CalculatorTestCase):
         # Invalid filter type in modifier should prevent proper processing of other modifiers
         self.assertNotAlmostEqual(holder.attributes[self.tgt_attr.id], 100)
         self.fit.items.remove(holder)
-        self.assertEqual(len(self.log), 5)
+        self.assertEqual(len(self.log), 4)
         self.assert_calculator_buffers_empty(self.fit)
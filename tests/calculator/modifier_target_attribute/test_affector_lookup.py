@@ -0,0 +1,78 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem, ShipItem
+
+
+class TestTargetAttributeAffectorLookup(CalculatorTestCase):
+    """Test that affectors are looked up using target attribute"""
+
+    def make_modifier(self, src_attr, tgt_attr, domain, filter_type=None, filter_value=None):
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = src_attr.id
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = tgt_attr.id
+        modifier.domain = domain
+        modifier.filter_type = filter_type
+        modifier.filter_value = filter_value
+        return modifier
+
+    def test_lookup(self):
+        tgt_attr1 = self.ch.attribute(attribute_id=1)
+        tgt_attr2 = self.ch.attribute(attribute_id=2)
+        src_attr = self.ch.attribute(attribute_id=3)
+        modifier_direct = self.make_modifier(src_attr, tgt_attr1, Domain.self_)
+        modifier_domain = self.make_modifier(src_attr, tgt_attr1, Domain.ship, FilterType.all_)
+        modifier_group = self.make_modifier(src_attr, tgt_attr2, Domain.ship, FilterType.group, 35)
+        modifier_skill = self.make_modifier(src_attr, tgt_attr2, Domain.ship, FilterType.skill, 56)
+        effect_src = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect_src.modifiers = (modifier_domain, modifier_group, modifier_skill)
+        effect_tgt = self.ch.effect(effect_id=2, category=EffectCategory.passive)
+        effect_tgt.modifiers = (modifier_direct,)
+        influence_source = IndependentItem(self.ch.type_(
+            type_id=1, effects=(effect_src,), attributes={src_attr.id: 20}))
+        influence_target = ShipItem(self.ch.type_(
+            type_id=2, group=35, effects=(effect_tgt,),
+            attributes={tgt_attr1.id: 50, tgt_attr2.id: 80, src_attr.id: 10, 182: 56, 277: 1}))
+        self.fit.items.add(influence_source)
+        self.fit.items.add(influence_target)
+        calculator = self.fit._calculator
+        # Checks
+        affectors1 = calculator.get_affectors(influence_target, attr=tgt_attr1.id)
+        self.assertEqual(set(a.modifier for a in affectors1), {modifier_direct, modifier_domain})
+        affectors2 = calculator.get_affectors(influence_target, attr=tgt_attr2.id)
+        self.assertEqual(set(a.modifier for a in affectors2), {modifier_group, modifier_skill})
+        self.assertEqual(len(calculator.get_affectors(influence_target, attr=src_attr.id)), 0)
+        self.assertEqual(len(calculator.get_affectors(influence_target)), 4)
+        self.assertAlmostEqual(influence_target.attributes[tgt_attr1.id], 66)
+        self.assertAlmostEqual(influence_target.attributes[tgt_attr2.id], 115.2)
+        # Misc
+        self.fit.items.remove(influence_source)
+        self.assertEqual(len(calculator.get_affectors(influence_target, attr=tgt_attr2.id)), 0)
+        self.fit.items.remove(influence_target)
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
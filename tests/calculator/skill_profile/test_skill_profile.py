@@ -0,0 +1,75 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import Attribute, EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.fit.messages import ProfileSkillsAdded, ProfileSkillsRemoved
+from eos.fit.skill_profile import SkillProfile
+from tests.calculator.calculator_testcase import CalculatorTestCase
+from tests.calculator.environment import IndependentItem
+
+
+class TestSkillProfile(CalculatorTestCase):
+    """Check that skills from skill profile are applied in bulk"""
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=Attribute.skill_level)
+        self.tgt_attr = self.ch.attribute(attribute_id=1)
+        modifier = Modifier()
+        modifier.state = State.offline
+        modifier.scope = Scope.local
+        modifier.src_attr = Attribute.skill_level
+        modifier.operator = Operator.post_percent
+        modifier.tgt_attr = self.tgt_attr.id
+        modifier.domain = Domain.ship
+        modifier.filter_type = None
+        modifier.filter_value = None
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive)
+        effect.modifiers = (modifier,)
+        self.ch.type_(type_id=2, effects=(effect,))
+        self.ch.type_(type_id=3, effects=(effect,))
+        self.ship = IndependentItem(self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 100}))
+        self.fit.ship = self.ship
+
+    def make_skills(self, levels):
+        skills = SkillProfile(levels)._get_skills(self.fit.source)
+        return tuple(skills[type_id] for type_id, _ in levels)
+
+    def test_addition_removal(self):
+        skills = self.make_skills(((2, 5), (3, 2)))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 100)
+        self.fit._publish(ProfileSkillsAdded(skills))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 107.1)
+        self.fit._publish(ProfileSkillsRemoved(skills))
+        self.assertAlmostEqual(self.ship.attributes[self.tgt_attr.id], 100)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
+
+    def test_level(self):
+        skill, = self.make_skills(((2, 4),))
+        self.assertEqual(skill.level, 4)
+        self.assertEqual(skill.attributes[Attribute.skill_level], 4)
+        self.fit.ship = None
+        self.assertEqual(len(self.log), 0)
+        self.assert_calculator_buffers_empty(self.fit)
@@ -0,0 +1,81 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import Mock
+
+from eos.const.eve import Attribute as AttributeId
+from eos.data.cache_handler.attribute_table import (
+    AttributeTable, MAX_DENSE_ID, FLAG_LOADED, FLAG_CAPPED, FLAG_HIGH_IS_GOOD, FLAG_PENALIZABLE,
+    FLAG_LIMITED_PRECISION
+)
+from eos.data.cache_handler.exception import AttributeFetchError
+from tests.eos_testcase import EosTestCase
+
+
+class TestAttributeTable(EosTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=5, max_attribute=6, default_value=1.5, high_is_good=True, stackable=False)
+        self.ch.attribute(attribute_id=6, high_is_good=False, stackable=True)
+        self.ch.attribute(attribute_id=AttributeId.cpu)
+        self.ch.attribute(attribute_id=MAX_DENSE_ID + 10, max_attribute=5, default_value=3)
+        self.getter = Mock(wraps=self.ch.get_attribute)
+        self.table = AttributeTable(self.getter)
+
+    def test_flags(self):
+        self.assertEqual(
+            self.table.get_flags(5), FLAG_LOADED | FLAG_CAPPED | FLAG_HIGH_IS_GOOD | FLAG_PENALIZABLE)
+        self.assertEqual(self.table.get_max_attribute(5), 6)
+        self.assertEqual(self.table.get_default_value(5), 1.5)
+        self.assertEqual(self.table.get_flags(6), FLAG_LOADED)
+        self.assertIsNone(self.table.get_max_attribute(6))
+        self.assertIsNone(self.table.get_default_value(6))
+        self.assertEqual(self.table.get_flags(AttributeId.cpu), FLAG_LOADED | FLAG_LIMITED_PRECISION)
+
+    def test_loaded_once(self):
+        self.table.get_flags(5)
+        self.table.get_flags(5)
+        self.table.get_flags(6)
+        self.assertEqual(self.getter.call_count, 2)
+
+    def test_sparse(self):
+        attr_id = MAX_DENSE_ID + 10
+        self.assertEqual(self.table.get_flags(attr_id), FLAG_LOADED | FLAG_CAPPED)
+        self.table.get_flags(attr_id)
+        self.assertEqual(self.getter.call_count, 1)
+        self.assertEqual(self.table.get_max_attribute(attr_id), 5)
+        self.assertEqual(self.table.get_default_value(attr_id), 3)
+
+    def test_unknown(self):
+        self.table.get_flags(6)
+        with self.assertRaises(AttributeFetchError):
+            self.table.get_flags(7)
+        with self.assertRaises(AttributeFetchError):
+            self.table.get_flags(-1)
+        with self.assertRaises(AttributeFetchError):
+            self.table.get_flags(None)
+
+    def test_clear(self):
+        self.table.get_flags(5)
+        self.table.clear()
+        self.table.get_flags(5)
+        self.assertEqual(self.getter.call_count, 2)
@@ -0,0 +1,189 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import gc
+from weakref import ref
+
+import pytest
+
+from eos.data.cache_handler import BinaryCacheHandler
+from eos.data.cache_handler.attribute_table import FLAG_LOADED, FLAG_CAPPED, FLAG_HIGH_IS_GOOD, FLAG_PENALIZABLE
+from eos.data.cache_handler.exception import TypeFetchError, AttributeFetchError, ModifierFetchError
+
+
+def make_data():
+    return {
+        'types': [
+            {'type_id': 1, 'group': 5, 'category': 6, 'attributes': {10: 5.5, 11: 2},
+             'effects': [100], 'default_effect': 100},
+            {'type_id': 2, 'group': None, 'category': None, 'attributes': {}, 'effects': [], 'default_effect': None}
+        ],
+        'attributes': [
+            {'attribute_id': 10, 'max_attribute': 11, 'default_value': 0.0, 'high_is_good': True,
+             'stackable': False},
+            {'attribute_id': 11, 'max_attribute': None, 'default_value': None, 'high_is_good': None,
+             'stackable': None}
+        ],
+        'effects': [
+            {'effect_id': 100, 'effect_category': 0, 'is_offensive': False, 'is_assistance': False,
+             'duration_attribute': None, 'discharge_attribute': None, 'range_attribute': 10,
+             'falloff_attribute': None, 'tracking_speed_attribute': None, 'fitting_usage_chance_attribute': None,
+             'build_status': 2, 'modifiers': [1000]}
+        ],
+        'modifiers': [
+            {'modifier_id': 1000, 'state': 1, 'scope': 0, 'src_attr': 10, 'operator': 3, 'tgt_attr': 11,
+             'domain': 2, 'filter_type': None, 'filter_value': None}
+        ]
+    }
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'cache' / 'eos.bin')
+
+
+def test_empty(cache_path):
+    cache_handler = BinaryCacheHandler(cache_path)
+    assert cache_handler.get_fingerprint() is None
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(1)
+
+
+def test_update(cache_path):
+    cache_handler = BinaryCacheHandler(cache_path)
+    cache_handler.update_cache(make_data(), 'fp1')
+    assert cache_handler.get_fingerprint() == 'fp1'
+    type_ = cache_handler.get_type(1)
+    assert type_.id == 1
+    assert type_.group == 5
+    assert type_.category == 6
+    assert type_.attributes == {10: 5.5, 11: 2}
+    assert len(type_.effects) == 1
+    effect = type_.effects[0]
+    assert effect is type_.default_effect
+    assert effect.id == 100
+    assert effect.range_attribute == 10
+    assert effect.is_offensive is False
+    modifier, = effect.modifiers
+    assert modifier.id == 1000
+    assert modifier.src_attr == 10
+    assert modifier.tgt_attr == 11
+    assert modifier.filter_type is None
+    attribute = cache_handler.get_attribute(10)
+    assert attribute.max_attribute == 11
+    assert attribute.high_is_good is True
+    assert cache_handler.get_type(2).default_effect is None
+    # Objects are reused while they are alive
+    assert cache_handler.get_type(1) is type_
+
+
+def test_reload(cache_path):
+    BinaryCacheHandler(cache_path).update_cache(make_data(), 'fp1')
+    cache_handler = BinaryCacheHandler(cache_path)
+    assert cache_handler.get_fingerprint() == 'fp1'
+    assert cache_handler.get_type('1').attributes == {10: 5.5, 11: 2}
+    assert cache_handler.get_modifier(1000).operator == 3
+
+
+def test_overwrite(cache_path):
+    cache_handler = BinaryCacheHandler(cache_path)
+    cache_handler.update_cache(make_data(), 'fp1')
+    data = make_data()
+    data['types'][0]['group'] = 8
+    del data['types'][1]
+    cache_handler.update_cache(data, 'fp2')
+    assert cache_handler.get_fingerprint() == 'fp2'
+    assert cache_handler.get_type(1).group == 8
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(2)
+
+
+def test_attribute_table(cache_path):
+    cache_handler = BinaryCacheHandler(cache_path)
+    cache_handler.update_cache(make_data(), 'fp1')
+    table = cache_handler.get_attribute_table()
+    assert table.get_flags(10) == FLAG_LOADED | FLAG_CAPPED | FLAG_HIGH_IS_GOOD | FLAG_PENALIZABLE
+    assert table.get_max_attribute(10) == 11
+    assert table.get_default_value(10) == 0.0
+    # Table is refreshed when data changes
+    data = make_data()
+    data['attributes'][0]['max_attribute'] = None
+    cache_handler.update_cache(data, 'fp2')
+    assert cache_handler.get_attribute_table().get_flags(10) == FLAG_LOADED | FLAG_HIGH_IS_GOOD | FLAG_PENALIZABLE
+
+
+def test_missing(cache_path):
+    cache_handler = BinaryCacheHandler(cache_path)
+    cache_handler.update_cache(make_data(), 'fp1')
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(3)
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(None)
+    with pytest.raises(AttributeFetchError):
+        cache_handler.get_attribute(0)
+    with pytest.raises(ModifierFetchError):
+        cache_handler.get_modifier(1001)
+
+
+def test_corrupt(cache_path, tmp_path):
+    (tmp_path / 'cache').mkdir()
+    with open(cache_path, 'wb') as file:
+        file.write(b'garbage')
+    cache_handler = BinaryCacheHandler(cache_path)
+    assert cache_handler.get_fingerprint() is None
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(1)
+
+
+def test_strong_cache(cache_path):
+    BinaryCacheHandler(cache_path).update_cache(make_data(), 'fp1')
+    cache_handler = BinaryCacheHandler(cache_path, strong_cache_size=1)
+    type_ref = ref(cache_handler.get_type(1))
+    gc.collect()
+    # Type is kept alive by strong tier
+    assert type_ref() is not None
+    assert cache_handler.get_type(1) is type_ref()
+    cache_handler.get_type(2)
+    stats = cache_handler.get_cache_stats()['types']
+    assert stats.strong_hits == 1
+    assert stats.misses == 2
+    assert stats.evictions == 1
+    assert stats.strong_size == 1
+
+
+def test_weak_cache(cache_path):
+    BinaryCacheHandler(cache_path).update_cache(make_data(), 'fp1')
+    cache_handler = BinaryCacheHandler(cache_path)
+    type_ = cache_handler.get_type(1)
+    assert cache_handler.get_type(1) is type_
+    stats = cache_handler.get_cache_stats()['types']
+    assert stats.weak_hits == 1
+    assert stats.strong_size == 0
+
+
+def test_generation_state(cache_path):
+    data = make_data()
+    data['generation_state'] = {'eos_version': '1', 'effects': {'100': ['abc', 2, [{'state': 1}]]}}
+    cache_handler = BinaryCacheHandler(cache_path)
+    assert cache_handler.get_generation_state() is None
+    cache_handler.update_cache(data, 'fp1')
+    cache_handler = BinaryCacheHandler(cache_path)
+    assert cache_handler.get_generation_state() == {'eos_version': '1', 'effects': {'100': ('abc', 2, ({'state': 1},))}}
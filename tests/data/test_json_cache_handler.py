@@ -0,0 +1,143 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import bz2
+import gc
+import json
+import os.path
+from tempfile import TemporaryDirectory
+from weakref import ref
+
+from eos.data.cache_handler import JsonCacheHandler
+from eos.data.cache_handler.exception import TypeFetchError
+from tests.eos_testcase import EosTestCase
+
+
+def make_data():
+    return {
+        'types': [
+            {'type_id': 1, 'group': 5, 'category': 6, 'attributes': {10: 5.5},
+             'effects': [], 'default_effect': None},
+            {'type_id': 2, 'group': None, 'category': None, 'attributes': {}, 'effects': [], 'default_effect': None}
+        ],
+        'attributes': [
+            {'attribute_id': 10, 'max_attribute': None, 'default_value': 0.0, 'high_is_good': True,
+             'stackable': False}
+        ],
+        'effects': [],
+        'modifiers': []
+    }
+
+
+class TestJsonCacheHandler(EosTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = TemporaryDirectory()
+        self.cache_path = os.path.join(self.cache_dir.name, 'eos.json.bz2')
+        JsonCacheHandler(self.cache_path).update_cache(make_data(), 'fp1')
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+        super().tearDown()
+
+    def test_load(self):
+        cache_handler = JsonCacheHandler(self.cache_path)
+        self.assertEqual(cache_handler.get_fingerprint(), 'fp1')
+        type_ = cache_handler.get_type(1)
+        self.assertEqual(type_.group, 5)
+        self.assertEqual(type_.attributes, {10: 5.5})
+        with self.assertRaises(TypeFetchError):
+            cache_handler.get_type(3)
+        self.assertEqual(len(self.log), 0)
+
+    def test_strong_cache(self):
+        cache_handler = JsonCacheHandler(self.cache_path, strong_cache_size=1)
+        type_ref = ref(cache_handler.get_type(1))
+        gc.collect()
+        # Type is kept alive by strong tier
+        self.assertIsNotNone(type_ref())
+        self.assertIs(cache_handler.get_type(1), type_ref())
+        # Loading other type evicts the first one
+        cache_handler.get_type(2)
+        gc.collect()
+        self.assertIsNone(type_ref())
+        stats = cache_handler.get_cache_stats()['types']
+        self.assertEqual(stats.strong_hits, 1)
+        self.assertEqual(stats.weak_hits, 0)
+        self.assertEqual(stats.misses, 2)
+        self.assertEqual(stats.evictions, 1)
+        self.assertEqual(stats.strong_size, 1)
+        self.assertEqual(len(self.log), 0)
+
+    def test_weak_cache(self):
+        cache_handler = JsonCacheHandler(self.cache_path)
+        type_ = cache_handler.get_type(1)
+        self.assertIs(cache_handler.get_type(1), type_)
+        type_ref = ref(type_)
+        del type_
+        gc.collect()
+        self.assertIsNone(type_ref())
+        stats = cache_handler.get_cache_stats()['types']
+        self.assertEqual(stats.weak_hits, 1)
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.strong_size, 0)
+        self.assertEqual(len(self.log), 0)
+
+    def test_cache_stats_kinds(self):
+        cache_handler = JsonCacheHandler(self.cache_path, strong_cache_size=2)
+        cache_handler.get_attribute(10)
+        stats = cache_handler.get_cache_stats()
+        self.assertEqual(set(stats), {'types', 'attributes', 'effects', 'modifiers'})
+        self.assertEqual(stats['attributes'].misses, 1)
+        self.assertEqual(stats['attributes'].strong_size, 1)
+        self.assertEqual(stats['types'].misses, 0)
+        self.assertEqual(len(self.log), 0)
+
+    def test_update_clears_objects(self):
+        cache_handler = JsonCacheHandler(self.cache_path, strong_cache_size=2)
+        type_ = cache_handler.get_type(1)
+        # Action
+        cache_handler.update_cache(make_data(), 'fp2')
+        # Checks
+        self.assertIsNot(cache_handler.get_type(1), type_)
+        self.assertEqual(cache_handler.get_cache_stats()['types'].strong_size, 1)
+        self.assertEqual(len(self.log), 0)
+
+    def test_generation_state(self):
+        cache_handler = JsonCacheHandler(self.cache_path)
+        self.assertIsNone(cache_handler.get_generation_state())
+        data = make_data()
+        data['generation_state'] = {'eos_version': '1', 'effects': {'100': ['abc', 2, [{'state': 1}]]}}
+        # Action
+        cache_handler.update_cache(data, 'fp2')
+        # Checks
+        self.assertEqual(
+            JsonCacheHandler(self.cache_path).get_generation_state(),
+            {'eos_version': '1', 'effects': {'100': ['abc', 2, [{'state': 1}]]}})
+        # State is kept out of the main cache file
+        with bz2.BZ2File(self.cache_path, 'r') as file:
+            self.assertNotIn('generation_state', json.loads(file.read().decode('utf-8')))
+        # Action
+        cache_handler.update_cache(make_data(), 'fp3')
+        # Checks
+        self.assertIsNone(cache_handler.get_generation_state())
+        self.assertEqual(len(self.log), 0)
@@ -19,11 +19,14 @@
 # ===============================================================================
 
 
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Thread
+
 import pytest
 
 from eos import SourceManager
 from eos.data.source import Source
-from eos.data.exception import ExistingSourceError, UnknownSourceError
+from eos.data.exception import ExistingSourceError, SourceNotReadyError, UnknownSourceError
 from unittest.mock import MagicMock, Mock
 
 
@@ -41,12 +44,16 @@ def mock_cache_handler():
 
 def setup_function():
     SourceManager._sources = {}
+    SourceManager._pending = {}
     SourceManager.default = None
+    SourceManager._default_alias = None
 
 
 def teardown_function():
     SourceManager._sources = {}
+    SourceManager._pending = {}
     SourceManager.default = None
+    SourceManager._default_alias = None
 
 
 def test_add_existing_source_error(mock_data_handler, mock_cache_handler):
@@ -125,3 +132,130 @@ def test_list_sources_correctly(mock_data_handler, mock_cache_handler):
     sources = SourceManager.list()
 
     assert sorted(sources) == sorted(['source one', 'source two', 'source three'])
+
+
+def test_add_lazy_defers_preparation(mock_data_handler, mock_cache_handler):
+    SourceManager.add('test', mock_data_handler, mock_cache_handler, lazy=True)
+
+    assert not mock_cache_handler.get_fingerprint.called
+    assert not mock_cache_handler.update_cache.called
+    assert SourceManager.list() == ['test']
+
+
+def test_add_lazy_existing_source_error(mock_data_handler, mock_cache_handler):
+    SourceManager.add('test', mock_data_handler, mock_cache_handler, lazy=True)
+
+    with pytest.raises(ExistingSourceError):
+        SourceManager.add('test', mock_data_handler, mock_cache_handler)
+
+
+def test_get_lazy_source(mock_data_handler, mock_cache_handler):
+    alias = 'test'
+    source = Source(alias=alias, cache_handler=mock_cache_handler)
+    SourceManager.add(alias, mock_data_handler, mock_cache_handler, lazy=True)
+
+    result = SourceManager.get(alias)
+
+    assert result == source
+    assert SourceManager.get(alias) is result
+    assert mock_cache_handler.get_fingerprint.call_count == 1
+    assert SourceManager._pending == {}
+
+
+def test_get_lazy_source_factory(mock_data_handler, mock_cache_handler):
+    factory = Mock(return_value=mock_cache_handler, spec_set=())
+    SourceManager.add('test', mock_data_handler, factory, lazy=True)
+
+    assert not factory.called
+    result = SourceManager.get('test')
+
+    assert factory.call_count == 1
+    assert result.cache_handler is mock_cache_handler
+
+
+def test_get_lazy_source_threads(mock_data_handler, mock_cache_handler):
+    SourceManager.add('test', mock_data_handler, mock_cache_handler, lazy=True)
+    results = []
+    threads = [Thread(target=lambda: results.append(SourceManager.get('test'))) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+    assert mock_cache_handler.get_fingerprint.call_count == 1
+
+
+def test_lazy_default(mock_data_handler, mock_cache_handler):
+    SourceManager.add('test', mock_data_handler, mock_cache_handler, make_default=True, lazy=True)
+
+    assert SourceManager.default is None
+    source = SourceManager.get_default()
+
+    assert source == Source(alias='test', cache_handler=mock_cache_handler)
+    assert SourceManager.default is source
+
+
+def test_removing_lazy_source(mock_data_handler, mock_cache_handler):
+    SourceManager.add('test', mock_data_handler, mock_cache_handler, make_default=True, lazy=True)
+    SourceManager.remove('test')
+
+    assert SourceManager.list() == []
+    assert SourceManager.get_default() is None
+    with pytest.raises(UnknownSourceError):
+        SourceManager.get('test')
+
+
+def test_add_async(mock_data_handler, mock_cache_handler):
+    future = SourceManager.add_async('test', mock_data_handler, mock_cache_handler)
+
+    source = future.result(5)
+
+    assert source == Source(alias='test', cache_handler=mock_cache_handler)
+    assert SourceManager.get('test') is source
+    assert mock_cache_handler.get_fingerprint.call_count == 1
+
+
+def test_add_async_executor(mock_data_handler, mock_cache_handler):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = SourceManager.add_async('test', mock_data_handler, mock_cache_handler, executor=executor)
+        source = future.result(5)
+
+    assert SourceManager.get('test') is source
+
+
+def test_add_async_existing_source_error(mock_data_handler, mock_cache_handler):
+    SourceManager.add('test', mock_data_handler, mock_cache_handler)
+
+    with pytest.raises(ExistingSourceError):
+        SourceManager.add_async('test', mock_data_handler, mock_cache_handler)
+
+
+def test_get_async_waits(mock_data_handler, mock_cache_handler):
+    release = Event()
+    mock_data_handler.get_version.side_effect = lambda: release.wait(5) and '1'
+    SourceManager.add_async('test', mock_data_handler, mock_cache_handler, make_default=True)
+
+    assert SourceManager.list() == ['test']
+    with pytest.raises(SourceNotReadyError):
+        SourceManager.get('test', timeout=0.01)
+    release.set()
+    source = SourceManager.get('test')
+
+    assert source == Source(alias='test', cache_handler=mock_cache_handler)
+    assert SourceManager.get_default() is source
+    assert mock_cache_handler.get_fingerprint.call_count == 1
+
+
+def test_add_async_failure(mock_data_handler, mock_cache_handler):
+    mock_cache_handler.get_fingerprint.side_effect = RuntimeError('broken cache')
+    future = SourceManager.add_async('test', mock_data_handler, mock_cache_handler, make_default=True)
+
+    with pytest.raises(RuntimeError):
+        future.result(5)
+    assert SourceManager.list() == []
+    assert SourceManager.get_default() is None
+    with pytest.raises(UnknownSourceError):
+        SourceManager.get('test')
@@ -19,6 +19,7 @@
 # ===============================================================================
 
 
+from eos.data.cache_handler.attribute_table import AttributeTable
 from eos.data.cache_handler.exception import TypeFetchError, AttributeFetchError, EffectFetchError
 from eos.data.cache_object import Attribute, Effect, Type
 
@@ -29,6 +30,7 @@ class CacheHandler:
         self.__type_data = {}
         self.__attribute_data = {}
         self.__effect_data = {}
+        self.__attribute_table = AttributeTable(self.get_attribute)
 
     def type_(self, **kwargs):
         type_ = Type(**kwargs)
@@ -63,6 +65,9 @@ class CacheHandler:
         except KeyError:
             raise AttributeFetchError(attr)
 
+    def get_attribute_table(self):
+        return self.__attribute_table
+
     def get_effect(self, eff_id):
         try:
             return self.__effect_data[eff_id]
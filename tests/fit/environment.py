@@ -30,6 +30,7 @@ class Holder:
 
     def __init__(self):
         self._fit = None
+        self._type_id = None
 
 
 class Fit(FitBase):
@@ -60,6 +61,10 @@ class Fit(FitBase):
         self.message_store.append(message)
         FitBase._publish(self, message)
 
+    def _publish_many(self, messages):
+        for message in messages:
+            self._publish(message)
+
 
 class FitAssertion:
 
@@ -36,7 +36,10 @@ class FitTestCase(EosTestCase):
     def assert_fit_buffers_empty(self, fit):
         holder_num = 0
         holder_num += self._get_object_buffer_entry_amount(
-            fit, ignore=('message_store', '_message_assertions', '_MessageBroker__subscribers'))
+            fit, ignore=(
+                'message_store', '_message_assertions', '_MessageBroker__subscribers',
+                '_MessageBroker__dispatch'
+            ))
         # As volatile manager always has one entry added to it
         # (stats service), make sure it's ignored for calculation
         # purposes
@@ -0,0 +1,92 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos import State, Ship, Character, Skill, Implant, Drone, ModuleHigh, ModuleLow, Charge
+from eos.fit.skill_profile import SkillProfile
+from tests.fit.environment import Fit
+from tests.fit.fit_testcase import FitTestCase
+
+
+class TestClone(FitTestCase):
+
+    def test_holders(self):
+        fit = Fit()
+        fit.ship = Ship(1)
+        fit.character = Character(2)
+        fit.skills.add(Skill(3, level=4))
+        fit.implants.add(Implant(5))
+        fit.drones.add(Drone(6, state=State.active))
+        fit.modules.high.place(2, ModuleHigh(7, state=State.online, charge=Charge(8)))
+        fit.modules.low.append(ModuleLow(9))
+        fit.skill_profile = SkillProfile({10: 3})
+        # Action
+        clone = fit.clone()
+        # Checks
+        self.assertIsNot(clone.ship, fit.ship)
+        self.assertIs(clone.ship._fit, clone)
+        self.assertEqual(clone.ship._type_id, 1)
+        self.assertEqual(clone.character._type_id, 2)
+        self.assertEqual(len(clone.skills), 1)
+        skill = clone.skills[3]
+        self.assertEqual(skill.level, 4)
+        self.assertEqual([i._type_id for i in clone.implants], [5])
+        drone = next(iter(clone.drones))
+        self.assertEqual(drone._type_id, 6)
+        self.assertEqual(drone.state, State.active)
+        self.assertEqual(len(clone.modules.high), 3)
+        self.assertIsNone(clone.modules.high[0])
+        module = clone.modules.high[2]
+        self.assertIsNot(module, fit.modules.high[2])
+        self.assertEqual(module._type_id, 7)
+        self.assertEqual(module.state, State.online)
+        self.assertEqual(module.charge._type_id, 8)
+        self.assertIs(module.charge.container, module)
+        self.assertIs(module.charge._fit, clone)
+        self.assertEqual(clone.modules.low[0]._type_id, 9)
+        self.assertIs(clone.skill_profile, fit.skill_profile)
+        # Changes to clone do not touch original fit
+        module.state = State.offline
+        self.assertEqual(fit.modules.high[2].state, State.online)
+        # Misc
+        for f in (fit, clone):
+            f.ship = None
+            f.character = None
+            f.skills.clear()
+            f.implants.clear()
+            f.drones.clear()
+            f.modules.high.clear()
+            f.modules.low.clear()
+            f.skill_profile = None
+            self.assert_fit_buffers_empty(f)
+
+    def test_values(self):
+        fit = Fit()
+        fit.ship = Ship(1)
+        # Action
+        clone = fit.clone()
+        # Checks
+        holder_map = {fit.ship: clone.ship}
+        clone._calculator.copy_values.assert_called_once_with(fit._calculator, holder_map)
+        # Misc
+        fit.ship = None
+        clone.ship = None
+        self.assert_fit_buffers_empty(fit)
+        self.assert_fit_buffers_empty(clone)
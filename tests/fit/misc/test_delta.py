@@ -0,0 +1,89 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos import State, Ship, Charge, Drone, ModuleHigh
+from tests.fit.environment import Fit
+from tests.fit.fit_testcase import FitTestCase
+
+
+class TestEvaluateDelta(FitTestCase):
+
+    def get_holders(self, fit):
+        return (
+            fit.ship._type_id,
+            sorted((d._type_id, d.state) for d in fit.drones),
+            [(m._type_id, m.state) if m is not None else None for m in fit.modules.high]
+        )
+
+    def test_changes(self):
+        fit = Fit()
+        fit.ship = Ship(1)
+        drone = Drone(2, state=State.online)
+        fit.drones.add(drone)
+        module1 = ModuleHigh(3)
+        module2 = ModuleHigh(4)
+        fit.modules.high.append(module1)
+        fit.modules.high.append(module2)
+        added_module = ModuleHigh(5)
+        fit.message_store.clear()
+        # Action
+        delta = fit.evaluate_delta(
+            self.get_holders, add=(added_module, Ship(6)), remove=(module1, fit.ship),
+            state_changes={drone: State.active, added_module: State.online})
+        # Checks
+        self.assertEqual(delta.base, (1, [(2, State.online)], [(3, State.offline), (4, State.offline)]))
+        self.assertEqual(delta.changed, (6, [(2, State.active)], [(5, State.online), (4, State.offline)]))
+        self.assertEqual(len(fit.message_store), 0)
+        self.assertIsNone(added_module._fit)
+        self.assertEqual(added_module.state, State.offline)
+        self.assertEqual(drone.state, State.online)
+        # Misc
+        fit.ship = None
+        fit.drones.clear()
+        fit.modules.high.clear()
+        self.assert_fit_buffers_empty(fit)
+
+    def test_foreign_holder(self):
+        fit = Fit()
+        fit.ship = Ship(1)
+        fit.message_store.clear()
+        # Action
+        with self.assertRaises(ValueError):
+            fit.evaluate_delta(self.get_holders, remove=(Drone(2),))
+        with self.assertRaises(ValueError):
+            fit.evaluate_delta(self.get_holders, add=(fit.ship,))
+        with self.assertRaises(ValueError):
+            fit.evaluate_delta(self.get_holders, state_changes={Drone(2): State.active})
+        # Checks
+        self.assertEqual(len(fit.message_store), 0)
+        # Misc
+        fit.ship = None
+        self.assert_fit_buffers_empty(fit)
+
+    def test_unsupported_class(self):
+        fit = Fit()
+        fit.ship = Ship(1)
+        # Action
+        with self.assertRaises(TypeError):
+            fit.evaluate_delta(self.get_holders, add=(Charge(2),))
+        # Misc
+        fit.ship = None
+        self.assert_fit_buffers_empty(fit)
@@ -21,6 +21,7 @@
 
 from unittest.mock import call
 
+from eos import Rig
 from tests.fit.fit_testcase import FitTestCase
 from tests.fit.environment import Fit
 
@@ -34,3 +35,38 @@ class TestMiscellanea(FitTestCase):
         rs_calls_after = len(fit._restriction.mock_calls)
         self.assertEqual(rs_calls_after - rs_calls_before, 1)
         self.assertEqual(fit._restriction.mock_calls[-1], call.validate(()))
+
+    def test_materialize(self):
+        fit = Fit()
+        fit._calculator.reset_mock()
+        fit.materialize()
+        self.assertEqual(fit._calculator.mock_calls, [call.materialize()])
+
+    def test_eager(self):
+        fit = Fit()
+        self.assertIs(fit.eager, False)
+        fit._calculator.reset_mock()
+        fit.eager = True
+        self.assertEqual(fit._calculator.mock_calls, [call.materialize()])
+        fit._calculator.reset_mock()
+        fit.rigs.add(Rig(1))
+        self.assertEqual(fit._calculator.mock_calls[-1], call.materialize())
+
+    def test_eager_batch(self):
+        fit = Fit()
+        fit.eager = True
+        fit._calculator.reset_mock()
+        with fit.batch():
+            fit.rigs.add(Rig(1))
+            fit.rigs.add(Rig(2))
+            self.assertNotIn(call.materialize(), fit._calculator.mock_calls)
+        self.assertEqual(fit._calculator.mock_calls[-1], call.materialize())
+
+    def test_instrumentation(self):
+        fit = Fit()
+        fit._calculator.reset_mock()
+        self.assertIs(fit.enable_instrumentation(), fit._calculator.enable_instrumentation.return_value)
+        self.assertIs(fit.instrumentation, fit._calculator.instrumentation)
+        self.assertIs(fit.disable_instrumentation(), fit._calculator.disable_instrumentation.return_value)
+        self.assertEqual(
+            fit._calculator.mock_calls, [call.enable_instrumentation(), call.disable_instrumentation()])
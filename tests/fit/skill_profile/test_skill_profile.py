@@ -0,0 +1,196 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import gc
+from weakref import ref
+
+from eos import Skill
+from eos.const.eve import Type
+from eos.data.source import Source
+from eos.fit.messages import ProfileSkillsAdded, ProfileSkillsRemoved
+from eos.fit.skill_profile import SkillProfile
+from tests.environment import CacheHandler
+from tests.fit.environment import Fit
+from tests.fit.fit_testcase import FitTestCase
+
+
+class TestSkillProfile(FitTestCase):
+
+    def test_map(self):
+        profile = SkillProfile({3: 5, 1: 2.0})
+        self.assertEqual(len(profile), 2)
+        self.assertEqual(list(profile), [1, 3])
+        self.assertEqual(list(profile.items()), [(1, 2), (3, 5)])
+        self.assertEqual(profile[3], 5)
+        self.assertIs(type(profile[1]), int)
+        self.assertIn(1, profile)
+        self.assertNotIn(2, profile)
+        self.assertIsNone(profile.get(2))
+        self.assertEqual(profile.get(2, 0), 0)
+        with self.assertRaises(KeyError):
+            profile[2]
+
+    def test_pairs(self):
+        profile = SkillProfile(((5, 1), (4, 3), (5, 2)))
+        self.assertEqual(list(profile.items()), [(4, 3), (5, 2)])
+
+    def test_invalid_level(self):
+        for level in (-1, 6, 128):
+            with self.assertRaises(ValueError):
+                SkillProfile({1: level})
+
+    def make_source(self):
+        self.ch.type_(type_id=Type.character_static)
+        self.ch.type_(type_id=1)
+        self.ch.type_(type_id=2)
+        return Source('test', self.ch)
+
+    def test_assignment(self):
+        profile = SkillProfile({1: 5, 2: 3})
+        source = self.make_source()
+        fit = Fit(source=source)
+        fit.message_store.clear()
+        # Action
+        fit.skill_profile = profile
+        # Checks
+        self.assertIs(fit.skill_profile, profile)
+        self.assertEqual(len(fit.message_store), 1)
+        message = fit.message_store[0]
+        self.assertIsInstance(message, ProfileSkillsAdded)
+        skills = message.holders
+        self.assertEqual(sorted((s._type_id, s.level) for s in skills), [(1, 5), (2, 3)])
+        for skill in skills:
+            self.assertIs(skill.item, self.ch.get_type(skill._type_id))
+        # Action
+        fit.skill_profile = profile
+        # Checks
+        self.assertEqual(len(fit.message_store), 1)
+        # Action
+        fit.skill_profile = None
+        # Checks
+        self.assertIsNone(fit.skill_profile)
+        self.assertEqual(len(fit.message_store), 2)
+        self.assertEqual(fit.message_store[1], ProfileSkillsRemoved(skills))
+        # Misc
+        fit.source = None
+        self.assert_fit_buffers_empty(fit)
+
+    def test_no_source(self):
+        profile = SkillProfile({1: 5})
+        source = self.make_source()
+        fit = Fit(source=None)
+        fit.message_store.clear()
+        # Action
+        fit.skill_profile = profile
+        # Checks
+        self.assertEqual(len(fit.message_store), 0)
+        # Action
+        fit.source = source
+        # Checks
+        message = fit.message_store[-2]
+        self.assertIsInstance(message, ProfileSkillsAdded)
+        self.assertEqual(message.holders, (profile._get_skills(source)[1],))
+        # Misc
+        fit.skill_profile = None
+        fit.source = None
+        self.assert_fit_buffers_empty(fit)
+
+    def test_shared(self):
+        profile = SkillProfile({1: 5})
+        source = self.make_source()
+        fit1 = Fit(source=source)
+        fit2 = Fit(source=source)
+        fit1.message_store.clear()
+        fit2.message_store.clear()
+        # Action
+        fit1.skill_profile = profile
+        fit2.skill_profile = profile
+        # Checks
+        skill1, = fit1.message_store[0].holders
+        skill2, = fit2.message_store[0].holders
+        self.assertIs(skill1, skill2)
+        # Misc
+        fit1.skill_profile = None
+        fit2.skill_profile = None
+        fit1.source = None
+        fit2.source = None
+        self.assert_fit_buffers_empty(fit1)
+        self.assert_fit_buffers_empty(fit2)
+
+    def test_fit_skill_precedence(self):
+        profile = SkillProfile({1: 5, 2: 3})
+        source = self.make_source()
+        fit = Fit(source=source)
+        fit.skill_profile = profile
+        profile_skill = profile._get_skills(source)[1]
+        skill = Skill(1, level=2)
+        fit.message_store.clear()
+        # Action
+        fit.skills.add(skill)
+        # Checks
+        self.assertIn(ProfileSkillsRemoved((profile_skill,)), fit.message_store)
+        fit.message_store.clear()
+        # Action
+        fit.skills.remove(skill)
+        # Checks
+        self.assertIn(ProfileSkillsAdded((profile_skill,)), fit.message_store)
+        # Misc
+        fit.skill_profile = None
+        fit.source = None
+        self.assert_fit_buffers_empty(fit)
+
+    def test_fit_skill_precedence_profile_assignment(self):
+        profile = SkillProfile({1: 5, 2: 3})
+        source = self.make_source()
+        fit = Fit(source=source)
+        skill = Skill(1, level=2)
+        fit.skills.add(skill)
+        fit.message_store.clear()
+        # Action
+        fit.skill_profile = profile
+        # Checks
+        self.assertEqual(fit.message_store, [ProfileSkillsAdded((profile._get_skills(source)[2],))])
+        # Misc
+        fit.skills.remove(skill)
+        fit.skill_profile = None
+        fit.source = None
+        self.assert_fit_buffers_empty(fit)
+
+    def test_source_release(self):
+        profile = SkillProfile({1: 5})
+        cache_handler = CacheHandler()
+        cache_handler.type_(type_id=1)
+        skill = profile._get_skills(Source('other', cache_handler))[1]
+        self.assertEqual(skill.level, 5)
+        self.assertIs(profile._get_skills(Source('other', cache_handler))[1], skill)
+        skill_ref = ref(skill)
+        handler_ref = ref(cache_handler)
+        # Action
+        del skill
+        del cache_handler
+        gc.collect()
+        # Checks
+        self.assertIsNone(handler_ref())
+        self.assertEqual(len(profile._SkillProfile__skills), 0)
+        # Skills with their context form reference cycle, which
+        # is unreachable only after its entry has been evicted
+        gc.collect()
+        self.assertIsNone(skill_ref())
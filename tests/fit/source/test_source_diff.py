@@ -0,0 +1,73 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from eos.data.source import Source
+from eos.fit.source_diff import SourceDiff
+from tests.environment import CacheHandler
+from tests.eos_testcase import EosTestCase
+
+
+class TestSourceDiff(EosTestCase):
+
+    def make_source(self, tgt_value=100, operator=Operator.post_mul, stackable=None):
+        ch = CacheHandler()
+        ch.attribute(attribute_id=1)
+        ch.attribute(attribute_id=2, stackable=stackable)
+        modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=1, operator=operator,
+            tgt_attr=2, domain=Domain.self_)
+        effect = ch.effect(effect_id=1, category=EffectCategory.passive, modifiers=(modifier,))
+        ch.type_(type_id=1, effects=(effect,), attributes={1: 5, 2: tgt_value})
+        ch.type_(type_id=2, attributes={2: 10})
+        return Source('test', ch)
+
+    def test_equal(self):
+        diff = SourceDiff(self.make_source(), self.make_source())
+        self.assertIs(diff.type_changed(1), False)
+        self.assertIs(diff.type_changed(2), False)
+        self.assertIs(diff.attributes_changed((1, 2)), False)
+
+    def test_type_attributes(self):
+        diff = SourceDiff(self.make_source(), self.make_source(tgt_value=50))
+        self.assertIs(diff.type_changed(1), True)
+        self.assertIs(diff.type_changed(2), False)
+
+    def test_modifier(self):
+        diff = SourceDiff(self.make_source(), self.make_source(operator=Operator.post_percent))
+        self.assertIs(diff.type_changed(1), True)
+        self.assertIs(diff.type_changed(2), False)
+
+    def test_type_missing(self):
+        diff = SourceDiff(self.make_source(), self.make_source())
+        self.assertIs(diff.type_changed(3), True)
+
+    def test_attribute_metadata(self):
+        diff = SourceDiff(self.make_source(), self.make_source(stackable=False))
+        self.assertIs(diff.type_changed(1), False)
+        self.assertIs(diff.attributes_changed((1,)), False)
+        self.assertIs(diff.attributes_changed((1, 2)), True)
+
+    def test_attribute_missing(self):
+        diff = SourceDiff(self.make_source(), self.make_source())
+        self.assertIs(diff.attributes_changed((1, 3)), True)
@@ -22,7 +22,9 @@
 from unittest.mock import Mock, patch
 
 from eos.data.source import Source
-from eos.fit.messages import HolderAdded, HolderRemoved, EnableServices, DisableServices, RefreshSource
+from eos.fit.messages import (
+    HolderAdded, HolderRemoved, EnableServices, DisableServices, RefreshSource, EnableHolders, DisableHolders
+)
 from tests.fit.environment import Fit, Holder
 from tests.fit.fit_testcase import FitTestCase
 
@@ -31,7 +33,7 @@ from tests.fit.fit_testcase import FitTestCase
 class FitSourceSwitch(FitTestCase):
 
     def test_none_to_none(self, source_mgr):
-        source_mgr.default = None
+        source_mgr.get_default.return_value = None
         holder = Holder()
         fit = Fit(source=None)
         fit._publish(HolderAdded(holder))
@@ -47,7 +49,7 @@ class FitSourceSwitch(FitTestCase):
         self.assert_fit_buffers_empty(fit)
 
     def test_none_to_source(self, source_mgr):
-        source_mgr.default = None
+        source_mgr.get_default.return_value = None
         source = Mock(spec_set=Source)
         holder = Holder()
         assertions = {
@@ -73,7 +75,7 @@ class FitSourceSwitch(FitTestCase):
         self.assert_fit_buffers_empty(fit)
 
     def test_source_to_none(self, source_mgr):
-        source_mgr.default = None
+        source_mgr.get_default.return_value = None
         source = Mock(spec_set=Source)
         holder = Holder()
         assertions = {
@@ -99,7 +101,7 @@ class FitSourceSwitch(FitTestCase):
         self.assert_fit_buffers_empty(fit)
 
     def test_source_to_source(self, source_mgr):
-        source_mgr.default = None
+        source_mgr.get_default.return_value = None
         source1 = Mock(spec_set=Source)
         source2 = Mock(spec_set=Source)
         holder = Holder()
@@ -130,7 +132,7 @@ class FitSourceSwitch(FitTestCase):
         self.assert_fit_buffers_empty(fit)
 
     def test_source_to_source_same(self, source_mgr):
-        source_mgr.default = None
+        source_mgr.get_default.return_value = None
         source = Mock(spec_set=Source)
         holder = Holder()
         fit = Fit(source=source)
@@ -149,7 +151,7 @@ class FitSourceSwitch(FitTestCase):
     def test_none_to_literal_source(self, source_mgr):
         source = Mock(spec_set=Source)
         source_mgr.get.side_effect = lambda alias: source if alias == 'src_alias' else None
-        source_mgr.default = None
+        source_mgr.get_default.return_value = None
         holder = Holder()
         assertions = {
             RefreshSource: lambda f: self.assertIs(f.source, source),
@@ -172,3 +174,97 @@ class FitSourceSwitch(FitTestCase):
         # Misc
         fit._publish(HolderRemoved(holder))
         self.assert_fit_buffers_empty(fit)
+
+    def make_holder(self, type_id):
+        holder = Holder()
+        holder._type_id = type_id
+        holder.attributes = Mock(_values={}, _plans={})
+        holder._refresh_source = Mock()
+        return holder
+
+    def test_source_to_source_incremental(self, source_mgr):
+        source_mgr.get_default.return_value = None
+        same_type = Mock()
+        source1 = Mock(spec_set=Source)
+        source1.cache_handler.get_type.side_effect = lambda type_id: same_type if type_id == 1 else Mock()
+        source2 = Mock(spec_set=Source)
+        source2.cache_handler.get_type.side_effect = lambda type_id: same_type if type_id == 1 else Mock()
+        holder_kept = self.make_holder(1)
+        holder_changed = self.make_holder(2)
+        assertions = {
+            DisableHolders: lambda f: self.assertIs(f.source, source1),
+            EnableHolders: lambda f: self.assertIs(f.source, source2)
+        }
+        fit = Fit(source=source1, message_assertions=assertions)
+        fit._publish(HolderAdded(holder_kept))
+        fit._publish(HolderAdded(holder_changed))
+        messages_before = len(fit.message_store)
+        # Action
+        with self.fit_assertions(fit):
+            fit.source = source2
+        # Checks
+        messages_after = len(fit.message_store)
+        self.assertEqual(messages_after - messages_before, 2)
+        message1 = fit.message_store[-2]
+        self.assertTrue(isinstance(message1, DisableHolders))
+        self.assertEqual(message1.holders, {holder_changed})
+        message2 = fit.message_store[-1]
+        self.assertTrue(isinstance(message2, EnableHolders))
+        self.assertEqual(message2.holders, {holder_changed})
+        self.assertEqual(holder_changed._refresh_source.call_count, 1)
+        self.assertEqual(holder_kept._refresh_source.call_count, 0)
+        self.assertIs(fit.source, source2)
+        # Misc
+        fit._publish(HolderRemoved(holder_kept))
+        fit._publish(HolderRemoved(holder_changed))
+        self.assert_fit_buffers_empty(fit)
+
+    def test_source_to_source_incremental_attr_metadata(self, source_mgr):
+        source_mgr.get_default.return_value = None
+        same_type = Mock()
+        source1 = Mock(spec_set=Source)
+        source1.cache_handler.get_type.return_value = same_type
+        source2 = Mock(spec_set=Source)
+        source2.cache_handler.get_type.return_value = same_type
+        holder = self.make_holder(1)
+        holder.attributes._values[5] = 10
+        fit = Fit(source=source1)
+        fit._publish(HolderAdded(holder))
+        messages_before = len(fit.message_store)
+        # Action
+        with self.fit_assertions(fit):
+            fit.source = source2
+        # Checks
+        messages_after = len(fit.message_store)
+        self.assertEqual(messages_after - messages_before, 3)
+        self.assertTrue(isinstance(fit.message_store[-3], DisableServices))
+        self.assertTrue(isinstance(fit.message_store[-2], RefreshSource))
+        self.assertTrue(isinstance(fit.message_store[-1], EnableServices))
+        # Misc
+        fit._publish(HolderRemoved(holder))
+        self.assert_fit_buffers_empty(fit)
+
+    def test_source_to_source_incremental_attr_metadata_plan(self, source_mgr):
+        source_mgr.get_default.return_value = None
+        same_type = Mock()
+        source1 = Mock(spec_set=Source)
+        source1.cache_handler.get_type.return_value = same_type
+        source2 = Mock(spec_set=Source)
+        source2.cache_handler.get_type.return_value = same_type
+        holder = self.make_holder(1)
+        holder.attributes._plans[5] = Mock()
+        fit = Fit(source=source1)
+        fit._publish(HolderAdded(holder))
+        messages_before = len(fit.message_store)
+        # Action
+        with self.fit_assertions(fit):
+            fit.source = source2
+        # Checks
+        messages_after = len(fit.message_store)
+        self.assertEqual(messages_after - messages_before, 3)
+        self.assertTrue(isinstance(fit.message_store[-3], DisableServices))
+        self.assertTrue(isinstance(fit.message_store[-2], RefreshSource))
+        self.assertTrue(isinstance(fit.message_store[-1], EnableServices))
+        # Misc
+        fit._publish(HolderRemoved(holder))
+        self.assert_fit_buffers_empty(fit)
@@ -0,0 +1,96 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import Mock, call
+
+from eos.fit.messages import HolderAdded, HolderRemoved, HolderStateChanged, StartBatch, CommitBatch
+from eos.util.volatile_cache import InheritableVolatileMixin
+from tests.fit.environment import Fit
+from tests.fit.fit_testcase import FitTestCase
+
+
+class TestVolatileBatch(FitTestCase):
+
+    def test_messages(self):
+        fit = Fit()
+        fit.message_store.clear()
+        # Action
+        with fit.batch():
+            with fit.batch():
+                pass
+            self.assertEqual(fit.message_store, [StartBatch()])
+        # Checks
+        self.assertEqual(fit.message_store, [StartBatch(), CommitBatch()])
+        # Misc
+        self.assert_fit_buffers_empty(fit)
+
+    def test_single_clear(self):
+        # Setup
+        holder = Mock(spec=InheritableVolatileMixin)
+        fit = Fit()
+        fit._publish(HolderAdded(holder))
+        holder_calls_before = len(holder.mock_calls)
+        ss_calls_before = len(fit.stats.mock_calls)
+        # Action
+        with fit.batch():
+            fit._publish(HolderStateChanged(None, None, None))
+            fit._publish(HolderStateChanged(None, None, None))
+            fit._publish(HolderAdded(Mock()))
+            self.assertEqual(len(holder.mock_calls), holder_calls_before)
+        # Checks
+        holder_calls_after = len(holder.mock_calls)
+        ss_calls_after = len(fit.stats.mock_calls)
+        self.assertEqual(holder_calls_after - holder_calls_before, 1)
+        self.assertEqual(holder.mock_calls[-1], call._clear_volatile_attrs())
+        self.assertEqual(ss_calls_after - ss_calls_before, 1)
+        self.assertEqual(fit.stats.mock_calls[-1], call._clear_volatile_attrs())
+        # Misc
+        fit._publish(HolderRemoved(holder))
+
+    def test_no_changes(self):
+        # Setup
+        fit = Fit()
+        ss_calls_before = len(fit.stats.mock_calls)
+        # Action
+        with fit.batch():
+            pass
+        # Checks
+        self.assertEqual(len(fit.stats.mock_calls), ss_calls_before)
+        # Misc
+        self.assert_fit_buffers_empty(fit)
+
+    def test_removal(self):
+        # Setup
+        holder = Mock(spec=InheritableVolatileMixin)
+        fit = Fit()
+        fit._publish(HolderAdded(holder))
+        holder_calls_before = len(holder.mock_calls)
+        # Action
+        with fit.batch():
+            fit._publish(HolderRemoved(holder))
+            # Removed holder is cleared right away, as it won't
+            # receive cleanup on commit
+            self.assertEqual(len(holder.mock_calls) - holder_calls_before, 1)
+        # Checks
+        self.assertEqual(len(holder.mock_calls) - holder_calls_before, 1)
+        self.assertEqual(holder.mock_calls[-1], call._clear_volatile_attrs())
+        # Misc
+        self.assert_fit_buffers_empty(fit)
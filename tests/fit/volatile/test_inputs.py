@@ -0,0 +1,184 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from threading import Thread
+
+from eos.util.volatile_cache import NO_VALUE, InheritableVolatileMixin, VolatileClock, VolatileProperty, input_frames
+from tests.fit.fit_testcase import FitTestCase
+
+
+class Source:
+
+    def __init__(self, **values):
+        self.values = values
+        self._volatile_clock = VolatileClock()
+        self.checks = 0
+
+    def __getitem__(self, key):
+        try:
+            value = self.values[key]
+        except KeyError:
+            input_frames.stack[-1].add(self, key, NO_VALUE)
+            raise
+        input_frames.stack[-1].add(self, key, value)
+        return value
+
+    def _get_stored(self, key, default=None):
+        self.checks += 1
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+        self._volatile_clock.advance()
+
+    def remove(self, key):
+        del self.values[key]
+        self._volatile_clock.advance()
+
+
+class Carrier(InheritableVolatileMixin):
+
+    def __init__(self, source):
+        InheritableVolatileMixin.__init__(self)
+        self.source = source
+        self.calls = 0
+
+    @VolatileProperty
+    def total(self):
+        self.calls += 1
+        return self.source['a'] + self.source['b']
+
+    @VolatileProperty
+    def doubled(self):
+        return self.total * 2
+
+    @VolatileProperty
+    def optional(self):
+        try:
+            return self.source['c']
+        except KeyError:
+            return None
+
+
+class TestVolatileInputs(FitTestCase):
+
+    def test_cached(self):
+        carrier = Carrier(Source(a=1, b=2))
+        self.assertEqual(carrier.total, 3)
+        self.assertEqual(carrier.total, 3)
+        self.assertEqual(carrier.calls, 1)
+
+    def test_cached_no_checks(self):
+        source = Source(a=1, b=2)
+        carrier = Carrier(source)
+        for _ in range(3):
+            self.assertEqual(carrier.total, 3)
+        self.assertEqual(carrier.calls, 1)
+        self.assertEqual(source.checks, 0)
+
+    def test_unrelated_change(self):
+        source = Source(a=1, b=2)
+        carrier = Carrier(source)
+        self.assertEqual(carrier.total, 3)
+        source.set('c', 4)
+        # Inputs are checked only once after the change
+        for _ in range(3):
+            self.assertEqual(carrier.total, 3)
+        self.assertEqual(carrier.calls, 1)
+        self.assertEqual(source.checks, 2)
+
+    def test_source_without_clock(self):
+        source = Source(a=1, b=2)
+        source._volatile_clock = None
+        carrier = Carrier(source)
+        self.assertEqual(carrier.total, 3)
+        self.assertEqual(carrier.total, 3)
+        self.assertEqual(source.checks, 2)
+        source.values['b'] = 5
+        self.assertEqual(carrier.total, 6)
+        self.assertEqual(carrier.calls, 2)
+
+    def test_input_changed(self):
+        source = Source(a=1, b=2)
+        carrier = Carrier(source)
+        self.assertEqual(carrier.total, 3)
+        source.set('b', 5)
+        self.assertEqual(carrier.total, 6)
+        self.assertEqual(carrier.calls, 2)
+
+    def test_input_removed(self):
+        source = Source(a=1, b=2)
+        carrier = Carrier(source)
+        self.assertEqual(carrier.total, 3)
+        source.remove('b')
+        with self.assertRaises(KeyError):
+            carrier.total
+        self.assertEqual(carrier.calls, 2)
+
+    def test_input_missing(self):
+        source = Source()
+        carrier = Carrier(source)
+        self.assertIsNone(carrier.optional)
+        self.assertEqual(carrier._volatile_attrs['optional'][:2], (None, ((source, 'c', NO_VALUE),)))
+        source.set('c', 4)
+        self.assertEqual(carrier.optional, 4)
+
+    def test_nested(self):
+        source = Source(a=1, b=2)
+        carrier = Carrier(source)
+        self.assertEqual(carrier.total, 3)
+        # Inputs of cached nested property are taken over
+        self.assertEqual(carrier.doubled, 6)
+        self.assertEqual(len(carrier._volatile_attrs['doubled'][1]), 2)
+        source.set('a', 2)
+        self.assertEqual(carrier.doubled, 8)
+        self.assertEqual(carrier.calls, 2)
+
+    def test_clear(self):
+        carrier = Carrier(Source(a=1, b=2))
+        self.assertEqual(carrier.total, 3)
+        carrier._clear_volatile_attrs()
+        self.assertEqual(carrier.total, 3)
+        self.assertEqual(carrier.calls, 2)
+        self.assertEqual(input_frames.stack, [])
+
+    def test_threads(self):
+        other_carrier = Carrier(Source(a=5, b=6))
+        results = []
+
+        def calculate_other():
+            results.append((list(input_frames.stack), other_carrier.total))
+
+        class ThreadedSource(Source):
+
+            def __getitem__(self, key):
+                # Other thread calculates its property while
+                # property in this thread is being calculated
+                thread = Thread(target=calculate_other)
+                thread.start()
+                thread.join()
+                return Source.__getitem__(self, key)
+
+        carrier = Carrier(ThreadedSource(a=1, b=2))
+        self.assertEqual(carrier.total, 3)
+        self.assertEqual(results[0], ([], 11))
+        self.assertEqual(len(carrier._volatile_attrs['total'][1]), 2)
+        self.assertEqual(input_frames.stack, [])
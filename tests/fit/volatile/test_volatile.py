@@ -124,61 +124,79 @@ class TestVolatileData(FitTestCase):
     def test_message_holder_state_changed(self):
         # Setup
         holder = Mock(spec=InheritableVolatileMixin)
+        holder_other = Mock(spec=InheritableVolatileMixin)
         fit = Fit()
         fit._publish(HolderAdded(holder))
+        fit._publish(HolderAdded(holder_other))
         holder_calls_before = len(holder.mock_calls)
+        holder_other_calls_before = len(holder_other.mock_calls)
         ss_calls_before = len(fit.stats.mock_calls)
         # Action
-        fit._publish(HolderStateChanged(None, None, None))
+        fit._publish(HolderStateChanged(holder, None, None))
         # Checks
         holder_calls_after = len(holder.mock_calls)
+        holder_other_calls_after = len(holder_other.mock_calls)
         ss_calls_after = len(fit.stats.mock_calls)
         self.assertEqual(holder_calls_after - holder_calls_before, 1)
         self.assertEqual(holder.mock_calls[-1], call._clear_volatile_attrs())
-        self.assertEqual(ss_calls_after - ss_calls_before, 1)
-        self.assertEqual(fit.stats.mock_calls[-1], call._clear_volatile_attrs())
+        # Data of other objects is left intact
+        self.assertEqual(holder_other_calls_after - holder_other_calls_before, 0)
+        self.assertEqual(ss_calls_after - ss_calls_before, 0)
         # Misc
         fit._publish(HolderRemoved(holder))
+        fit._publish(HolderRemoved(holder_other))
         self.assert_fit_buffers_empty(fit)
 
     def test_message_effects_enabled(self):
         # Setup
         holder = Mock(spec=InheritableVolatileMixin)
+        holder_other = Mock(spec=InheritableVolatileMixin)
         fit = Fit()
         fit._publish(HolderAdded(holder))
+        fit._publish(HolderAdded(holder_other))
         holder_calls_before = len(holder.mock_calls)
+        holder_other_calls_before = len(holder_other.mock_calls)
         ss_calls_before = len(fit.stats.mock_calls)
         # Action
-        fit._publish(EffectsEnabled(None, None))
+        fit._publish(EffectsEnabled(holder, None))
         # Checks
         holder_calls_after = len(holder.mock_calls)
+        holder_other_calls_after = len(holder_other.mock_calls)
         ss_calls_after = len(fit.stats.mock_calls)
         self.assertEqual(holder_calls_after - holder_calls_before, 1)
         self.assertEqual(holder.mock_calls[-1], call._clear_volatile_attrs())
-        self.assertEqual(ss_calls_after - ss_calls_before, 1)
-        self.assertEqual(fit.stats.mock_calls[-1], call._clear_volatile_attrs())
+        # Data of other objects is left intact
+        self.assertEqual(holder_other_calls_after - holder_other_calls_before, 0)
+        self.assertEqual(ss_calls_after - ss_calls_before, 0)
         # Misc
         fit._publish(HolderRemoved(holder))
+        fit._publish(HolderRemoved(holder_other))
         self.assert_fit_buffers_empty(fit)
 
     def test_message_effects_disabled(self):
         # Setup
         holder = Mock(spec=InheritableVolatileMixin)
+        holder_other = Mock(spec=InheritableVolatileMixin)
         fit = Fit()
         fit._publish(HolderAdded(holder))
+        fit._publish(HolderAdded(holder_other))
         holder_calls_before = len(holder.mock_calls)
+        holder_other_calls_before = len(holder_other.mock_calls)
         ss_calls_before = len(fit.stats.mock_calls)
         # Action
-        fit._publish(EffectsDisabled(None, None))
+        fit._publish(EffectsDisabled(holder, None))
         # Checks
         holder_calls_after = len(holder.mock_calls)
+        holder_other_calls_after = len(holder_other.mock_calls)
         ss_calls_after = len(fit.stats.mock_calls)
         self.assertEqual(holder_calls_after - holder_calls_before, 1)
         self.assertEqual(holder.mock_calls[-1], call._clear_volatile_attrs())
-        self.assertEqual(ss_calls_after - ss_calls_before, 1)
-        self.assertEqual(fit.stats.mock_calls[-1], call._clear_volatile_attrs())
+        # Data of other objects is left intact
+        self.assertEqual(holder_other_calls_after - holder_other_calls_before, 0)
+        self.assertEqual(ss_calls_after - ss_calls_before, 0)
         # Misc
         fit._publish(HolderRemoved(holder))
+        fit._publish(HolderRemoved(holder_other))
         self.assert_fit_buffers_empty(fit)
 
     def test_message_override(self):
@@ -189,14 +207,11 @@ class TestVolatileData(FitTestCase):
         holder_calls_before = len(holder.mock_calls)
         ss_calls_before = len(fit.stats.mock_calls)
         # Action
-        fit._publish(AttrValueChangedOverride(None, None))
+        fit._publish(AttrValueChangedOverride(holder, None))
         # Checks
-        holder_calls_after = len(holder.mock_calls)
-        ss_calls_after = len(fit.stats.mock_calls)
-        self.assertEqual(holder_calls_after - holder_calls_before, 1)
-        self.assertEqual(holder.mock_calls[-1], call._clear_volatile_attrs())
-        self.assertEqual(ss_calls_after - ss_calls_before, 1)
-        self.assertEqual(fit.stats.mock_calls[-1], call._clear_volatile_attrs())
+        # Volatile properties verify attribute values on their own
+        self.assertEqual(len(holder.mock_calls), holder_calls_before)
+        self.assertEqual(len(fit.stats.mock_calls), ss_calls_before)
         # Misc
         fit._publish(HolderRemoved(holder))
         self.assert_fit_buffers_empty(fit)
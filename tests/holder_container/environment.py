@@ -19,6 +19,7 @@
 # ===============================================================================
 
 
+from contextlib import contextmanager
 from unittest.mock import Mock
 
 from eos.const.eos import State
@@ -49,6 +50,7 @@ class Fit:
         self.test_holders = set()
         self._subscribe = Mock()
         self._unsubscribe = Mock()
+        self.batch_depth = 0
 
     ship = HolderDescriptorOnFit('_ship', Ship)
 
@@ -75,6 +77,18 @@ class Fit:
                 assertion(self, message)
         self.handler_map[type(message)](self, message)
 
+    def _publish_many(self, messages):
+        for message in messages:
+            self._publish(message)
+
+    @contextmanager
+    def batch(self):
+        self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+
 
 class FitAssertion:
 
@@ -0,0 +1,92 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.fit.holder.container import HolderList, ModuleRacks
+from eos.fit.messages import HolderAdded, HolderRemoved
+from tests.holder_container.environment import Fit, Holder, OtherHolder
+from tests.holder_container.container_testcase import ContainerTestCase
+
+
+class TestContainerModuleRacksBulk(ContainerTestCase):
+
+    def make_fit(self):
+        assertions = {
+            HolderAdded: lambda f, m: (
+                self.assertIn(m.holder, f.modules.holders()), self.assertGreater(f.batch_depth, 0)),
+            HolderRemoved: lambda f, m: self.assertIn(m.holder, f.modules.holders())
+        }
+        fit = Fit(self, message_assertions=assertions)
+        fit.modules = ModuleRacks(
+            high=HolderList(fit, Holder),
+            med=HolderList(fit, Holder),
+            low=HolderList(fit, OtherHolder)
+        )
+        return fit
+
+    def test_extend(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        holder3 = OtherHolder(3)
+        # Action
+        with self.fit_assertions(fit):
+            fit.modules.extend(high=(holder1,), med=(holder2,), low=(holder3,))
+        # Checks
+        self.assertEqual(list(fit.modules.high), [holder1])
+        self.assertEqual(list(fit.modules.med), [holder2])
+        self.assertEqual(list(fit.modules.low), [holder3])
+        self.assertEqual(fit.test_holders, {holder1, holder2, holder3})
+        # Misc
+        fit.modules.replace_all()
+        self.assert_fit_buffers_empty(fit)
+
+    def test_extend_failure(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        # Action
+        with self.fit_assertions(fit):
+            self.assertRaises(TypeError, fit.modules.extend, high=(holder1,), low=(holder2,))
+        # Checks
+        self.assertEqual(len(fit.modules.holders()), 0)
+        self.assertIsNone(holder1._fit)
+        self.assertIsNone(holder2._fit)
+        # Misc
+        self.assert_fit_buffers_empty(fit)
+
+    def test_replace_all(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        holder3 = OtherHolder(3)
+        fit.modules.extend(high=(holder1,), low=(holder3,))
+        # Action
+        with self.fit_assertions(fit):
+            fit.modules.replace_all(high=(None, holder1), med=(holder2,))
+        # Checks
+        self.assertEqual(list(fit.modules.high), [None, holder1])
+        self.assertEqual(list(fit.modules.med), [holder2])
+        self.assertEqual(list(fit.modules.low), [])
+        self.assertIsNone(holder3._fit)
+        self.assertEqual(fit.test_holders, {holder1, holder2})
+        # Misc
+        fit.modules.replace_all()
+        self.assert_fit_buffers_empty(fit)
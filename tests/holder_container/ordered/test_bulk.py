@@ -0,0 +1,116 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.fit.holder.container import HolderList
+from eos.fit.messages import HolderAdded, HolderRemoved
+from tests.holder_container.environment import Fit, Holder, OtherHolder
+from tests.holder_container.container_testcase import ContainerTestCase
+
+
+class TestContainerOrderedBulk(ContainerTestCase):
+
+    def make_fit(self):
+        assertions = {
+            HolderAdded: lambda f, m: (self.assertIn(m.holder, f.container), self.assertGreater(f.batch_depth, 0)),
+            HolderRemoved: lambda f, m: self.assertIn(m.holder, f.container)
+        }
+        fit = Fit(self, message_assertions=assertions)
+        fit.container = HolderList(fit, Holder)
+        return fit
+
+    def test_extend(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        holder3 = Holder(3)
+        fit.container.place(1, holder1)
+        # Action
+        with self.fit_assertions(fit):
+            fit.container.extend((holder2, holder3))
+        # Checks
+        self.assertEqual(list(fit.container), [None, holder1, holder2, holder3])
+        self.assertIs(holder2._fit, fit)
+        self.assertIs(holder3._fit, fit)
+        self.assertEqual(fit.test_holders, {holder1, holder2, holder3})
+        # Misc
+        fit.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+
+    def test_extend_failure(self):
+        fit = self.make_fit()
+        fit_other = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        fit_other.container.append(holder2)
+        # Action
+        with self.fit_assertions(fit):
+            self.assertRaises(TypeError, fit.container.extend, (holder1, None))
+            self.assertRaises(TypeError, fit.container.extend, (holder1, OtherHolder(3)))
+            self.assertRaises(ValueError, fit.container.extend, (holder1, holder2))
+            self.assertRaises(ValueError, fit.container.extend, (holder1, holder1))
+        # Checks
+        self.assertEqual(len(fit.container), 0)
+        self.assertIsNone(holder1._fit)
+        self.assertIs(holder2._fit, fit_other)
+        # Misc
+        fit_other.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+        self.assert_fit_buffers_empty(fit_other)
+        self.assert_object_buffers_empty(fit_other.container)
+
+    def test_replace_all(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        holder3 = Holder(3)
+        fit.container.extend((holder1, holder2))
+        # Action
+        with self.fit_assertions(fit):
+            fit.container.replace_all((holder3, None, holder2, None))
+        # Checks
+        self.assertEqual(list(fit.container), [holder3, None, holder2])
+        self.assertIsNone(holder1._fit)
+        self.assertIs(holder2._fit, fit)
+        self.assertIs(holder3._fit, fit)
+        self.assertEqual(fit.test_holders, {holder2, holder3})
+        # Misc
+        fit.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+
+    def test_replace_all_failure(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        fit.container.append(holder1)
+        # Action
+        with self.fit_assertions(fit):
+            self.assertRaises(ValueError, fit.container.replace_all, (holder2, None, holder2))
+        # Checks
+        self.assertEqual(list(fit.container), [holder1])
+        self.assertIs(holder1._fit, fit)
+        self.assertIsNone(holder2._fit)
+        # Misc
+        fit.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
@@ -191,3 +191,59 @@ class TestContainerRestrictedSet(ContainerTestCase):
         # Misc
         self.assert_fit_buffers_empty(fit)
         self.assert_object_buffers_empty(fit.container)
+
+    def test_add_many(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        # Action
+        with self.fit_assertions(fit):
+            fit.container.add_many((holder1, holder2))
+        # Checks
+        self.assertEqual(len(fit.container), 2)
+        self.assertIs(fit.container[1], holder1)
+        self.assertIs(fit.container[2], holder2)
+        self.assertIs(holder1._fit, fit)
+        self.assertIs(holder2._fit, fit)
+        # Misc
+        fit.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+
+    def test_add_many_type_id_failure(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(1)
+        holder3 = Holder(2)
+        fit.container.add(holder1)
+        # Action
+        with self.fit_assertions(fit):
+            self.assertRaises(ValueError, fit.container.add_many, (holder2, holder3))
+            self.assertRaises(ValueError, fit.container.add_many, (holder3, Holder(2)))
+        # Checks
+        self.assertEqual(len(fit.container), 1)
+        self.assertIs(fit.container[1], holder1)
+        self.assertIsNone(holder2._fit)
+        self.assertIsNone(holder3._fit)
+        # Misc
+        fit.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+
+    def test_replace_all(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(1)
+        fit.container.add(holder1)
+        # Action
+        with self.fit_assertions(fit):
+            fit.container.replace_all((holder2,))
+        # Checks
+        self.assertEqual(len(fit.container), 1)
+        self.assertIs(fit.container[1], holder2)
+        self.assertIsNone(holder1._fit)
+        self.assertIs(holder2._fit, fit)
+        # Misc
+        fit.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
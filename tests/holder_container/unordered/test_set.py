@@ -141,3 +141,66 @@ class TestContainerSet(ContainerTestCase):
         # Misc
         self.assert_fit_buffers_empty(fit)
         self.assert_object_buffers_empty(fit.container)
+
+    def test_add_many(self):
+        fit = self.make_fit()
+        fit._message_assertions[HolderAdded] = lambda f, m: (
+            self.assertIn(m.holder, f.container), self.assertGreater(f.batch_depth, 0))
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        # Action
+        with self.fit_assertions(fit):
+            fit.container.add_many((holder1, holder2))
+        # Checks
+        self.assertEqual(len(fit.container), 2)
+        self.assertIs(holder1._fit, fit)
+        self.assertIs(holder2._fit, fit)
+        self.assertEqual(fit.test_holders, {holder1, holder2})
+        # Misc
+        fit.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+
+    def test_add_many_failure(self):
+        fit = self.make_fit()
+        fit_other = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        fit_other.container.add(holder2)
+        # Action
+        with self.fit_assertions(fit):
+            self.assertRaises(TypeError, fit.container.add_many, (holder1, OtherHolder(3)))
+            self.assertRaises(ValueError, fit.container.add_many, (holder1, holder2))
+            self.assertRaises(ValueError, fit.container.add_many, (holder1, holder1))
+        # Checks
+        self.assertEqual(len(fit.container), 0)
+        self.assertIsNone(holder1._fit)
+        self.assertIs(holder2._fit, fit_other)
+        # Misc
+        fit_other.container.remove(holder2)
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
+        self.assert_fit_buffers_empty(fit_other)
+        self.assert_object_buffers_empty(fit_other.container)
+
+    def test_replace_all(self):
+        fit = self.make_fit()
+        holder1 = Holder(1)
+        holder2 = Holder(2)
+        holder3 = Holder(3)
+        fit.container.add_many((holder1, holder2))
+        # Action
+        with self.fit_assertions(fit):
+            fit.container.replace_all((holder2, holder3))
+        # Checks
+        self.assertEqual(len(fit.container), 2)
+        self.assertIn(holder2, fit.container)
+        self.assertIn(holder3, fit.container)
+        self.assertIsNone(holder1._fit)
+        self.assertIs(holder2._fit, fit)
+        self.assertIs(holder3._fit, fit)
+        self.assertEqual(fit.test_holders, {holder2, holder3})
+        # Misc
+        fit.container.clear()
+        self.assert_fit_buffers_empty(fit)
+        self.assert_object_buffers_empty(fit.container)
@@ -0,0 +1,45 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eve import Type
+from eos.data.source import Source
+from eos.fit import Fit
+from tests.eos_testcase import EosTestCase
+
+
+class IntegrationTestCase(EosTestCase):
+    """
+    Additional functionality provided:
+
+    self.source -- source which uses self.ch as cache handler
+    self.make_fit -- creates fit with all services, which uses
+        self.source unless specified otherwise
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.ch.type_(type_id=Type.character_static)
+        self.source = Source('test', self.ch)
+
+    def make_fit(self, source=None, eager=False):
+        if source is None:
+            source = self.source
+        return Fit(source=source, eager=eager)
@@ -0,0 +1,131 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos import ModuleLow, Ship
+from eos.const.eos import State, Domain, Scope, FilterType, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.integration.integration_testcase import IntegrationTestCase
+
+
+class TestClone(IntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=11)
+        self.ch.attribute(attribute_id=12)
+        self.ch.attribute(attribute_id=13)
+        self.ch.attribute(attribute_id=14)
+        self.ch.attribute(attribute_id=15, max_attribute=14)
+        hp_modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=12,
+            operator=Operator.post_percent, tgt_attr=11, domain=Domain.ship,
+            filter_type=None, filter_value=None
+        )
+        cap_modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=13,
+            operator=Operator.post_percent, tgt_attr=14, domain=Domain.ship,
+            filter_type=FilterType.all_, filter_value=None
+        )
+        ship_effect = self.ch.effect(effect_id=1, category=EffectCategory.passive, modifiers=(cap_modifier,))
+        module_effect = self.ch.effect(effect_id=2, category=EffectCategory.passive, modifiers=(hp_modifier,))
+        self.ch.type_(type_id=1, effects=(ship_effect,), attributes={11: 100, 13: -50})
+        self.ch.type_(type_id=2, effects=(module_effect,), attributes={12: 10, 14: 80, 15: 100})
+        self.fit = self.make_fit()
+        self.fit.ship = Ship(1)
+        self.fit.modules.low.append(ModuleLow(2, state=State.online))
+        self.fit.modules.low.append(ModuleLow(2, state=State.online))
+        self.fit.materialize()
+
+    def get_values(self, fit):
+        return (
+            fit.ship.attributes[11],
+            [(module.attributes[14], module.attributes[15]) for module in fit.modules.low]
+        )
+
+    def test_values_shared(self):
+        # Action
+        clone = self.fit.clone()
+        # Checks
+        self.assertIs(clone.ship.attributes._values, self.fit.ship.attributes._values)
+        self.assertIs(clone.modules.low[0].attributes._values, self.fit.modules.low[0].attributes._values)
+        self.assertFalse(clone.ship.attributes._needs_calculation(11))
+        self.assertEqual(self.get_values(clone), self.get_values(self.fit))
+        self.assertEqual(len(self.log), 0)
+
+    def test_clone_changed(self):
+        clone = self.fit.clone()
+        # Action
+        clone.modules.low[0].state = State.offline
+        clone.ship.attributes._override_set(13, -75)
+        # Checks
+        self.assertAlmostEqual(clone.ship.attributes[11], 110)
+        for module in clone.modules.low:
+            self.assertAlmostEqual(module.attributes[14], 20)
+            self.assertAlmostEqual(module.attributes[15], 20)
+        self.assertAlmostEqual(self.fit.ship.attributes[11], 121)
+        for module in self.fit.modules.low:
+            self.assertAlmostEqual(module.attributes[14], 40)
+            self.assertAlmostEqual(module.attributes[15], 40)
+        self.assertEqual(len(self.log), 0)
+
+    def test_original_changed(self):
+        clone = self.fit.clone()
+        # Action
+        self.fit.modules.low[0].state = State.offline
+        self.fit.ship.attributes._override_set(13, -75)
+        # Checks
+        self.assertAlmostEqual(self.fit.ship.attributes[11], 110)
+        for module in self.fit.modules.low:
+            self.assertAlmostEqual(module.attributes[14], 20)
+            self.assertAlmostEqual(module.attributes[15], 20)
+        self.assertAlmostEqual(clone.ship.attributes[11], 121)
+        for module in clone.modules.low:
+            self.assertAlmostEqual(module.attributes[14], 40)
+            self.assertAlmostEqual(module.attributes[15], 40)
+        self.assertEqual(len(self.log), 0)
+
+    def test_clone_of_clone(self):
+        clone1 = self.fit.clone()
+        clone2 = clone1.clone()
+        # Action
+        clone1.ship.attributes._override_set(13, 0)
+        # Checks
+        self.assertAlmostEqual(clone1.modules.low[1].attributes[15], 80)
+        self.assertAlmostEqual(clone2.modules.low[1].attributes[15], 40)
+        self.assertAlmostEqual(self.fit.modules.low[1].attributes[15], 40)
+        self.assertEqual(len(self.log), 0)
+
+    def test_holder_joined_shared_values(self):
+        clone = self.fit.clone()
+        module = ModuleLow(2, state=State.online)
+        clone.modules.low.append(module)
+        self.assertAlmostEqual(module.attributes[15], 40)
+        # Holder takes its own copy of values which it has
+        # received from its group
+        module.state = State.offline
+        # Action
+        clone.ship.attributes._override_set(13, -75)
+        # Checks
+        self.assertAlmostEqual(module.attributes[15], 20)
+        self.assertAlmostEqual(clone.modules.low[0].attributes[15], 20)
+        self.assertAlmostEqual(self.fit.modules.low[0].attributes[15], 40)
+        self.assertEqual(len(self.log), 0)
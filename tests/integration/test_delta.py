@@ -0,0 +1,120 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos import ModuleLow, Ship, Drone
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import Attribute, EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.integration.integration_testcase import IntegrationTestCase
+
+
+class TestEvaluateDelta(IntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        hp_attr = self.ch.attribute(attribute_id=Attribute.hp)
+        self.ch.attribute(attribute_id=Attribute.armor_hp)
+        self.ch.attribute(attribute_id=Attribute.shield_capacity)
+        src_attr = self.ch.attribute(attribute_id=13)
+        modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=src_attr.id,
+            operator=Operator.post_percent, tgt_attr=hp_attr.id, domain=Domain.ship,
+            filter_type=None, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive, modifiers=(modifier,))
+        for type_id, hp in ((1, 100), (3, 200)):
+            self.ch.type_(type_id=type_id, attributes={
+                Attribute.hp: hp, Attribute.armor_hp: 0, Attribute.shield_capacity: 0
+            })
+        self.ch.type_(type_id=2, effects=(effect,), attributes={src_attr.id: 10})
+        self.fit = self.make_fit()
+        self.fit.ship = Ship(1)
+        self.module1 = ModuleLow(2, state=State.online)
+        self.module2 = ModuleLow(2, state=State.online)
+        self.fit.modules.low.append(self.module1)
+        self.fit.modules.low.append(self.module2)
+
+    def get_hp(self, fit):
+        return fit.stats.hp.hull
+
+    def get_fit_state(self):
+        return (
+            self.get_hp(self.fit),
+            {holder: dict(holder.attributes._values) for holder in (self.fit.ship, self.module1, self.module2)},
+            dict(self.fit.stats._volatile_attrs),
+            list(self.fit.modules.low),
+            self.module1.state
+        )
+
+    def test_values(self):
+        self.assertAlmostEqual(self.get_hp(self.fit), 121)
+        fit_state = self.get_fit_state()
+        # Action
+        add_delta = self.fit.evaluate_delta(self.get_hp, add=(ModuleLow(2, state=State.online),))
+        remove_delta = self.fit.evaluate_delta(self.get_hp, remove=(self.module1,))
+        state_delta = self.fit.evaluate_delta(self.get_hp, state_changes={self.module1: State.offline})
+        ship_delta = self.fit.evaluate_delta(self.get_hp, add=(Ship(3),))
+        # Checks
+        self.assertAlmostEqual(add_delta.base, 121)
+        self.assertAlmostEqual(add_delta.changed, 133.1)
+        self.assertAlmostEqual(remove_delta.changed, 110)
+        self.assertAlmostEqual(state_delta.changed, 110)
+        self.assertAlmostEqual(ship_delta.changed, 242)
+        self.assertEqual(self.get_fit_state(), fit_state)
+        self.assertEqual(len(self.log), 0)
+
+    def test_scratch_reused(self):
+        self.fit.evaluate_delta(self.get_hp, remove=(self.module1,))
+        scratch = self.fit._Fit__scratch
+        # Action
+        delta = self.fit.evaluate_delta(self.get_hp, add=(ModuleLow(2, state=State.online),))
+        # Checks
+        self.assertIs(self.fit._Fit__scratch, scratch)
+        self.assertAlmostEqual(delta.changed, 133.1)
+        scratch_fit = scratch[0]
+        self.assertEqual(len(scratch_fit.modules.low), 2)
+        self.assertAlmostEqual(self.get_hp(scratch_fit), 121)
+        self.assertEqual(len(self.log), 0)
+
+    def test_fit_change(self):
+        self.fit.evaluate_delta(self.get_hp, remove=(self.module1,))
+        # Action
+        self.module2.state = State.offline
+        # Checks
+        self.assertIsNone(self.fit._Fit__scratch)
+        delta = self.fit.evaluate_delta(self.get_hp, remove=(self.module1,))
+        self.assertAlmostEqual(delta.base, 110)
+        self.assertAlmostEqual(delta.changed, 100)
+        self.assertEqual(len(self.log), 0)
+
+    def test_error_reverted(self):
+        fit_state = self.get_fit_state()
+        # Action
+        with self.assertRaises(ValueError):
+            self.fit.evaluate_delta(
+                self.get_hp, add=(ModuleLow(2, state=State.online),),
+                remove=(self.module1,), state_changes={Drone(4): State.active}
+            )
+        # Checks
+        delta = self.fit.evaluate_delta(self.get_hp)
+        self.assertAlmostEqual(delta.changed, 121)
+        self.assertEqual(self.get_fit_state(), fit_state)
+        self.assertEqual(len(self.log), 0)
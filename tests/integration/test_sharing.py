@@ -0,0 +1,78 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos import ModuleLow
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.integration.integration_testcase import IntegrationTestCase
+
+
+class TestSharing(IntegrationTestCase):
+    """Check that holders which have been changed stop sharing values"""
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=11)
+        self.ch.attribute(attribute_id=12)
+        modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=12,
+            operator=Operator.post_percent, tgt_attr=11, domain=Domain.self_,
+            filter_type=None, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive, modifiers=(modifier,))
+        self.ch.type_(type_id=1, effects=(effect,), attributes={11: 100, 12: 50})
+        self.fit = self.make_fit()
+        self.module1 = ModuleLow(1, state=State.online)
+        self.module2 = ModuleLow(1, state=State.online)
+        self.fit.modules.low.append(self.module1)
+        self.fit.modules.low.append(self.module2)
+
+    def test_state(self):
+        self.assertAlmostEqual(self.module1.attributes[11], 150)
+        self.assertIs(self.module1.attributes._group, self.module2.attributes._group)
+        # Action
+        self.module1.state = State.offline
+        # Checks
+        self.assertIsNot(self.module1.attributes._group, self.module2.attributes._group)
+        self.assertAlmostEqual(self.module1.attributes[11], 100)
+        self.assertAlmostEqual(self.module2.attributes[11], 150)
+        # Action
+        self.module1.state = State.online
+        # Checks
+        self.assertIs(self.module1.attributes._group, self.module2.attributes._group)
+        self.assertAlmostEqual(self.module1.attributes[11], 150)
+        self.assertEqual(len(self.log), 0)
+
+    def test_effects(self):
+        self.assertAlmostEqual(self.module1.attributes[11], 150)
+        # Action
+        self.module1._set_effects_status((1,), False)
+        # Checks
+        self.assertIsNot(self.module1.attributes._group, self.module2.attributes._group)
+        self.assertAlmostEqual(self.module1.attributes[11], 100)
+        self.assertAlmostEqual(self.module2.attributes[11], 150)
+        # Action
+        self.module1._set_effects_status((1,), True)
+        # Checks
+        self.assertIs(self.module1.attributes._group, self.module2.attributes._group)
+        self.assertAlmostEqual(self.module1.attributes[11], 150)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,121 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos import Ship, Skill, SkillProfile
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import Attribute, EffectCategory
+from eos.data.cache_object.modifier import Modifier
+from tests.integration.integration_testcase import IntegrationTestCase
+
+
+class TestSkillProfile(IntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=Attribute.skill_level)
+        self.tgt_attr = self.ch.attribute(attribute_id=1)
+        self.bonus_attr = self.ch.attribute(attribute_id=2)
+        # Skill multiplies its bonus by its level, and then
+        # applies it to the ship
+        level_modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=Attribute.skill_level,
+            operator=Operator.post_mul, tgt_attr=self.bonus_attr.id, domain=Domain.self_,
+            filter_type=None, filter_value=None
+        )
+        ship_modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=self.bonus_attr.id,
+            operator=Operator.post_percent, tgt_attr=self.tgt_attr.id, domain=Domain.ship,
+            filter_type=None, filter_value=None
+        )
+        effect = self.ch.effect(
+            effect_id=1, category=EffectCategory.passive, modifiers=(level_modifier, ship_modifier)
+        )
+        self.ch.type_(type_id=1, attributes={self.tgt_attr.id: 10})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={self.bonus_attr.id: 2})
+
+    def test_applied(self):
+        fit = self.make_fit()
+        fit.ship = Ship(1)
+        # Action
+        fit.skill_profile = SkillProfile({2: 5})
+        # Checks
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 11)
+        # Action
+        fit.skill_profile = None
+        # Checks
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_shared(self):
+        profile = SkillProfile({2: 5})
+        fit1 = self.make_fit()
+        fit1.ship = Ship(1)
+        fit1.skill_profile = profile
+        fit2 = self.make_fit()
+        fit2.ship = Ship(1)
+        fit2.skill_profile = profile
+        # Checks
+        self.assertIs(profile._get_skills(self.source)[2], profile._get_skills(self.source)[2])
+        self.assertAlmostEqual(fit1.ship.attributes[self.tgt_attr.id], 11)
+        self.assertAlmostEqual(fit2.ship.attributes[self.tgt_attr.id], 11)
+        # Action
+        fit1.skill_profile = None
+        # Checks
+        self.assertAlmostEqual(fit1.ship.attributes[self.tgt_attr.id], 10)
+        self.assertAlmostEqual(fit2.ship.attributes[self.tgt_attr.id], 11)
+        self.assertEqual(len(self.log), 0)
+
+    def test_fit_skill_precedence(self):
+        fit = self.make_fit()
+        fit.ship = Ship(1)
+        fit.skill_profile = SkillProfile({2: 5})
+        skill = Skill(2, level=1)
+        # Action
+        fit.skills.add(skill)
+        # Checks
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 10.2)
+        # Action
+        fit.skills.remove(skill)
+        # Checks
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 11)
+        self.assertEqual(len(self.log), 0)
+
+    def test_fit_skill_precedence_profile_assignment(self):
+        fit = self.make_fit()
+        fit.ship = Ship(1)
+        fit.skills.add(Skill(2, level=1))
+        # Action
+        fit.skill_profile = SkillProfile({2: 5})
+        # Checks
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 10.2)
+        self.assertEqual(len(self.log), 0)
+
+    def test_source_switch(self):
+        fit = self.make_fit()
+        fit.ship = Ship(1)
+        fit.skill_profile = SkillProfile({2: 5})
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 11)
+        # Action
+        fit.source = None
+        fit.source = self.source
+        # Checks
+        self.assertAlmostEqual(fit.ship.attributes[self.tgt_attr.id], 11)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,114 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos import ModuleLow, Ship, SkillProfile
+from eos.const.eos import State, Domain, Scope, Operator
+from eos.const.eve import Attribute, EffectCategory, Type
+from eos.data.cache_object.modifier import Modifier
+from eos.data.source import Source
+from tests.environment import CacheHandler
+from tests.integration.integration_testcase import IntegrationTestCase
+
+
+class TestSourceSwitch(IntegrationTestCase):
+
+    def make_source(self, alias, stackable=False, ship_value=100, skill_bonus=2):
+        ch = CacheHandler()
+        ch.type_(type_id=Type.character_static)
+        tgt_attr = ch.attribute(attribute_id=12, stackable=stackable)
+        src_attr = ch.attribute(attribute_id=13)
+        ch.attribute(attribute_id=Attribute.skill_level)
+        modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=src_attr.id,
+            operator=Operator.post_percent, tgt_attr=tgt_attr.id, domain=Domain.ship,
+            filter_type=None, filter_value=None
+        )
+        level_modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=Attribute.skill_level,
+            operator=Operator.post_mul, tgt_attr=src_attr.id, domain=Domain.self_,
+            filter_type=None, filter_value=None
+        )
+        effect = ch.effect(effect_id=1, category=EffectCategory.passive, modifiers=(modifier,))
+        skill_effect = ch.effect(
+            effect_id=2, category=EffectCategory.passive, modifiers=(modifier, level_modifier)
+        )
+        ch.type_(type_id=1, attributes={tgt_attr.id: ship_value})
+        ch.type_(type_id=2, effects=(effect,), attributes={src_attr.id: 20})
+        ch.type_(type_id=3, effects=(skill_effect,), attributes={src_attr.id: skill_bonus})
+        ch.type_(type_id=4, effects=(skill_effect,), attributes={src_attr.id: 1})
+        return Source(alias, ch)
+
+    def make_modules_fit(self, source):
+        fit = self.make_fit(source=source)
+        fit.ship = Ship(1)
+        fit.modules.low.append(ModuleLow(2, state=State.online))
+        fit.modules.low.append(ModuleLow(2, state=State.online))
+        return fit
+
+    def test_stacking_metadata_dropped_value(self):
+        source1 = self.make_source('a', stackable=False)
+        source2 = self.make_source('b', stackable=True)
+        fit = self.make_modules_fit(source1)
+        self.assertAlmostEqual(fit.ship.attributes[12], 140.86, places=2)
+        # Drop value of ship attribute, keeping its calculation plan
+        module_attributes = fit.modules.low[0].attributes
+        module_attributes._override_set(13, 10)
+        module_attributes._override_del(13)
+        # Action
+        fit.source = source2
+        # Checks
+        self.assertAlmostEqual(fit.ship.attributes[12], 144)
+        self.assertAlmostEqual(self.make_modules_fit(source2).ship.attributes[12], 144)
+        self.assertEqual(len(self.log), 0)
+
+    def test_kept_values(self):
+        source1 = self.make_source('a')
+        source2 = self.make_source('b', ship_value=200)
+        fit = self.make_modules_fit(source1)
+        module = fit.modules.low[0]
+        self.assertAlmostEqual(module.attributes[13], 20)
+        self.assertAlmostEqual(fit.ship.attributes[12], 140.86, places=2)
+        # Action
+        fit.source = source2
+        # Checks
+        self.assertAlmostEqual(fit.ship.attributes[12], 281.72, places=2)
+        self.assertIs(module.item, source1.cache_handler.get_type(2))
+        self.assertIs(fit.ship.item, source2.cache_handler.get_type(1))
+        self.assertEqual(len(self.log), 0)
+
+    def test_profile_skills(self):
+        source1 = self.make_source('a', skill_bonus=2)
+        source2 = self.make_source('b', skill_bonus=3)
+        source3 = self.make_source('c', skill_bonus=2, ship_value=150)
+        profile = SkillProfile({3: 5, 4: 2})
+        fit = self.make_fit(source=source1)
+        fit.ship = Ship(1)
+        fit.skill_profile = profile
+        for source in (source2, source1, source3, source2, source3):
+            fit.ship.attributes[12]
+            # Action
+            fit.source = source
+            # Checks
+            expected = self.make_fit(source=source)
+            expected.ship = Ship(1)
+            expected.skill_profile = profile
+            self.assertAlmostEqual(fit.ship.attributes[12], expected.ship.attributes[12])
+        self.assertEqual(len(self.log), 0)
@@ -49,6 +49,7 @@ class RestrictionTestCase(EosTestCase):
         self.fit.ship = None
         self.fit.character = None
         self.fit.skills = {}
+        self.fit.skill_profile = None
         self.fit.modules.high = []
         self.fit.modules.med = []
         self.fit.modules.low = []
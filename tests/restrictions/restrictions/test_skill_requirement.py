@@ -23,6 +23,7 @@ from unittest.mock import Mock
 
 from eos.const.eos import Domain, Restriction, State
 from eos.fit.holder.item import ModuleHigh, Rig, Skill
+from eos.fit.skill_profile import SkillProfile
 from tests.restrictions.restriction_testcase import RestrictionTestCase
 
 
@@ -112,3 +113,30 @@ class TestSkillRequirement(RestrictionTestCase):
         self.remove_holder(holder)
         self.assertEqual(len(self.log), 0)
         self.assert_restriction_buffers_empty()
+
+    def test_pass_profile(self):
+        # Check that skills from skill profile satisfy requirements
+        item = self.ch.type_(type_id=1)
+        item.required_skills = {50: 3}
+        holder = Mock(state=State.offline, item=item, _domain=Domain.ship, spec_set=ModuleHigh(1))
+        self.add_holder(holder)
+        self.fit.skill_profile = SkillProfile({50: 3})
+        restriction_error = self.get_restriction_error(holder, Restriction.skill_requirement)
+        self.assertIsNone(restriction_error)
+        self.remove_holder(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_restriction_buffers_empty()
+
+    def test_fail_profile(self):
+        # Check that low skill levels from profile are reported
+        item = self.ch.type_(type_id=1)
+        item.required_skills = {48: 1, 50: 5}
+        holder = Mock(state=State.offline, item=item, _domain=Domain.ship, spec_set=ModuleHigh(1))
+        self.add_holder(holder)
+        self.fit.skill_profile = SkillProfile({50: 2})
+        restriction_error = self.get_restriction_error(holder, Restriction.skill_requirement)
+        self.assertIsNotNone(restriction_error)
+        self.assertCountEqual(restriction_error, ((50, 2, 5), (48, None, 1)))
+        self.remove_holder(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_restriction_buffers_empty()
@@ -0,0 +1,114 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import gc
+from weakref import ref
+
+from eos.util.object_cache import ObjectCache, ObjectCacheStats
+from tests.eos_testcase import EosTestCase
+
+
+class Object:
+    pass
+
+
+class TestObjectCache(EosTestCase):
+
+    def test_miss(self):
+        cache = ObjectCache(strong_size=2)
+        with self.assertRaises(KeyError):
+            cache['a']
+        self.assertEqual(cache.stats, ObjectCacheStats(
+            strong_hits=0, weak_hits=0, misses=1, evictions=0, strong_size=0))
+
+    def test_strong_hit(self):
+        cache = ObjectCache(strong_size=2)
+        obj = Object()
+        cache['a'] = obj
+        self.assertIs(cache['a'], obj)
+        self.assertIs(cache['a'], obj)
+        self.assertEqual(cache.stats, ObjectCacheStats(
+            strong_hits=2, weak_hits=0, misses=0, evictions=0, strong_size=1))
+
+    def test_strong_keeps_alive(self):
+        cache = ObjectCache(strong_size=1)
+        cache['a'] = Object()
+        gc.collect()
+        self.assertIsInstance(cache['a'], Object)
+
+    def test_lru_order(self):
+        cache = ObjectCache(strong_size=2)
+        cache['a'] = Object()
+        cache['b'] = Object()
+        # Access makes object the most recently used one
+        cache['a']
+        cache['c'] = Object()
+        gc.collect()
+        # Least recently used object has been evicted, and as
+        # nothing else references it, it is gone
+        self.assertIsInstance(cache['a'], Object)
+        self.assertIsInstance(cache['c'], Object)
+        with self.assertRaises(KeyError):
+            cache['b']
+        stats = cache.stats
+        self.assertEqual(stats.evictions, 1)
+        self.assertEqual(stats.strong_size, 2)
+
+    def test_evicted_weak_hit(self):
+        cache = ObjectCache(strong_size=1)
+        obj_a = Object()
+        obj_b = Object()
+        cache['a'] = obj_a
+        cache['b'] = obj_b
+        # Evicted object which is still in use is taken from weak
+        # tier, and put back to strong one, evicting other object
+        self.assertIs(cache['a'], obj_a)
+        self.assertIs(cache['b'], obj_b)
+        self.assertEqual(cache.stats, ObjectCacheStats(
+            strong_hits=0, weak_hits=2, misses=0, evictions=3, strong_size=1))
+
+    def test_weak_only(self):
+        cache = ObjectCache()
+        obj = Object()
+        obj_ref = ref(obj)
+        cache['a'] = obj
+        self.assertIs(cache['a'], obj)
+        self.assertEqual(cache.stats.strong_size, 0)
+        del obj
+        gc.collect()
+        self.assertIsNone(obj_ref())
+        with self.assertRaises(KeyError):
+            cache['a']
+        self.assertEqual(cache.stats, ObjectCacheStats(
+            strong_hits=0, weak_hits=1, misses=1, evictions=0, strong_size=0))
+
+    def test_clear(self):
+        cache = ObjectCache(strong_size=2)
+        obj = Object()
+        cache['a'] = obj
+        cache['a']
+        # Action
+        cache.clear()
+        # Checks
+        with self.assertRaises(KeyError):
+            cache['a']
+        self.assertEqual(cache.stats, ObjectCacheStats(
+            strong_hits=1, weak_hits=0, misses=1, evictions=0, strong_size=0))
@@ -0,0 +1,186 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2017 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import json
+from collections import namedtuple
+from unittest.mock import Mock
+
+from eos.util.pubsub import MessageBroker, MessageTracer, BaseSubscriber
+from tests.eos_testcase import EosTestCase
+
+
+MessageA = namedtuple('MessageA', ('value',))
+MessageB = namedtuple('MessageB', ('value',))
+
+
+class Subscriber(BaseSubscriber):
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def _handle_a(self, message):
+        self.log.append((self.name, message))
+
+    _handler_map = {
+        MessageA: _handle_a
+    }
+
+    def _notify(self, message):
+        raise AssertionError('compiled handler should be used')
+
+
+class TestMessageBroker(EosTestCase):
+
+    def test_order(self):
+        log = []
+        broker = MessageBroker()
+        subscribers = [Subscriber(log, i) for i in range(10)]
+        for subscriber in subscribers:
+            broker._subscribe(subscriber, (MessageA,))
+        broker._publish(MessageA(1))
+        self.assertEqual(log, [(i, MessageA(1)) for i in range(10)])
+
+    def test_unhandled_type(self):
+        log = []
+        broker = MessageBroker()
+        broker._subscribe(Subscriber(log, 1), (MessageA, MessageB))
+        broker._publish(MessageB(1))
+        self.assertEqual(log, [])
+
+    def test_subscription_change(self):
+        log = []
+        broker = MessageBroker()
+        subscriber1 = Subscriber(log, 1)
+        subscriber2 = Subscriber(log, 2)
+        broker._subscribe(subscriber1, (MessageA,))
+        broker._publish(MessageA(1))
+        broker._subscribe(subscriber2, (MessageA,))
+        broker._publish(MessageA(2))
+        broker._unsubscribe(subscriber1, (MessageA,))
+        broker._publish(MessageA(3))
+        broker._unsubscribe(subscriber2, (MessageA,))
+        broker._publish(MessageA(4))
+        self.assertEqual(log, [(1, MessageA(1)), (1, MessageA(2)), (2, MessageA(2)), (2, MessageA(3))])
+
+    def test_plain_subscriber(self):
+        subscriber = Mock()
+        broker = MessageBroker()
+        broker._subscribe(subscriber, (MessageA,))
+        broker._publish(MessageA(1))
+        subscriber._notify.assert_called_once_with(MessageA(1))
+
+    def test_refresh(self):
+        log = []
+        broker = MessageBroker()
+        subscriber = Subscriber(log, 1)
+        broker._subscribe(subscriber, (MessageA,))
+        broker._publish(MessageA(1))
+        subscriber._get_handler = lambda message_type: lambda message: log.append(('refreshed', message))
+        broker._publish(MessageA(2))
+        broker._refresh_subscriber(subscriber)
+        broker._publish(MessageA(3))
+        self.assertEqual(log, [(1, MessageA(1)), (1, MessageA(2)), ('refreshed', MessageA(3))])
+
+    def test_publish_many(self):
+        log = []
+        broker = MessageBroker()
+        broker._subscribe(Subscriber(log, 1), (MessageA, MessageB))
+        broker._publish_many((MessageA(1), MessageB(2), MessageA(3)))
+        self.assertEqual(log, [(1, MessageA(1)), (1, MessageA(3))])
+
+
+class Republisher(BaseSubscriber):
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def _handle_b(self, message):
+        self.broker._publish(MessageA(message.value))
+
+    _handler_map = {
+        MessageB: _handle_b
+    }
+
+    def _notify(self, message):
+        raise AssertionError('compiled handler should be used')
+
+
+class TestMessageTracer(EosTestCase):
+
+    def make_broker(self):
+        log = []
+        broker = MessageBroker()
+        broker._subscribe(Subscriber(log, 1), (MessageA,))
+        broker._subscribe(Republisher(broker), (MessageB,))
+        return broker, log
+
+    def test_disabled(self):
+        broker, log = self.make_broker()
+        self.assertIsNone(broker.tracer)
+        self.assertIsNone(broker.disable_tracing())
+        broker._publish(MessageB(1))
+        self.assertEqual(log, [(1, MessageA(1))])
+
+    def test_summary(self):
+        broker, log = self.make_broker()
+        tracer = broker.enable_tracing()
+        self.assertIs(broker.tracer, tracer)
+        broker._publish(MessageA(1))
+        broker._publish(MessageB(2))
+        self.assertIs(broker.disable_tracing(), tracer)
+        broker._publish(MessageA(3))
+        self.assertEqual(len(log), 3)
+        rows = {(row[0], row[1]): row[2:] for row in tracer.summary()}
+        self.assertEqual(set(rows), {('MessageA', 'Subscriber'), ('MessageB', 'Republisher')})
+        deliveries, total, max_time, max_depth = rows[('MessageA', 'Subscriber')]
+        self.assertEqual(deliveries, 2)
+        self.assertGreaterEqual(total, max_time)
+        # Second message has been published by handler of other message
+        self.assertEqual(max_depth, 1)
+        self.assertEqual(rows[('MessageB', 'Republisher')][0], 1)
+        self.assertEqual(rows[('MessageB', 'Republisher')][3], 0)
+        table = tracer.format_summary().splitlines()
+        self.assertEqual(len(table), 3)
+        self.assertEqual(
+            table[0].split(), ['message', 'subscriber', 'deliveries', 'total', 'ms', 'max', 'ms', 'max', 'depth'])
+
+    def test_chrome_trace(self):
+        broker, log = self.make_broker()
+        tracer = broker.enable_tracing(MessageTracer())
+        broker._publish(MessageB(1))
+        broker.disable_tracing()
+        events = json.loads(tracer.to_chrome_trace())['traceEvents']
+        self.assertEqual([event['name'] for event in events], ['MessageB -> Republisher', 'MessageA -> Subscriber'])
+        outer, inner = events
+        self.assertEqual(outer['ph'], 'X')
+        self.assertEqual(inner['args']['depth'], 1)
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertGreaterEqual(outer['ts'] + outer['dur'], inner['ts'] + inner['dur'])
+
+    def test_no_timeline(self):
+        broker, log = self.make_broker()
+        tracer = broker.enable_tracing(MessageTracer(timeline=False))
+        broker._publish(MessageB(1))
+        self.assertEqual(json.loads(tracer.to_chrome_trace())['traceEvents'], [])
+        self.assertEqual(len(tracer.summary()), 2)
+        tracer.reset()
+        self.assertEqual(tracer.summary(), [])